@@ -0,0 +1,240 @@
+"""
+Async Chain Access
+AsyncWeb3-based balance checks, contract reads and transaction tracking
+
+One event loop can serve many NGOs at once: every coroutine here only
+awaits the network, and fan-out helpers bound their concurrency with a
+semaphore. The sync helpers at the bottom wrap the same coroutines for the
+existing scripts; each runs on a fresh loop and closes that loop's HTTP
+sessions before returning.
+"""
+
+import asyncio
+import time
+import weakref
+
+import telemetry
+from tx_signer import raw_transaction
+
+DEFAULT_CONCURRENCY = 64
+RECEIPT_POLL_INTERVAL = 0.1
+
+# AsyncHTTPProvider sessions belong to the loop that created them
+_async_instances = weakref.WeakKeyDictionary()
+
+
+def get_async_web3(rpc_url):
+    """Return the AsyncWeb3 instance for an RPC URL on the running event loop"""
+    from web3 import AsyncWeb3
+
+    loop = asyncio.get_running_loop()
+    per_loop = _async_instances.setdefault(loop, {})
+    web3 = per_loop.get(rpc_url)
+    if web3 is None:
+        web3 = per_loop[rpc_url] = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(rpc_url))
+    return web3
+
+
+async def close_async_web3():
+    """Close the HTTP sessions of every AsyncWeb3 created on the running loop"""
+    for web3 in _async_instances.pop(asyncio.get_running_loop(), {}).values():
+        await web3.provider.disconnect()
+
+
+async def _bounded_gather(make_coroutine, items, concurrency):
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(item):
+        async with semaphore:
+            return await make_coroutine(item)
+
+    return await asyncio.gather(*(run(item) for item in items))
+
+
+# ========== READS ==========
+
+async def chain_info(web3):
+    """Chain id and head block, fetched concurrently"""
+    chain_id, block_number = await asyncio.gather(web3.eth.chain_id, web3.eth.block_number)
+    return {"chain_id": chain_id, "block_number": block_number}
+
+
+async def get_balances(web3, addresses, concurrency=DEFAULT_CONCURRENCY):
+    """{address: balance in wei} for many accounts"""
+    addresses = list(addresses)
+    balances = await _bounded_gather(web3.eth.get_balance, addresses, concurrency)
+    return dict(zip(addresses, balances))
+
+
+def get_async_sbt_contract(web3, address):
+    """Bind VolunteerBadgeSBT to an AsyncWeb3 instance"""
+    from sbt_contract import load_artifact
+
+    return web3.eth.contract(address=web3.to_checksum_address(address), abi=load_artifact()["abi"])
+
+
+async def verify_credentials(web3, contract, addresses, block_number=None, concurrency=DEFAULT_CONCURRENCY):
+    """{address: (isValid, totalHours, lastActivity, issuingNGO)} at one block"""
+    if block_number is None:
+        block_number = await web3.eth.block_number
+    addresses = list(addresses)
+
+    async def verify(address):
+        return await contract.functions.verifyVolunteerCredential(web3.to_checksum_address(address)).call(
+            block_identifier=block_number
+        )
+
+    results = await _bounded_gather(verify, addresses, concurrency)
+    return dict(zip(addresses, results))
+
+
+# ========== TRANSACTIONS ==========
+
+async def send_transaction(web3, account, function_call, nonce=None, gas=None):
+    """Build, sign locally and send a contract call; return the transaction hash"""
+    if nonce is None:
+        nonce = await web3.eth.get_transaction_count(account.address, "pending")
+    tx = {"from": account.address, "nonce": nonce, "chainId": await web3.eth.chain_id}
+    if gas is not None:
+        tx["gas"] = gas
+    tx = await function_call.build_transaction(tx)
+    signed = account.sign_transaction(tx)
+    tx_hash = await web3.eth.send_raw_transaction(raw_transaction(signed))
+    telemetry.count("tx_sent_total", source="async")
+    return tx_hash
+
+
+async def wait_for_receipt(web3, tx_hash, timeout=120, poll_interval=RECEIPT_POLL_INTERVAL):
+    """Poll for a receipt without blocking the event loop"""
+    from web3.exceptions import TransactionNotFound
+
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return await web3.eth.get_transaction_receipt(tx_hash)
+        except TransactionNotFound:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Transaction 0x{bytes(tx_hash).hex()} not mined after {timeout}s")
+            await asyncio.sleep(poll_interval)
+
+
+async def send_and_wait(web3, account, function_call, nonce=None, gas=None, timeout=120):
+    tx_hash = await send_transaction(web3, account, function_call, nonce=nonce, gas=gas)
+    return await wait_for_receipt(web3, tx_hash, timeout=timeout)
+
+
+async def track_transactions(web3, tx_hashes, timeout=120, concurrency=DEFAULT_CONCURRENCY):
+    """Receipts for many transactions, in the order given"""
+    return await _bounded_gather(lambda h: wait_for_receipt(web3, h, timeout), list(tx_hashes), concurrency)
+
+
+# ========== SYNC WRAPPERS ==========
+
+def run_sync(coroutine):
+    """Run a coroutine from synchronous code (not from inside a running loop)
+
+    The loop only lives for this call, so the providers it created are
+    disconnected before it closes rather than leaking their aiohttp sessions.
+    """
+    async def run():
+        try:
+            return await coroutine
+        finally:
+            await close_async_web3()
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(run())
+    coroutine.close()
+    raise RuntimeError("run_sync() called from a running event loop - await the coroutine instead")
+
+
+def check_connection(rpc_url):
+    """Chain id and head block of ``rpc_url``, or None when the node is unreachable"""
+    async def check():
+        try:
+            return await chain_info(get_async_web3(rpc_url))
+        except Exception:
+            return None
+
+    return run_sync(check())
+
+
+def get_balance_eth(rpc_url, address):
+    """Balance of ``address`` in ether"""
+    async def balance():
+        web3 = get_async_web3(rpc_url)
+        return web3.from_wei(await web3.eth.get_balance(address), "ether")
+
+    return run_sync(balance())
+
+
+def verify_credentials_sync(rpc_url, contract_address, addresses, block_number=None,
+                            concurrency=DEFAULT_CONCURRENCY):
+    async def verify():
+        web3 = get_async_web3(rpc_url)
+        return await verify_credentials(web3, get_async_sbt_contract(web3, contract_address), addresses,
+                                        block_number, concurrency)
+
+    return run_sync(verify())
+
+
+# ========== BENCHMARK ==========
+
+def benchmark(rpc_url, addresses, contract_address=None, concurrency=DEFAULT_CONCURRENCY):
+    """Sequential sync calls vs concurrent async calls for balances and verification"""
+    from provider_factory import get_web3
+
+    web3 = get_web3(rpc_url)
+    report = {}
+
+    started = time.perf_counter()
+    for address in addresses:
+        web3.eth.get_balance(address)
+    report["balance_sync"] = len(addresses) / (time.perf_counter() - started)
+
+    async def balances():
+        await get_balances(get_async_web3(rpc_url), addresses, concurrency)
+
+    started = time.perf_counter()
+    run_sync(balances())
+    report["balance_async"] = len(addresses) / (time.perf_counter() - started)
+
+    if contract_address:
+        from sbt_contract import get_sbt_contract
+
+        contract = get_sbt_contract(web3, contract_address)
+        started = time.perf_counter()
+        for address in addresses:
+            contract.functions.verifyVolunteerCredential(address).call()
+        report["verify_sync"] = len(addresses) / (time.perf_counter() - started)
+
+        started = time.perf_counter()
+        verify_credentials_sync(rpc_url, contract_address, addresses, concurrency=concurrency)
+        report["verify_async"] = len(addresses) / (time.perf_counter() - started)
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from web3 import Web3
+
+    parser = argparse.ArgumentParser(description="Benchmark async vs sync reads against a local node")
+    parser.add_argument("--rpc-url", default="http://localhost:8545")
+    parser.add_argument("--contract", help="VolunteerBadgeSBT address to benchmark verification too")
+    parser.add_argument("--addresses", type=int, default=1_000)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    args = parser.parse_args()
+
+    print("⚡ Async Chain Access Benchmark")
+    print("=" * 40)
+    addresses = [Web3.to_checksum_address(Web3.keccak(text=f"seed-volunteer-{i}")[12:])
+                 for i in range(args.addresses)]
+    report = benchmark(args.rpc_url, addresses, args.contract, args.concurrency)
+    for kind in ("balance", "verify"):
+        if f"{kind}_sync" in report:
+            sync_rate, async_rate = report[f"{kind}_sync"], report[f"{kind}_async"]
+            print(f"   {kind:>8}: sync {sync_rate:,.0f}/s, async {async_rate:,.0f}/s "
+                  f"({async_rate / sync_rate:.1f}x)")
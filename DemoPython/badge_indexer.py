@@ -0,0 +1,386 @@
+"""
+VolunteerBadgeSBT Event Indexer
+Incrementally copies BadgeIssued/BadgeUpdated/BadgeBurned/NGORegistered/NGOVerified
+history into a local SQLite database
+
+Logs are fetched in adaptive block-range chunks by parallel workers and
+committed batch by batch together with a resume checkpoint. Block hashes and
+timestamps come from JSON-RPC batches rather than one request per block.
+Recent block hashes are remembered so a chain reorganisation rolls the
+affected rows back.
+"""
+
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from provider_factory import rpc_batch
+from sbt_contract import EVENT_NAMES
+
+DEFAULT_DB_PATH = "volunteer_badges.sqlite"
+DEFAULT_WORKERS = 4
+BLOCKS_PER_BATCH = 500
+INITIAL_CHUNK = 2_000
+MIN_CHUNK = 1
+MAX_CHUNK = 100_000
+TARGET_LOGS_PER_CHUNK = 5_000
+REORG_WINDOW = 128
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    block_hash TEXT NOT NULL,
+    tx_hash TEXT NOT NULL,
+    event TEXT NOT NULL,
+    volunteer TEXT,
+    token_id INTEGER,
+    ngo TEXT,
+    hours INTEGER,
+    activity_type TEXT,
+    ngo_name TEXT,
+    verified INTEGER,
+    PRIMARY KEY (block_number, log_index)
+);
+CREATE INDEX IF NOT EXISTS idx_events_volunteer ON events (volunteer, block_number);
+CREATE INDEX IF NOT EXISTS idx_events_token ON events (token_id);
+CREATE INDEX IF NOT EXISTS idx_events_ngo ON events (ngo, block_number);
+CREATE INDEX IF NOT EXISTS idx_events_event ON events (event, block_number);
+CREATE TABLE IF NOT EXISTS blocks (
+    block_number INTEGER PRIMARY KEY,
+    block_hash TEXT NOT NULL,
+    timestamp INTEGER
+);
+CREATE TABLE IF NOT EXISTS checkpoint (
+    contract TEXT PRIMARY KEY,
+    block_number INTEGER NOT NULL,
+    block_hash TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+def _hex(value):
+    # HexBytes.hex() dropped the 0x prefix in hexbytes 1.0; keep raw JSON-RPC and web3 hashes comparable
+    return "0x" + bytes(value).hex() if isinstance(value, (bytes, bytearray)) else str(value)
+
+
+def decode_row(contract, topic_events, log):
+    """Decode one raw log into an ``events`` table row"""
+    name = topic_events.get(_hex(log["topics"][0]).lower().replace("0x", ""))
+    if name is None:
+        return None
+    args = contract.events[name]().process_log(log)["args"]
+    return {
+        "block_number": log["blockNumber"],
+        "log_index": log["logIndex"],
+        "block_hash": _hex(log["blockHash"]),
+        "tx_hash": _hex(log["transactionHash"]),
+        "event": name,
+        "volunteer": args.get("volunteer"),
+        "token_id": args.get("tokenId"),
+        "ngo": args.get("ngo"),
+        "hours": args.get("hoursAdded", args.get("newTotalHours")),
+        "activity_type": args.get("activityType"),
+        "ngo_name": args.get("name"),
+        "verified": None if "verified" not in args else int(args["verified"])
+    }
+
+
+class LogRangeTooLarge(Exception):
+    """The node refused a log query because the range holds too many results"""
+
+
+class BadgeIndexer:
+    """Incremental, reorg-aware indexer for VolunteerBadgeSBT events"""
+
+    def __init__(self, web3, contract, db_path=DEFAULT_DB_PATH, workers=DEFAULT_WORKERS,
+                 start_block=0, confirmations=0, initial_chunk=INITIAL_CHUNK):
+        from eth_utils import event_abi_to_log_topic
+
+        self.web3 = web3
+        self.contract = contract
+        self.address = contract.address
+        self.workers = max(1, workers)
+        self.start_block = start_block
+        self.confirmations = confirmations
+        self.chunk_size = initial_chunk
+        # Block headers go out as raw JSON-RPC batches when the provider is plain HTTP
+        self.rpc_url = getattr(web3.provider, "endpoint_uri", None)
+        self.topic_events = {
+            event_abi_to_log_topic(contract.events[name]().abi).hex().replace("0x", ""): name
+            for name in EVENT_NAMES
+        }
+        self.db = sqlite3.connect(db_path)
+        self.db.executescript(SCHEMA)
+        self.listeners = []
+
+    def close(self):
+        self.db.close()
+
+    # ========== CHECKPOINT & REORGS ==========
+
+    def checkpoint(self):
+        """(block_number, block_hash) of the last indexed block, or None"""
+        row = self.db.execute(
+            "SELECT block_number, block_hash FROM checkpoint WHERE contract = ?", (self.address,)
+        ).fetchone()
+        return tuple(row) if row else None
+
+    def _save_checkpoint(self, block_number, block_hash):
+        self.db.execute(
+            "INSERT OR REPLACE INTO checkpoint (contract, block_number, block_hash, updated_at) VALUES (?, ?, ?, ?)",
+            (self.address, block_number, block_hash, time.time())
+        )
+        self.db.execute(
+            "INSERT OR REPLACE INTO blocks (block_number, block_hash) VALUES (?, ?)", (block_number, block_hash)
+        )
+        self.db.execute("DELETE FROM blocks WHERE block_number < ? AND block_number NOT IN "
+                        "(SELECT DISTINCT block_number FROM events)", (block_number - REORG_WINDOW,))
+
+    def _chain_hash(self, block_number):
+        return _hex(self.web3.eth.get_block(block_number)["hash"])
+
+    def _find_fork_point(self):
+        """Highest remembered block whose hash still matches the chain"""
+        rows = self.db.execute(
+            "SELECT block_number, block_hash FROM blocks ORDER BY block_number DESC LIMIT ?", (REORG_WINDOW,)
+        ).fetchall()
+        for block_number, block_hash in rows:
+            try:
+                if self._chain_hash(block_number) == block_hash:
+                    return block_number, block_hash
+            except Exception:
+                continue
+        return None
+
+    def rollback_to(self, block_number):
+        """Forget everything indexed after ``block_number``"""
+        with self.db:
+            removed = self.db.execute("DELETE FROM events WHERE block_number > ?", (block_number,)).rowcount
+            self.db.execute("DELETE FROM blocks WHERE block_number > ?", (block_number,))
+            if block_number < self.start_block:
+                self.db.execute("DELETE FROM checkpoint WHERE contract = ?", (self.address,))
+            else:
+                self._save_checkpoint(block_number, self._chain_hash(block_number))
+        for listener in self.listeners:
+            listener.on_rollback(block_number)
+        return removed
+
+    def _check_reorg(self):
+        """Roll back if the checkpoint block is no longer on the canonical chain"""
+        checkpoint = self.checkpoint()
+        if checkpoint is None:
+            return None
+        block_number, block_hash = checkpoint
+        try:
+            if self._chain_hash(block_number) == block_hash:
+                return None
+        except Exception:
+            pass  # The block vanished entirely (e.g. the chain got shorter)
+        fork_point = self._find_fork_point()
+        target = fork_point[0] if fork_point else self.start_block - 1
+        self.rollback_to(target)
+        return target
+
+    # ========== FETCHING ==========
+
+    def _get_logs(self, from_block, to_block):
+        try:
+            return self.web3.eth.get_logs({
+                "address": self.address,
+                "fromBlock": from_block,
+                "toBlock": to_block,
+                "topics": [["0x" + topic for topic in self.topic_events]]
+            })
+        except Exception as e:
+            message = str(e).lower()
+            if any(hint in message for hint in ("more than", "too many", "limit exceeded", "range", "timeout")):
+                raise LogRangeTooLarge(str(e))
+            raise
+
+    def _fetch_range(self, from_block, to_block):
+        """Fetch one chunk, splitting it in halves while the node rejects it"""
+        try:
+            return [(from_block, to_block, self._get_logs(from_block, to_block))], False
+        except LogRangeTooLarge:
+            if to_block <= from_block:
+                raise
+            middle = (from_block + to_block) // 2
+            left, _ = self._fetch_range(from_block, middle)
+            right, _ = self._fetch_range(middle + 1, to_block)
+            return left + right, True
+
+    def _adapt_chunk(self, results, split):
+        """Shrink after rejected or crowded chunks, grow after sparse ones"""
+        busiest = max((len(logs) for _, _, logs in results), default=0)
+        if split or busiest > TARGET_LOGS_PER_CHUNK:
+            self.chunk_size = max(MIN_CHUNK, self.chunk_size // 2)
+        elif busiest < TARGET_LOGS_PER_CHUNK // 4:
+            self.chunk_size = min(MAX_CHUNK, self.chunk_size * 2)
+
+    def _block_headers(self, block_numbers):
+        """(number, hash, timestamp) for block_numbers in one JSON-RPC batch"""
+        replies = rpc_batch(self.rpc_url, [("eth_getBlockByNumber", [hex(n), False]) for n in block_numbers])
+        headers = []
+        for number, reply in zip(block_numbers, replies):
+            block = reply.get("result")
+            if block is None:
+                # Gone between the log query and now: a reorg the next sync rolls back
+                raise RuntimeError(f"block {number} disappeared while indexing: {reply.get('error')}")
+            headers.append((number, block["hash"].lower(), int(block["timestamp"], 16)))
+        return headers
+
+    def _block_timestamps(self, pool, block_numbers):
+        """{number: (hash, timestamp)}: one batch per BLOCKS_PER_BATCH blocks, batches in parallel"""
+        if not self.rpc_url:
+            blocks = pool.map(self.web3.eth.get_block, block_numbers)
+            return {block["number"]: (_hex(block["hash"]), block["timestamp"]) for block in blocks}
+        chunks = [block_numbers[i:i + BLOCKS_PER_BATCH] for i in range(0, len(block_numbers), BLOCKS_PER_BATCH)]
+        return {number: (block_hash, timestamp)
+                for headers in pool.map(self._block_headers, chunks)
+                for number, block_hash, timestamp in headers}
+
+    # ========== SYNC ==========
+
+    def sync(self, to_block=None):
+        """Index new events up to ``to_block`` (default: head minus confirmations)"""
+        started = time.perf_counter()
+        rolled_back_to = self._check_reorg()
+        head = self.web3.eth.block_number - self.confirmations
+        target = head if to_block is None else min(to_block, head)
+        checkpoint = self.checkpoint()
+        next_block = checkpoint[0] + 1 if checkpoint else self.start_block
+        stats = {"from_block": next_block, "to_block": target, "events": 0, "chunks": 0,
+                 "rolled_back_to": rolled_back_to}
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while next_block <= target:
+                # Plan one chunk per worker, fetch in parallel, commit in block order
+                ranges = []
+                for _ in range(self.workers):
+                    if next_block > target:
+                        break
+                    end = min(target, next_block + self.chunk_size - 1)
+                    ranges.append((next_block, end))
+                    next_block = end + 1
+
+                results, split = [], False
+                for chunk_results, chunk_split in pool.map(lambda r: self._fetch_range(*r), ranges):
+                    results.extend(chunk_results)
+                    split = split or chunk_split
+                self._adapt_chunk(results, split)
+
+                rows = [row for _, _, logs in results for log in logs
+                        if (row := decode_row(self.contract, self.topic_events, log))]
+                batch_end = ranges[-1][1]
+                block_info = self._block_timestamps(pool, sorted({r["block_number"] for r in rows} | {batch_end}))
+                self._commit(rows, block_info, batch_end)
+                stats["events"] += len(rows)
+                stats["chunks"] += len(results)
+
+        stats["chunk_size"] = self.chunk_size
+        stats["seconds"] = time.perf_counter() - started
+        return stats
+
+    def _commit(self, rows, block_info, batch_end):
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO events (block_number, log_index, block_hash, tx_hash, event, volunteer, "
+                "token_id, ngo, hours, activity_type, ngo_name, verified) VALUES (:block_number, :log_index, "
+                ":block_hash, :tx_hash, :event, :volunteer, :token_id, :ngo, :hours, :activity_type, :ngo_name, "
+                ":verified)",
+                rows
+            )
+            self.db.executemany(
+                "INSERT OR REPLACE INTO blocks (block_number, block_hash, timestamp) VALUES (?, ?, ?)",
+                [(number, block_hash, timestamp) for number, (block_hash, timestamp) in block_info.items()]
+            )
+            self._save_checkpoint(batch_end, block_info[batch_end][0])
+        for listener in self.listeners:
+            listener.on_events(rows, {n: ts for n, (_, ts) in block_info.items()})
+
+    # ========== QUERIES ==========
+
+    def events(self, event=None, volunteer=None, ngo=None, since_block=None, limit=None):
+        """Indexed events as dicts, oldest first"""
+        clauses, params = [], []
+        for column, value in (("event", event), ("volunteer", volunteer), ("ngo", ngo)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since_block is not None:
+            clauses.append("block_number >= ?")
+            params.append(since_block)
+        sql = "SELECT * FROM events"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY block_number, log_index"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        cursor = self.db.execute(sql, params)
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def event_counts(self):
+        return dict(self.db.execute("SELECT event, COUNT(*) FROM events GROUP BY event"))
+
+
+def seed_issuances(web3, contract, ngo, count, hours=8, activity_type="community-service"):
+    """Fire ``count`` issueBadge transactions from ``ngo`` for synthetic volunteers"""
+    from web3 import Web3
+    from sbt_contract import send_transaction
+
+    nonce = web3.eth.get_transaction_count(ngo.address, "pending")
+    gas = contract.functions.issueBadge(ngo.address, hours, "ipfs://seed", activity_type).estimate_gas(
+        {"from": ngo.address}
+    ) * 2
+    tx_hash = None
+    for i in range(count):
+        volunteer = Web3.to_checksum_address(Web3.keccak(text=f"seed-volunteer-{i}")[12:])
+        tx_hash = send_transaction(
+            web3, ngo, contract.functions.issueBadge(volunteer, hours, f"ipfs://seed/{i}", activity_type),
+            nonce=nonce + i, gas=gas, wait=False
+        )
+    if tx_hash is not None:
+        web3.eth.wait_for_transaction_receipt(tx_hash, timeout=600)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from provider_factory import get_web3
+    from sbt_contract import deploy_sbt, ganache_account, get_sbt_contract, register_verified_ngo
+
+    parser = argparse.ArgumentParser(description="Index VolunteerBadgeSBT events into SQLite")
+    parser.add_argument("--rpc-url", default="http://localhost:8545")
+    parser.add_argument("--contract", help="VolunteerBadgeSBT address (default: ignition deployment)")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--seed", type=int, default=0,
+                        help="deploy a fresh contract on a local chain and issue this many badges first")
+    args = parser.parse_args()
+
+    web3 = get_web3(args.rpc_url)
+    print("🗂️  VolunteerBadgeSBT Event Indexer")
+    print("=" * 40)
+
+    if args.seed:
+        admin, ngo = ganache_account(0), ganache_account(1)
+        contract = deploy_sbt(web3, admin)
+        register_verified_ngo(web3, contract, admin, ngo.address, "Seed NGO Romania")
+        started = time.perf_counter()
+        seed_issuances(web3, contract, ngo, args.seed)
+        print(f"   🌱 Seeded {args.seed:,} issuances at {contract.address} in {time.perf_counter() - started:.1f}s")
+    else:
+        contract = get_sbt_contract(web3, args.contract)
+
+    indexer = BadgeIndexer(web3, contract, db_path=args.db, workers=args.workers)
+    stats = indexer.sync()
+    print(f"   ✅ Indexed blocks {stats['from_block']}-{stats['to_block']}: {stats['events']:,} events "
+          f"in {stats['chunks']} chunks, {stats['seconds']:.2f}s (chunk size now {stats['chunk_size']:,})")
+    if stats["rolled_back_to"] is not None:
+        print(f"   ⚠️  Reorg detected - rolled back to block {stats['rolled_back_to']}")
+    for event, count in sorted(indexer.event_counts().items()):
+        print(f"   • {event}: {count:,}")
+    indexer.close()
@@ -0,0 +1,301 @@
+"""
+Incremental VolunteerBadgeSBT Statistics
+Materialized platform, per-NGO and daily/monthly aggregates fed by the event indexer
+
+Dashboards used to poll getPlatformStats, getNGOInfo and getTotalHours, one
+RPC per NGO or volunteer. BadgeStatistics listens to BadgeIndexer instead:
+every committed batch is folded into in-memory aggregates in O(events), and
+queries are plain dictionary reads. A reorg rollback replays the surviving
+events from the indexer database. consistency_check() compares the
+aggregates against the on-chain counters at the indexed block.
+"""
+
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+ROLLUP_FIELDS = ("issuances", "hours", "new_badges", "burned")
+
+
+def _key(address):
+    return address.lower() if address else address
+
+
+def _periods(timestamp):
+    moment = datetime.fromtimestamp(timestamp or 0, tz=timezone.utc)
+    return moment.strftime("%Y-%m-%d"), moment.strftime("%Y-%m")
+
+
+def _new_ngo():
+    return {"name": None, "verified": False, "badges_issued": 0, "hours_issued": 0, "volunteers_minted": 0,
+            "active_badges": 0, "registered_block": None}
+
+
+def _new_rollup():
+    return dict.fromkeys(ROLLUP_FIELDS, 0)
+
+
+class BadgeStatistics:
+    """Event-driven aggregates over one VolunteerBadgeSBT contract
+
+    Register with ``attach(indexer)``; it replays what the indexer already
+    holds and then receives every new batch through the listener hooks.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._indexer = None
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._platform = {"total_volunteers": 0, "active_badges": 0, "burned_badges": 0, "total_hours": 0,
+                              "total_ngos": 0, "verified_ngos": 0, "issuances": 0}
+            self._ngos = defaultdict(_new_ngo)
+            self._tokens = {}  # token id -> [volunteer, issuing ngo, hours, active]
+            self._volunteers = {}  # volunteer -> token id
+            self._daily = defaultdict(lambda: defaultdict(_new_rollup))  # day -> ngo (None: all) -> rollup
+            self._monthly = defaultdict(lambda: defaultdict(_new_rollup))
+            self.last_block = None
+            self.events_applied = 0
+
+    # ========== INDEXER HOOKS ==========
+
+    def attach(self, indexer):
+        """Load everything ``indexer`` has stored and follow its future batches"""
+        self._indexer = indexer
+        self._replay()
+        indexer.listeners.append(self)
+        return self
+
+    def _replay(self):
+        self.reset()
+        cursor = self._indexer.db.execute(
+            "SELECT e.*, b.timestamp FROM events e LEFT JOIN blocks b USING (block_number) "
+            "ORDER BY e.block_number, e.log_index"
+        )
+        columns = [c[0] for c in cursor.description]
+        while True:
+            batch = cursor.fetchmany(10_000)
+            if not batch:
+                break
+            rows = [dict(zip(columns, row)) for row in batch]
+            self.on_events(rows, {row["block_number"]: row["timestamp"] for row in rows})
+        checkpoint = self._indexer.checkpoint()
+        if checkpoint is not None:
+            self.last_block = checkpoint[0]
+
+    def on_events(self, rows, timestamps):
+        """Fold one committed batch of indexer rows into the aggregates"""
+        with self._lock:
+            for row in rows:
+                self._apply(row, timestamps.get(row["block_number"]))
+            if rows:
+                self.last_block = max(self.last_block or 0, rows[-1]["block_number"])
+            if timestamps:
+                self.last_block = max(self.last_block or 0, max(timestamps))
+
+    def on_rollback(self, block_number):
+        """Rebuild from the events that survived a reorg (rare, so a replay is fine)"""
+        if self._indexer is not None:
+            self._replay()
+        else:
+            self.reset()
+
+    def _rollup(self, timestamp, ngo, field, amount=1):
+        day, month = _periods(timestamp)
+        for table, period in ((self._daily, day), (self._monthly, month)):
+            table[period][None][field] += amount
+            if ngo is not None:
+                table[period][ngo][field] += amount
+
+    def _apply(self, row, timestamp):
+        event, platform = row["event"], self._platform
+        self.events_applied += 1
+        if event == "NGORegistered":
+            ngo = self._ngos[_key(row["ngo"])]
+            ngo["name"], ngo["registered_block"] = row["ngo_name"], row["block_number"]
+            platform["total_ngos"] += 1
+        elif event == "NGOVerified":
+            ngo = self._ngos[_key(row["ngo"])]
+            verified = bool(row["verified"])
+            if verified != ngo["verified"]:
+                platform["verified_ngos"] += 1 if verified else -1
+                ngo["verified"] = verified
+        elif event == "BadgeIssued":
+            ngo_key, hours = _key(row["ngo"]), row["hours"]
+            ngo = self._ngos[ngo_key]
+            token = self._tokens.get(row["token_id"])
+            if token is None:
+                volunteer = _key(row["volunteer"])
+                self._tokens[row["token_id"]] = [volunteer, ngo_key, hours, True]
+                self._volunteers[volunteer] = row["token_id"]
+                platform["total_volunteers"] += 1
+                platform["active_badges"] += 1
+                ngo["volunteers_minted"] += 1
+                ngo["active_badges"] += 1
+                self._rollup(timestamp, ngo_key, "new_badges")
+            else:
+                token[2] += hours
+            platform["total_hours"] += hours
+            platform["issuances"] += 1
+            ngo["badges_issued"] += 1
+            ngo["hours_issued"] += hours
+            self._rollup(timestamp, ngo_key, "issuances")
+            self._rollup(timestamp, ngo_key, "hours", hours)
+        elif event == "BadgeBurned":
+            token = self._tokens.get(row["token_id"])
+            if token is not None and token[3]:
+                volunteer, ngo_key, hours, _ = token
+                token[3] = False
+                self._volunteers.pop(volunteer, None)
+                platform["total_hours"] -= hours
+                platform["active_badges"] -= 1
+                platform["burned_badges"] += 1
+                self._ngos[ngo_key]["active_badges"] -= 1
+                self._rollup(timestamp, ngo_key, "burned")
+        elif event == "BadgeUpdated":
+            token = self._tokens.get(row["token_id"])
+            if token is not None and token[3]:
+                platform["total_hours"] += row["hours"] - token[2]
+                token[2] = row["hours"]
+
+    # ========== QUERIES ==========
+
+    def platform(self):
+        """getPlatformStats() plus active/burned badges, verified NGOs and issuance count"""
+        with self._lock:
+            return dict(self._platform, block_number=self.last_block)
+
+    def ngo(self, address):
+        """Aggregates for one NGO, or None when it never appeared"""
+        with self._lock:
+            ngo = self._ngos.get(_key(address))
+            return dict(ngo) if ngo is not None else None
+
+    def ngos(self):
+        """{ngo address (lowercase): aggregates} for every NGO"""
+        with self._lock:
+            return {address: dict(ngo) for address, ngo in self._ngos.items()}
+
+    def total_hours(self, volunteer):
+        """getTotalHours(volunteer) from the index"""
+        with self._lock:
+            token_id = self._volunteers.get(_key(volunteer))
+            return self._tokens[token_id][2] if token_id is not None else 0
+
+    def daily(self, day, ngo=None):
+        """Rollup for a YYYY-MM-DD day, for the whole platform or one NGO"""
+        with self._lock:
+            return dict(self._daily.get(day, {}).get(_key(ngo), _new_rollup()))
+
+    def monthly(self, month, ngo=None):
+        """Rollup for a YYYY-MM month, for the whole platform or one NGO"""
+        with self._lock:
+            return dict(self._monthly.get(month, {}).get(_key(ngo), _new_rollup()))
+
+    def series(self, granularity="daily", ngo=None):
+        """[(period, rollup)] in period order"""
+        table = self._daily if granularity == "daily" else self._monthly
+        with self._lock:
+            return [(period, dict(by_ngo[_key(ngo)])) for period, by_ngo in sorted(table.items())
+                    if _key(ngo) in by_ngo]
+
+    # ========== CONSISTENCY ==========
+
+    def consistency_check(self, contract, block_number=None, sample_volunteers=100):
+        """Compare the aggregates with the contract's own counters; returns a list of mismatches
+
+        Reads at ``block_number`` (default: the last indexed block) so that
+        blocks mined after the last sync do not show up as drift.
+        """
+        block = block_number if block_number is not None else self.last_block
+        if block is None:
+            block = "latest"
+        platform = self.platform()
+        mismatches = []
+
+        def compare(what, local, chain):
+            if local != chain:
+                mismatches.append({"check": what, "local": local, "chain": chain})
+
+        volunteers, hours, ngos = contract.functions.getPlatformStats().call(block_identifier=block)
+        compare("totalVolunteers", platform["total_volunteers"], volunteers)
+        compare("totalHours", platform["total_hours"], hours)
+        compare("totalNGOs", platform["total_ngos"], ngos)
+        for address, ngo in self.ngos().items():
+            info = contract.functions.getNGOInfo(contract.w3.to_checksum_address(address)).call(
+                block_identifier=block
+            )
+            compare(f"getNGOInfo({address}).isVerified", ngo["verified"], info[1])
+            compare(f"getNGOInfo({address}).badgesIssued", ngo["badges_issued"], info[2])
+        with self._lock:
+            sample = list(self._volunteers)[:sample_volunteers]
+        for volunteer in sample:
+            chain_hours = contract.functions.getTotalHours(contract.w3.to_checksum_address(volunteer)).call(
+                block_identifier=block
+            )
+            compare(f"getTotalHours({volunteer})", self.total_hours(volunteer), chain_hours)
+        return mismatches
+
+
+def measure_query_latency(stats, queries=100_000):
+    """Mean microseconds per platform() and ngo() query"""
+    ngo_address = next(iter(stats.ngos()), None)
+    started = time.perf_counter()
+    for _ in range(queries):
+        stats.platform()
+    platform_us = (time.perf_counter() - started) / queries * 1e6
+    started = time.perf_counter()
+    for _ in range(queries):
+        stats.ngo(ngo_address)
+    return {"platform_us": platform_us, "ngo_us": (time.perf_counter() - started) / queries * 1e6}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from badge_indexer import DEFAULT_DB_PATH, BadgeIndexer
+    from provider_factory import get_web3
+    from sbt_contract import get_sbt_contract
+
+    parser = argparse.ArgumentParser(description="Materialized VolunteerBadgeSBT statistics")
+    parser.add_argument("--rpc-url", default="http://localhost:8545")
+    parser.add_argument("--contract", help="VolunteerBadgeSBT address (default: ignition deployment)")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    parser.add_argument("--follow", type=float, metavar="SECONDS", help="keep syncing at this interval")
+    args = parser.parse_args()
+
+    web3 = get_web3(args.rpc_url)
+    contract = get_sbt_contract(web3, args.contract)
+    indexer = BadgeIndexer(web3, contract, db_path=args.db)
+    stats = BadgeStatistics().attach(indexer)
+
+    print("📈 VolunteerBadgeSBT Statistics")
+    print("=" * 40)
+    while True:
+        sync = indexer.sync()
+        platform = stats.platform()
+        print(f"   ⛓️  Block {platform['block_number']}: +{sync['events']:,} events")
+        print(f"   👥 Volunteers: {platform['total_volunteers']:,} ({platform['active_badges']:,} active, "
+              f"{platform['burned_badges']:,} burned)")
+        print(f"   ⏱️  Hours: {platform['total_hours']:,}   🏢 NGOs: {platform['total_ngos']:,} "
+              f"({platform['verified_ngos']:,} verified)")
+        for address, ngo in sorted(stats.ngos().items(), key=lambda item: -item[1]["hours_issued"])[:10]:
+            print(f"      • {ngo['name'] or address}: {ngo['badges_issued']:,} issuances, "
+                  f"{ngo['hours_issued']:,} hours, {ngo['active_badges']:,} active badges")
+        if not args.follow:
+            break
+        time.sleep(args.follow)
+
+    latency = measure_query_latency(stats)
+    print(f"   ⚡ Queries: platform {latency['platform_us']:.2f} µs, ngo {latency['ngo_us']:.2f} µs")
+    mismatches = stats.consistency_check(contract)
+    if mismatches:
+        print(f"   ❌ {len(mismatches)} mismatches with on-chain counters:")
+        for mismatch in mismatches[:10]:
+            print(f"      • {mismatch['check']}: local {mismatch['local']}, chain {mismatch['chain']}")
+    else:
+        print("   ✅ Consistent with getPlatformStats/getNGOInfo/getTotalHours")
+    indexer.close()
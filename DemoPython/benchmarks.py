@@ -0,0 +1,290 @@
+"""
+Python Integration Benchmark Suite
+Measures the DemoPython layer against a local chain and a stored baseline
+
+Starts Ganache (unless --rpc-url is given), deploys VolunteerBadgeSBT and
+times publishing, bulk issuance, credential reads, manifest writes,
+transaction signing and CLI cold start. Results are written as JSON; any
+metric that is worse than the baseline by more than the tolerance, or that
+the baseline has but this run did not produce (a benchmark that raised or a
+chain that did not start), fails the run with exit code 1. Only benchmarks
+left out on purpose (--no-chain) are exempt.
+"""
+
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE_PATH = os.path.join(HERE, "benchmark_baseline.json")
+DEFAULT_TOLERANCE = 0.25
+
+
+def _metric(value, unit, higher_is_better):
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+
+@contextlib.contextmanager
+def _quiet_in(directory):
+    """Run the demo scripts silently with their output files in ``directory``"""
+    previous = os.getcwd()
+    os.chdir(directory)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        os.chdir(previous)
+
+
+# ========== BENCHMARKS ==========
+
+def bench_cold_start(ctx):
+    from volunteer_cli import measure_cold_start
+
+    return {"cli_cold_start_ms": _metric(measure_cold_start() * 1000, "ms", False)}
+
+
+def bench_publish_simulation(ctx, runs=5):
+    from ocean_sbt_integration import publish_volunteer_data_simulation
+
+    timings = []
+    with _quiet_in(ctx["workdir"]):
+        for _ in range(runs):
+            started = time.perf_counter()
+            publish_volunteer_data_simulation()
+            timings.append(time.perf_counter() - started)
+    return {"publish_simulation_ms": _metric(min(timings) * 1000, "ms", False)}
+
+
+def bench_publish_real(ctx, assets=4):
+    from publishing_engine import benchmark_publishing
+
+    with _quiet_in(ctx["workdir"]):
+        report = benchmark_publishing(ctx["rpc_url"], asset_count=assets)
+    if report["concurrent"]["published"] == 0:
+        raise RuntimeError("no asset published - Ocean contracts are not deployed on this chain")
+    return {"publish_real_assets_per_s": _metric(report["concurrent"]["assets_per_second"], "assets/s", True)}
+
+
+def bench_issue_badges(ctx, rows=500):
+    from badge_issuer import BulkIssuer, synthetic_rows
+
+    report = BulkIssuer(ctx["web3"], ctx["contract"], ctx["ngo"]).issue(synthetic_rows(rows))
+    if report["failures"]:
+        raise RuntimeError(f"{len(report['failures'])} issuance failures, first: {report['failures'][0]['error']}")
+    return {"issue_badge_tx_per_s": _metric(report["tx_per_second"], "tx/s", True)}
+
+
+def bench_verify(ctx, addresses=2_000):
+    from web3 import Web3
+
+    from credential_verifier import CredentialVerifier
+
+    volunteers = [Web3.to_checksum_address(Web3.keccak(text=f"seed-volunteer-{i}")[12:])
+                  for i in range(addresses)]
+    verifier = CredentialVerifier(ctx["rpc_url"], ctx["contract"].address)
+    block = verifier.block_number()
+    verifier.verify_many(volunteers, block)
+    cold = verifier.last_stats["per_second"]
+    verifier.verify_many(volunteers, block)
+    warm = verifier.last_stats["per_second"]
+
+    sample = volunteers[:200]
+    started = time.perf_counter()
+    for address in sample:
+        ctx["contract"].functions.verifyVolunteerCredential(address).call(block_identifier=block)
+    single = len(sample) / (time.perf_counter() - started)
+    return {
+        "verify_single_per_s": _metric(single, "addresses/s", True),
+        "verify_batched_per_s": _metric(cold, "addresses/s", True),
+        "verify_cached_per_s": _metric(warm, "addresses/s", True)
+    }
+
+
+def bench_manifest(ctx, runs=1_000):
+    from publish_manifest import PublishManifest
+
+    manifest = PublishManifest(os.path.join(ctx["workdir"], "bench_manifest.jsonl"))
+    try:
+        started = time.perf_counter()
+        for i in range(runs):
+            manifest.append("real", {"assets": [{"did": f"did:op:{i:064x}", "data_nft": f"0x{i:040x}",
+                                                 "datatoken": f"0x{i + runs:040x}"}]})
+        appends = runs / (time.perf_counter() - started)
+
+        started = time.perf_counter()
+        for i in range(runs):
+            manifest.lookup(f"did:op:{i:064x}")
+        lookups = runs / (time.perf_counter() - started)
+    finally:
+        manifest.close()
+    return {
+        "manifest_appends_per_s": _metric(appends, "appends/s", True),
+        "manifest_lookups_per_s": _metric(lookups, "lookups/s", True)
+    }
+
+
+def bench_sign(ctx, transactions=1_000):
+    from tx_signer import benchmark
+
+    report = benchmark(transactions, [os.cpu_count() or 1])
+    return {
+        "sign_serial_per_s": _metric(report["serial_per_second"], "tx/s", True),
+        "sign_pool_per_s": _metric(report["pools"][0]["per_second"], "tx/s", True)
+    }
+
+
+LOCAL_BENCHMARKS = [bench_cold_start, bench_publish_simulation, bench_manifest, bench_sign]
+CHAIN_BENCHMARKS = [bench_issue_badges, bench_verify, bench_publish_real]
+
+
+# ========== CHAIN SETUP ==========
+
+@contextlib.contextmanager
+def local_chain(rpc_url=None):
+    """Yield a context with web3, a freshly deployed contract and a verified NGO"""
+    from provider_factory import get_web3
+    from sbt_contract import deploy_sbt, ganache_account, register_verified_ngo
+    from start_ganache import launch_ganache, stop_ganache
+
+    process = None
+    if rpc_url is None:
+        process, rpc_url = launch_ganache()
+    try:
+        web3 = get_web3(rpc_url)
+        admin, ngo = ganache_account(0), ganache_account(1)
+        contract = deploy_sbt(web3, admin)
+        register_verified_ngo(web3, contract, admin, ngo.address, "Benchmark NGO Romania")
+        yield {"rpc_url": rpc_url, "web3": web3, "contract": contract, "ngo": ngo}
+    finally:
+        if process is not None:
+            stop_ganache(process)
+
+
+# ========== RUN & COMPARE ==========
+
+def _name(benchmark):
+    return benchmark.__name__[len("bench_"):]
+
+
+def run_suite(rpc_url=None, include_chain=True):
+    """Run every benchmark; errors are recorded as failed, benchmarks left out on purpose as skipped"""
+    results = {
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "metrics": {},
+        "failed": {},
+        "skipped": {}
+    }
+
+    def run(benchmark, ctx):
+        try:
+            metrics = benchmark(ctx)
+        except Exception as e:
+            results["failed"][_name(benchmark)] = f"{type(e).__name__}: {str(e)[:160]}"
+            return
+        for metric in metrics.values():
+            metric["benchmark"] = _name(benchmark)
+        results["metrics"].update(metrics)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for benchmark in LOCAL_BENCHMARKS:
+            run(benchmark, {"workdir": workdir})
+        if include_chain:
+            try:
+                with local_chain(rpc_url) as ctx:
+                    ctx["workdir"] = workdir
+                    for benchmark in CHAIN_BENCHMARKS:
+                        run(benchmark, ctx)
+            except Exception as e:
+                for benchmark in CHAIN_BENCHMARKS:
+                    results["failed"].setdefault(
+                        _name(benchmark), f"chain unavailable: {type(e).__name__}: {str(e)[:120]}"
+                    )
+        else:
+            for benchmark in CHAIN_BENCHMARKS:
+                results["skipped"][_name(benchmark)] = "--no-chain"
+    return results
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Per-metric comparison rows; a row regresses when it is worse than baseline by more than tolerance
+
+    Baseline metrics this run did not produce regress too (``value`` None),
+    unless their benchmark was skipped on purpose.
+    """
+    rows = []
+    for name, base in sorted(baseline.get("metrics", {}).items()):
+        if name not in results["metrics"] and base.get("benchmark") not in results.get("skipped", {}):
+            rows.append({"name": name, "value": None, "unit": base["unit"], "baseline": base["value"],
+                         "change": None, "regressed": True})
+    for name, metric in sorted(results["metrics"].items()):
+        base = baseline.get("metrics", {}).get(name)
+        if base is None or not base["value"]:
+            rows.append({"name": name, "value": metric["value"], "unit": metric["unit"], "baseline": None,
+                         "change": None, "regressed": False})
+            continue
+        change = (metric["value"] - base["value"]) / base["value"]
+        worse = -change if metric["higher_is_better"] else change
+        rows.append({"name": name, "value": metric["value"], "unit": metric["unit"], "baseline": base["value"],
+                     "change": change, "regressed": worse > tolerance})
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the Python integration layer")
+    parser.add_argument("--rpc-url", help="use a running node instead of starting Ganache")
+    parser.add_argument("--no-chain", action="store_true", help="run only the benchmarks that need no chain")
+    parser.add_argument("--output", default="benchmark_results.json", help="where to write the results JSON")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed relative slowdown before a metric counts as a regression")
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the new baseline")
+    args = parser.parse_args()
+
+    print("📏 Python Integration Benchmark Suite")
+    print("=" * 40)
+    results = run_suite(args.rpc_url, include_chain=not args.no_chain)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    rows = compare(results, baseline, args.tolerance)
+    for row in rows:
+        if row["value"] is None:
+            print(f"   ❌ {row['name']:<26} {'missing':>12} (baseline {row['baseline']:,.1f} {row['unit']})")
+            continue
+        line = f"   {'❌' if row['regressed'] else '✅'} {row['name']:<26} {row['value']:>12,.1f} {row['unit']}"
+        if row["change"] is not None:
+            line += f"  ({row['change']:+.0%} vs {row['baseline']:,.1f})"
+        print(line)
+    for name, reason in results["failed"].items():
+        print(f"   💥 {name}: {reason}")
+    for name, reason in results["skipped"].items():
+        print(f"   ⏭️  {name}: {reason}")
+    print(f"\n   💾 Results saved to {args.output}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"   📌 Baseline updated: {args.baseline}")
+    elif not baseline:
+        print(f"   💡 No baseline at {args.baseline} - run with --update-baseline to store one")
+
+    regressions = [row["name"] for row in rows if row["regressed"]]
+    if regressions:
+        print(f"\n   ❌ Regressions beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+    sys.exit(1 if regressions else 0)
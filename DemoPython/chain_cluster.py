@@ -0,0 +1,157 @@
+"""
+Sharded Local Chain Cluster
+Starts several Ganache instances at once and spreads a workload across them
+
+Ports are taken from the OS in one step, the instances boot in parallel from
+the pre-warmed snapshot, and each shard of the workload runs in its own
+process against its own chain, so integration and load runs use every core
+instead of queueing on one node.
+"""
+
+import contextlib
+import os
+import socket
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from start_ganache import DEFAULT_FIXTURES, build_snapshot, launch_ganache, launch_snapshot_chain, stop_ganache
+
+
+def find_free_ports(count):
+    """``count`` distinct free TCP ports, reserved together so they cannot repeat"""
+    sockets = []
+    try:
+        for _ in range(count):
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.bind(("127.0.0.1", 0))
+            sockets.append(sock)
+        return [sock.getsockname()[1] for sock in sockets]
+    finally:
+        for sock in sockets:
+            sock.close()
+
+
+def launch_cluster(instances, snapshot=True, fixtures=DEFAULT_FIXTURES):
+    """Start ``instances`` chains in parallel; returns a list of instance dicts
+
+    Each dict has ``process``, ``rpc_url`` and, for snapshot chains, the
+    deployed addresses in ``info``. Instances that started are stopped
+    again if any of them fails.
+    """
+    if snapshot:
+        build_snapshot(fixtures)  # once, before the parallel launches share it
+
+    def launch(port):
+        started = time.perf_counter()
+        if snapshot:
+            process, rpc_url, info = launch_snapshot_chain(fixtures, port=port)
+        else:
+            (process, rpc_url), info = launch_ganache(port), None
+        return {"process": process, "rpc_url": rpc_url, "info": info,
+                "startup_seconds": time.perf_counter() - started}
+
+    ports = find_free_ports(instances)
+    with ThreadPoolExecutor(max_workers=instances) as pool:
+        futures = [pool.submit(launch, port) for port in ports]
+    cluster, errors = [], []
+    for future in futures:
+        try:
+            cluster.append(future.result())
+        except Exception as e:
+            errors.append(e)
+    if errors:
+        stop_cluster(cluster)
+        raise RuntimeError(f"{len(errors)} of {instances} chains failed to start: {errors[0]}")
+    return cluster
+
+
+def stop_cluster(cluster):
+    """Stop every instance in parallel and remove their database copies"""
+    if cluster:
+        with ThreadPoolExecutor(max_workers=len(cluster)) as pool:
+            list(pool.map(lambda instance: stop_ganache(instance["process"]), cluster))
+
+
+@contextlib.contextmanager
+def chain_cluster(instances, snapshot=True, fixtures=DEFAULT_FIXTURES):
+    cluster = launch_cluster(instances, snapshot, fixtures)
+    try:
+        yield cluster
+    finally:
+        stop_cluster(cluster)
+
+
+def shard(items, count):
+    """Split ``items`` into ``count`` round-robin shards"""
+    shards = [[] for _ in range(count)]
+    for i, item in enumerate(items):
+        shards[i % count].append(item)
+    return shards
+
+
+def run_sharded(workload, items, cluster, processes=None):
+    """Run ``workload(rpc_url, info, shard)`` for one shard per instance, each in its own process
+
+    ``workload`` must be a module-level function so it can be pickled.
+    Returns (per-shard results, wall-clock seconds).
+    """
+    shards = shard(list(items), len(cluster))
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processes or min(len(cluster), os.cpu_count() or 1)) as pool:
+        futures = [pool.submit(workload, instance["rpc_url"], instance["info"], part)
+                   for instance, part in zip(cluster, shards)]
+        results = [future.result() for future in futures]
+    return results, time.perf_counter() - started
+
+
+# ========== EXAMPLE WORKLOAD ==========
+
+def issue_badges_workload(rpc_url, info, rows):
+    """Bulk-issue ``rows`` from the snapshot's first NGO; returns the issuer report"""
+    from badge_issuer import BulkIssuer
+    from provider_factory import get_web3
+    from sbt_contract import ganache_account, get_sbt_contract
+
+    web3 = get_web3(rpc_url)
+    contract = get_sbt_contract(web3, info["contract"])
+    return BulkIssuer(web3, contract, ganache_account(info["ngos"][0]["account"])).issue(rows)
+
+
+def compare_speedup(workload, items, instances):
+    """Wall-clock of the workload on one chain vs sharded across ``instances`` chains"""
+    items = list(items)
+    with chain_cluster(1) as single:
+        _, single_seconds = run_sharded(workload, items, single)
+    started = time.perf_counter()
+    with chain_cluster(instances) as cluster:
+        startup = time.perf_counter() - started
+        results, sharded_seconds = run_sharded(workload, items, cluster)
+    return {
+        "instances": instances,
+        "items": len(items),
+        "single_seconds": single_seconds,
+        "sharded_seconds": sharded_seconds,
+        "cluster_startup_seconds": startup,
+        "speedup": single_seconds / sharded_seconds if sharded_seconds else float("inf"),
+        "shard_results": results
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from badge_issuer import synthetic_rows
+
+    parser = argparse.ArgumentParser(description="Run a bulk issuance load across several local chains")
+    parser.add_argument("--instances", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--rows", type=int, default=2_000)
+    args = parser.parse_args()
+
+    print("🧩 Sharded Local Chain Cluster")
+    print("=" * 40)
+    report = compare_speedup(issue_badges_workload, synthetic_rows(args.rows), args.instances)
+    confirmed = sum(r["confirmed"] for r in report["shard_results"])
+    print(f"   ⛓️  {report['instances']} chains started in {report['cluster_startup_seconds']:.2f}s")
+    print(f"   🐢 1 chain:  {report['single_seconds']:.2f}s for {report['items']:,} badges")
+    print(f"   🚀 {report['instances']} chains: {report['sharded_seconds']:.2f}s ({confirmed:,} confirmed)")
+    print(f"   📈 Speedup: {report['speedup']:.2f}x")
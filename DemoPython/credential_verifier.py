@@ -0,0 +1,268 @@
+"""
+Batched Credential Verification
+Checks thousands of volunteers with verifyVolunteerCredential in JSON-RPC batches
+
+Each batch is one HTTP request holding many eth_call requests, all pinned to
+the same block. Results are kept in an LRU cache keyed by (address, block),
+so repeated checks at the same block do not touch the node.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from provider_factory import DEFAULT_TIMEOUT, get_session
+
+DEFAULT_BATCH_SIZE = 250
+DEFAULT_WORKERS = 4
+DEFAULT_CACHE_SIZE = 100_000
+VERIFY_SIGNATURE = "verifyVolunteerCredential(address)"
+
+_selector = None
+
+
+def _verify_selector():
+    global _selector
+    if _selector is None:
+        from eth_utils import keccak
+
+        _selector = "0x" + keccak(text=VERIFY_SIGNATURE)[:4].hex().replace("0x", "")
+    return _selector
+
+
+def _normalize_address(address):
+    address = address.lower()
+    if not address.startswith("0x"):
+        address = "0x" + address
+    if len(address) != 42:
+        raise ValueError(f"Invalid address: {address}")
+    int(address, 16)
+    return address
+
+
+def encode_verify_call(address):
+    """Calldata for verifyVolunteerCredential(address)"""
+    return _verify_selector() + address[2:].rjust(64, "0")
+
+
+def decode_verify_result(data):
+    """Decode (isValid, totalHours, lastActivity, issuingNGO) return data"""
+    data = data[2:] if data.startswith("0x") else data
+    if len(data) < 256:
+        raise ValueError(f"Unexpected return data length {len(data) // 2}")
+    words = [data[i:i + 64] for i in range(0, 256, 64)]
+    return {
+        "isValid": int(words[0], 16) != 0,
+        "totalHours": int(words[1], 16),
+        "lastActivity": int(words[2], 16),
+        "issuingNGO": "0x" + words[3][24:]
+    }
+
+
+class LRUCache:
+    """Thread-safe bounded mapping that evicts the least recently used entry"""
+
+    def __init__(self, max_size=DEFAULT_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class CredentialVerifier:
+    """Verify many volunteer addresses against VolunteerBadgeSBT at one block"""
+
+    def __init__(self, rpc_url, contract_address, batch_size=DEFAULT_BATCH_SIZE, workers=DEFAULT_WORKERS,
+                 cache_size=DEFAULT_CACHE_SIZE, timeout=DEFAULT_TIMEOUT):
+        self.rpc_url = rpc_url
+        self.contract_address = _normalize_address(contract_address)
+        self.batch_size = max(1, batch_size)
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.cache = LRUCache(cache_size)
+        self.last_stats = None
+
+    def _post(self, payload):
+        response = get_session(self.rpc_url).post(
+            self.rpc_url, json=payload, timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def block_number(self):
+        body = self._post({"jsonrpc": "2.0", "id": 1, "method": "eth_blockNumber", "params": []})
+        if "error" in body:
+            raise RuntimeError(body["error"].get("message", body["error"]))
+        return int(body["result"], 16)
+
+    def _call_batch(self, addresses, block_tag):
+        """One JSON-RPC batch of eth_call requests; returns {address: result}"""
+        payload = [
+            {
+                "jsonrpc": "2.0",
+                "id": i,
+                "method": "eth_call",
+                "params": [{"to": self.contract_address, "data": encode_verify_call(address)}, block_tag]
+            }
+            for i, address in enumerate(addresses)
+        ]
+        body = self._post(payload)
+        if isinstance(body, dict):
+            # Some nodes answer a whole rejected batch with a single error object
+            raise RuntimeError(body.get("error", {}).get("message", body))
+
+        results = {}
+        for reply in body:
+            address = addresses[reply["id"]]
+            if "error" in reply:
+                results[address] = {"error": reply["error"].get("message", str(reply["error"]))}
+            else:
+                results[address] = decode_verify_result(reply["result"])
+        return results
+
+    def verify_many(self, addresses, block_number=None):
+        """Verify an iterable of addresses and return {address: result}
+
+        Every call is evaluated at ``block_number`` (default: the current
+        head), so the answers are consistent with each other and safe to
+        cache. Duplicates are checked once. Results for calls the node
+        rejected carry an ``error`` key instead of the credential fields.
+        """
+        started = time.perf_counter()
+        if block_number is None:
+            block_number = self.block_number()
+        block_tag = hex(block_number)
+
+        results, missing = {}, []
+        for address in addresses:
+            address = _normalize_address(address)
+            if address in results:
+                continue
+            cached = self.cache.get((address, block_number))
+            if cached is not None:
+                results[address] = cached
+            else:
+                results[address] = None
+                missing.append(address)
+
+        batches = [missing[i:i + self.batch_size] for i in range(0, len(missing), self.batch_size)]
+        with ThreadPoolExecutor(max_workers=min(self.workers, max(1, len(batches)))) as pool:
+            for batch_results in pool.map(lambda batch: self._call_batch(batch, block_tag), batches):
+                for address, result in batch_results.items():
+                    results[address] = result
+                    if "error" not in result:
+                        self.cache.put((address, block_number), result)
+
+        elapsed = time.perf_counter() - started
+        self.last_stats = {
+            "block_number": block_number,
+            "addresses": len(results),
+            "cached": len(results) - len(missing),
+            "fetched": len(missing),
+            "batches": len(batches),
+            "seconds": elapsed,
+            "per_second": len(results) / elapsed if elapsed > 0 else float("inf")
+        }
+        return results
+
+    def verify(self, address, block_number=None):
+        """Verify a single address (cached like the batched path)"""
+        address = _normalize_address(address)
+        return self.verify_many([address], block_number)[address]
+
+
+def verify_one_by_one(web3, contract, addresses, block_number):
+    """The old way: one verifyVolunteerCredential view call per address"""
+    return {
+        address: contract.functions.verifyVolunteerCredential(web3.to_checksum_address(address)).call(
+            block_identifier=block_number
+        )
+        for address in addresses
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from web3 import Web3
+
+    from badge_indexer import seed_issuances
+    from provider_factory import get_web3
+    from sbt_contract import deploy_sbt, ganache_account, get_sbt_contract, register_verified_ngo
+
+    parser = argparse.ArgumentParser(description="Benchmark batched credential verification against a local chain")
+    parser.add_argument("--rpc-url", default="http://localhost:8545")
+    parser.add_argument("--contract", help="VolunteerBadgeSBT address (default: ignition deployment)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="deploy a fresh contract and issue this many badges first")
+    parser.add_argument("--addresses", type=int, default=2_000, help="number of volunteers to verify")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    args = parser.parse_args()
+
+    web3 = get_web3(args.rpc_url)
+    print("🔎 Batched Credential Verification Benchmark")
+    print("=" * 40)
+
+    if args.seed:
+        admin, ngo = ganache_account(0), ganache_account(1)
+        contract = deploy_sbt(web3, admin)
+        register_verified_ngo(web3, contract, admin, ngo.address, "Seed NGO Romania")
+        seed_issuances(web3, contract, ngo, args.seed)
+        print(f"   🌱 Seeded {args.seed:,} issuances at {contract.address}")
+    else:
+        contract = get_sbt_contract(web3, args.contract)
+
+    # Seeded volunteers first, then unknown addresses to fill up the list
+    addresses = [
+        Web3.to_checksum_address(Web3.keccak(text=f"seed-volunteer-{i}")[12:]).lower()
+        for i in range(args.addresses)
+    ]
+    verifier = CredentialVerifier(args.rpc_url, contract.address, batch_size=args.batch_size, workers=args.workers)
+    block = verifier.block_number()
+
+    sample = addresses[:min(len(addresses), 200)]
+    started = time.perf_counter()
+    verify_one_by_one(web3, contract, sample, block)
+    sequential_rate = len(sample) / (time.perf_counter() - started)
+    print(f"   🐢 One call per address: {sequential_rate:,.0f} addresses/s ({len(sample)} sampled)")
+
+    results = verifier.verify_many(addresses, block)
+    cold = verifier.last_stats
+    print(f"   🚀 Batched (cold cache): {cold['per_second']:,.0f} addresses/s "
+          f"in {cold['batches']} batches, {cold['seconds']:.2f}s")
+
+    verifier.verify_many(addresses, block)
+    warm = verifier.last_stats
+    print(f"   ⚡ Batched (warm cache): {warm['per_second']:,.0f} addresses/s")
+
+    valid = sum(1 for r in results.values() if r.get("isValid"))
+    print(f"   ✅ {valid:,} of {len(results):,} addresses hold an active badge at block {block}")
+    print(f"   📈 Speed-up over one-by-one: {cold['per_second'] / sequential_rate:.1f}x cold, "
+          f"{warm['per_second'] / sequential_rate:.1f}x warm")
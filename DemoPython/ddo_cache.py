@@ -0,0 +1,336 @@
+"""
+Ocean DID Resolution Cache
+Caches DID → DDO and datatoken/data NFT metadata lookups for verifiers
+
+Entries live in an in-memory LRU with a TTL and, optionally, in a SQLite
+file so a restarted verifier starts warm. Concurrent misses for the same key
+are coalesced: one caller goes to Aquarius or the chain, the others wait for
+its answer. A load that was in flight when its key was invalidated still
+answers its callers but is not cached.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from provider_factory import DEFAULT_TIMEOUT, get_session, rpc_call
+
+DEFAULT_TTL = 10 * 60
+DEFAULT_MAX_ENTRIES = 10_000
+DDO_PATH = "/api/aquarius/assets/ddo/"
+
+# ERC20/ERC721 name() and symbol() selectors
+NAME_SELECTOR = "0x06fdde03"
+SYMBOL_SELECTOR = "0x95d89b41"
+
+
+class _Pending:
+    """A load in progress that other callers for the same key can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ResolutionCache:
+    """TTL + LRU cache with an optional persistent tier and miss coalescing"""
+
+    def __init__(self, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES, path=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._generations = {}  # key -> [invalidations, loads in flight], only while loads are in flight
+        self._epoch = 0  # bumped by clear()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS resolutions (key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL)"
+            )
+            self._db.commit()
+        self.metrics = {"hits": 0, "disk_hits": 0, "misses": 0, "coalesced": 0, "loads": 0,
+                        "load_errors": 0, "evictions": 0, "invalidations": 0, "stale_loads": 0}
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+
+    # ========== TIERS ==========
+
+    def _memory_get(self, key, now):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= now:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _memory_put(self, key, value, expires_at):
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.metrics["evictions"] += 1
+
+    def _disk_get(self, key, now):
+        if self._db is None:
+            return None
+        row = self._db.execute("SELECT value, expires_at FROM resolutions WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] <= now:
+            return None
+        return row[1], json.loads(row[0])
+
+    def _disk_put(self, key, value, expires_at):
+        if self._db is not None:
+            with self._db:
+                self._db.execute("INSERT OR REPLACE INTO resolutions (key, value, expires_at) VALUES (?, ?, ?)",
+                                 (key, json.dumps(value), expires_at))
+
+    def _generation(self, key):
+        return self._epoch, self._generations[key][0]
+
+    # ========== API ==========
+
+    def get(self, key, loader, ttl=None):
+        """Return the cached value for ``key`` or load it once with ``loader()``"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory_get(key, now)
+            if entry is not None:
+                self.metrics["hits"] += 1
+                return entry[1]
+            entry = self._disk_get(key, now)
+            if entry is not None:
+                self.metrics["disk_hits"] += 1
+                self._memory_put(key, entry[1], entry[0])
+                return entry[1]
+            pending = self._pending.get(key)
+            if pending is not None:
+                self.metrics["coalesced"] += 1
+                owner = False
+            else:
+                self.metrics["misses"] += 1
+                pending = self._pending[key] = _Pending()
+                self._generations.setdefault(key, [0, 0])[1] += 1
+                generation = self._generation(key)
+                owner = True
+
+        if not owner:
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.value
+
+        try:
+            pending.value = loader()
+        except Exception as e:
+            # Failures are shared with the waiters but never cached
+            pending.error = e
+            with self._lock:
+                self.metrics["load_errors"] += 1
+            raise
+        else:
+            expires_at = time.time() + (self.ttl if ttl is None else ttl)
+            with self._lock:
+                self.metrics["loads"] += 1
+                if self._generation(key) == generation:
+                    self._memory_put(key, pending.value, expires_at)
+                    self._disk_put(key, pending.value, expires_at)
+                else:
+                    # Invalidated mid-load: the answer may predate the change
+                    self.metrics["stale_loads"] += 1
+            return pending.value
+        finally:
+            with self._lock:
+                if self._pending.get(key) is pending:
+                    del self._pending[key]
+                loads = self._generations[key]
+                loads[1] -= 1
+                if not loads[1]:
+                    del self._generations[key]
+            pending.done.set()
+
+    def invalidate(self, key):
+        """Drop ``key`` from both tiers; a load already in flight for it will not be cached"""
+        with self._lock:
+            self._entries.pop(key, None)
+            if self._db is not None:
+                with self._db:
+                    self._db.execute("DELETE FROM resolutions WHERE key = ?", (key,))
+            # Loads in flight see the new generation; later callers start a fresh load
+            self._pending.pop(key, None)
+            if key in self._generations:
+                self._generations[key][0] += 1
+            self.metrics["invalidations"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._pending.clear()
+            self._epoch += 1
+            if self._db is not None:
+                with self._db:
+                    self._db.execute("DELETE FROM resolutions")
+
+    def hit_ratio(self):
+        served = self.metrics["hits"] + self.metrics["disk_hits"] + self.metrics["coalesced"]
+        total = served + self.metrics["misses"]
+        return served / total if total else 0.0
+
+
+def _decode_abi_string(data):
+    """Decode a string returned by eth_call (tolerates bytes32 tokens)"""
+    raw = bytes.fromhex(data[2:] if data.startswith("0x") else data)
+    if len(raw) >= 64:
+        length = int.from_bytes(raw[32:64], "big")
+        if 64 + length <= len(raw):
+            return raw[64:64 + length].decode("utf-8", "replace")
+    return raw.rstrip(b"\0").decode("utf-8", "replace")
+
+
+class OceanResolver:
+    """Cached DID and asset-address resolution for SBT verifiers"""
+
+    def __init__(self, aquarius_url, rpc_url=None, cache=None, timeout=DEFAULT_TIMEOUT):
+        self.aquarius_url = aquarius_url.rstrip("/")
+        self.rpc_url = rpc_url
+        self.cache = cache or ResolutionCache()
+        self.timeout = timeout
+
+    def _fetch_ddo(self, did):
+        response = get_session(self.aquarius_url).get(self.aquarius_url + DDO_PATH + did, timeout=self.timeout)
+        if response.status_code == 404:
+            raise LookupError(f"DID not found in Aquarius: {did}")
+        response.raise_for_status()
+        return response.json()
+
+    def _fetch_token(self, address):
+        if not self.rpc_url:
+            raise ValueError("rpc_url is required to resolve token metadata")
+
+        def call(selector):
+            return _decode_abi_string(rpc_call(self.rpc_url, "eth_call", [{"to": address, "data": selector}, "latest"],
+                                               self.timeout))
+
+        return {"address": address, "name": call(NAME_SELECTOR), "symbol": call(SYMBOL_SELECTOR)}
+
+    def ddo(self, did):
+        return self.cache.get(f"ddo:{did}", lambda: self._fetch_ddo(did))
+
+    def token(self, address):
+        """name/symbol of a datatoken or data NFT; these never change, so they never expire"""
+        address = address.lower()
+        return self.cache.get(f"token:{address}", lambda: self._fetch_token(address), ttl=float("inf"))
+
+    def resolve_asset(self, asset):
+        """DDO plus datatoken and data NFT metadata for a published_assets entry"""
+        resolved = {"did": asset["did"], "ddo": self.ddo(asset["did"])}
+        if self.rpc_url:
+            for field in ("datatoken", "data_nft"):
+                if asset.get(field):
+                    resolved[field] = self.token(asset[field])
+        return resolved
+
+    def invalidate(self, did=None, address=None):
+        """Forget a DID (e.g. after its DDO was updated) or a token address"""
+        if did:
+            self.cache.invalidate(f"ddo:{did}")
+        if address:
+            self.cache.invalidate(f"token:{address.lower()}")
+
+
+def serve_stub_aquarius(ddos, port=0, latency=0.0):
+    """Run a stand-in Aquarius on localhost serving ``ddos`` ({did: ddo})
+
+    Returns (server, base_url). ``server.requests`` counts DDO requests.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            server.requests += 1
+            time.sleep(latency)
+            did = self.path[len(DDO_PATH):] if self.path.startswith(DDO_PATH) else None
+            if did not in ddos:
+                self.send_response(404)
+                self.end_headers()
+                return
+            body = json.dumps(ddos[did]).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def self_test(latency=0.05, dids=50, readers=32):
+    """Exercise hits, TTL expiry, invalidation and miss coalescing against a stub Aquarius"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    ddos = {f"did:op:{i:064x}": {"id": f"did:op:{i:064x}", "metadata": {"name": f"Volunteer Dataset {i}"}}
+            for i in range(dids)}
+    server, url = serve_stub_aquarius(ddos, latency=latency)
+    checks = []
+    try:
+        resolver = OceanResolver(url, cache=ResolutionCache(ttl=60))
+        target = next(iter(ddos))
+
+        with ThreadPoolExecutor(max_workers=readers) as pool:
+            list(pool.map(lambda _: resolver.ddo(target), range(readers)))
+        checks.append((f"{readers} concurrent misses → 1 request", server.requests == 1))
+
+        started = time.perf_counter()
+        for did in ddos:
+            resolver.ddo(did)
+        cold = time.perf_counter() - started
+        started = time.perf_counter()
+        for did in ddos:
+            resolver.ddo(did)
+        warm = time.perf_counter() - started
+        checks.append((f"warm pass {cold / warm if warm else float('inf'):,.0f}x faster than cold",
+                       server.requests == dids))
+
+        resolver.invalidate(did=target)
+        resolver.ddo(target)
+        checks.append(("invalidation forces a reload", server.requests == dids + 1))
+
+        short = OceanResolver(url, cache=ResolutionCache(ttl=0.01))
+        short.ddo(target)
+        time.sleep(0.02)
+        short.ddo(target)
+        checks.append(("expired entries are reloaded", short.cache.metrics["loads"] == 2))
+
+        try:
+            resolver.ddo("did:op:missing")
+            checks.append(("unknown DID raises LookupError", False))
+        except LookupError:
+            checks.append(("unknown DID raises LookupError", True))
+        return checks, resolver.cache.metrics
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    print("🗃️  Ocean DID Resolution Cache Self-Test")
+    print("=" * 40)
+    checks, metrics = self_test()
+    for label, ok in checks:
+        print(f"   {'✅' if ok else '❌'} {label}")
+    print(f"   📊 Metrics: {metrics}")
+    raise SystemExit(0 if all(ok for _, ok in checks) else 1)
@@ -0,0 +1,241 @@
+"""
+Block-Aware Gas and Fee Oracle
+Caches gas estimates per call shape and fee data per base fee
+
+Fee data is re-read only when a new block moved the base fee (or, on chains
+without one, when a new block arrives), and the head block itself is polled
+at most once per interval. Gas estimates are shared by calls to the same
+contract function with the same argument shape and expire after a number of
+blocks; raw eth_estimateGas requests seen by the middleware are shared only
+by identical calls from the same sender. Every answer served from the cache is counted as an RPC call saved.
+"""
+
+import threading
+import time
+
+import telemetry
+
+DEFAULT_BLOCK_POLL_INTERVAL = 1.0
+DEFAULT_GAS_TTL_BLOCKS = 100
+DEFAULT_GAS_MARGIN = 1.2
+DEFAULT_PRIORITY_FEE = 1_000_000_000  # 1 gwei when the node has no eth_maxPriorityFeePerGas
+
+
+def _int(value):
+    return int(value, 16) if isinstance(value, str) else int(value)
+
+
+def argument_shape(args):
+    """Shape of call arguments: strings and bytes by 32-byte word count, everything else by type"""
+    shape = []
+    for arg in args:
+        if isinstance(arg, (str, bytes, bytearray)):
+            data = arg.encode() if isinstance(arg, str) else arg
+            shape.append((type(arg).__name__, (len(data) + 31) // 32))
+        elif isinstance(arg, (list, tuple)):
+            shape.append(("seq", len(arg), argument_shape(arg)))
+        else:
+            shape.append(type(arg).__name__)
+    return tuple(shape)
+
+
+def _raw_call_key(tx):
+    """Cache key of a raw eth_estimateGas request: sender, target, full calldata and value
+
+    Raw requests carry no argument types, so only identical calls share an
+    estimate; shape-level sharing is left to estimate_gas.
+    """
+    data = tx.get("data") or tx.get("input") or "0x"
+    if not isinstance(data, str):
+        data = "0x" + bytes(data).hex()
+    return (str(tx.get("from")).lower(), str(tx.get("to")).lower(), data.lower(), str(tx.get("value", 0)))
+
+
+class _ErrorResponse(ValueError):
+    """A JSON-RPC error answer, kept whole so the middleware can hand it back unchanged"""
+
+    def __init__(self, response):
+        super().__init__(response["error"])
+        self.response = response
+
+
+class FeeOracle:
+    """Shared gas/fee cache for one chain"""
+
+    def __init__(self, web3=None, request=None, block_poll_interval=DEFAULT_BLOCK_POLL_INTERVAL,
+                 gas_ttl_blocks=DEFAULT_GAS_TTL_BLOCKS, base_fee_tolerance=0.0, gas_margin=DEFAULT_GAS_MARGIN):
+        if request is None and web3 is not None:
+            request = web3.manager.request_blocking
+        self.web3 = web3
+        self._request = request
+        self.block_poll_interval = block_poll_interval
+        self.gas_ttl_blocks = gas_ttl_blocks
+        self.base_fee_tolerance = base_fee_tolerance
+        self.gas_margin = gas_margin
+        self._lock = threading.RLock()
+        self._block = None
+        self._block_checked_at = 0.0
+        self._base_fee = None
+        self._fees = None
+        self._fees_block = None
+        self._gas = {}
+        self.metrics = {"gas_hits": 0, "gas_misses": 0, "fee_hits": 0, "fee_refreshes": 0, "block_polls": 0,
+                        "rpc_calls_saved": 0}
+
+    def _saved(self, kind, calls=1):
+        self.metrics["rpc_calls_saved"] += calls
+        telemetry.count("rpc_calls_saved_total", calls, kind=kind)
+
+    # ========== BLOCKS & FEES ==========
+
+    def current_block(self):
+        """Head block number, polled at most once per ``block_poll_interval``"""
+        with self._lock:
+            now = time.monotonic()
+            if self._block is None or now - self._block_checked_at >= self.block_poll_interval:
+                self._block = _int(self._request("eth_blockNumber", []))
+                self._block_checked_at = now
+                self.metrics["block_polls"] += 1
+            return self._block
+
+    def _fetch_fees(self, block):
+        header = self._request("eth_getBlockByNumber", [hex(block), False])
+        base_fee = header.get("baseFeePerGas") if header else None
+        if base_fee is None:
+            return None, {"gasPrice": _int(self._request("eth_gasPrice", []))}
+        base_fee = _int(base_fee)
+        if self._fees is not None and self._base_fee is not None and "maxFeePerGas" in self._fees:
+            moved = abs(base_fee - self._base_fee) / self._base_fee if self._base_fee else float(base_fee != 0)
+            if moved <= self.base_fee_tolerance:
+                return base_fee, None  # Same base fee: the cached fees still apply
+        try:
+            priority = _int(self._request("eth_maxPriorityFeePerGas", []))
+        except Exception:
+            priority = DEFAULT_PRIORITY_FEE
+        # Twice the base fee survives several full blocks of base fee increases
+        return base_fee, {"maxFeePerGas": 2 * base_fee + priority, "maxPriorityFeePerGas": priority}
+
+    def fee_params(self):
+        """Fee fields to merge into a transaction dict (EIP-1559 or legacy gasPrice)"""
+        with self._lock:
+            block = self.current_block()
+            if self._fees is not None and self._fees_block == block:
+                self.metrics["fee_hits"] += 1
+                self._saved("fees", 2)
+                return dict(self._fees)
+            base_fee, fees = self._fetch_fees(block)
+            if fees is None:
+                self.metrics["fee_hits"] += 1
+                self._saved("fees")
+            else:
+                self._fees = fees
+                self.metrics["fee_refreshes"] += 1
+            self._base_fee = base_fee
+            self._fees_block = block
+            return dict(self._fees)
+
+    def gas_price(self):
+        """Legacy gas price answer: base fee plus priority fee on EIP-1559 chains"""
+        with self._lock:
+            fees = self.fee_params()
+            if "gasPrice" in fees:
+                return fees["gasPrice"]
+            return self._base_fee + fees["maxPriorityFeePerGas"]
+
+    # ========== GAS ==========
+
+    def _cached_gas(self, key, estimate):
+        with self._lock:
+            block = self.current_block()
+            entry = self._gas.get(key)
+            if entry is not None and block - entry[1] < self.gas_ttl_blocks:
+                self.metrics["gas_hits"] += 1
+                self._saved("gas")
+                return entry[0]
+        gas = int(estimate() * self.gas_margin)
+        with self._lock:
+            self.metrics["gas_misses"] += 1
+            self._gas[key] = (gas, block)
+        return gas
+
+    def estimate_gas(self, function_call, tx_params, shape=None):
+        """Gas limit (with margin) for a contract call, shared by calls of the same shape"""
+        key = (
+            getattr(function_call, "address", None),
+            getattr(function_call, "fn_name", "constructor"),
+            argument_shape(function_call.args or ()) if shape is None else shape
+        )
+        return self._cached_gas(key, lambda: function_call.estimate_gas(tx_params))
+
+    def invalidate(self):
+        """Forget every cached estimate and fee"""
+        with self._lock:
+            self._gas.clear()
+            self._fees = None
+            self._base_fee = None
+            self._block = None
+
+    # ========== MIDDLEWARE ==========
+
+    def middleware(self, make_request, web3):
+        """web3 middleware answering gas and fee lookups from the cache
+
+        Covers the estimates and fee queries ocean_lib makes inside
+        create_url_asset, which the publisher cannot pass values into.
+        """
+        def raw_request(method, params):
+            response = make_request(method, params)
+            if "error" in response:
+                raise _ErrorResponse(response)
+            return response["result"]
+
+        self._request = raw_request
+
+        def answer(method, params):
+            if method == "eth_estimateGas" and params:
+                return self._cached_gas(("raw",) + _raw_call_key(params[0]),
+                                        lambda: _int(raw_request(method, params)))
+            if method == "eth_gasPrice":
+                return self.gas_price()
+            fees = self.fee_params()
+            return fees.get("maxPriorityFeePerGas", fees.get("gasPrice"))
+
+        def handle(method, params):
+            if method not in ("eth_estimateGas", "eth_gasPrice", "eth_maxPriorityFeePerGas"):
+                return make_request(method, params)
+            try:
+                return {"jsonrpc": "2.0", "id": 0, "result": hex(answer(method, params))}
+            except _ErrorResponse as e:
+                # Reverts and node errors reach web3 exactly as the node sent them
+                return e.response
+
+        return handle
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from provider_factory import get_web3
+    from sbt_contract import get_sbt_contract
+
+    parser = argparse.ArgumentParser(description="Show gas/fee cache savings against a local node")
+    parser.add_argument("--rpc-url", default="http://localhost:8545")
+    parser.add_argument("--contract", help="VolunteerBadgeSBT address (default: ignition deployment)")
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    web3 = get_web3(args.rpc_url)
+    contract = get_sbt_contract(web3, args.contract)
+    oracle = FeeOracle(web3)
+    sender = web3.eth.accounts[0]
+
+    print("⛽ Gas & Fee Oracle")
+    print("=" * 40)
+    started = time.perf_counter()
+    for i in range(args.calls):
+        call = contract.functions.verifyNGO(sender, bool(i % 2))
+        oracle.estimate_gas(call, {"from": sender})
+        oracle.fee_params()
+    elapsed = time.perf_counter() - started
+    print(f"   ✅ {args.calls} estimates + fee lookups in {elapsed * 1000:.0f} ms")
+    print(f"   📊 {oracle.metrics}")
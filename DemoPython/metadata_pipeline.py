@@ -0,0 +1,264 @@
+"""
+Badge Metadata Pipeline
+Encrypts volunteer metadata, content-addresses it and uploads it for issueBadge
+
+Each volunteer record becomes canonical JSON, sealed with AES-256-GCM
+(pip install cryptography) and addressed by the CIDv1 that
+`ipfs add --cid-version 1 --raw-leaves` would give the sealed bytes. Sealing
+runs across a process pool; uploads run on a bounded thread pool against a
+pluggable store. The nonce is derived from the plaintext, so unchanged
+records seal to the same bytes and CID and a rerun skips every upload.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import telemetry
+
+KEY_ENV_VAR = "BADGE_METADATA_KEY"
+SEALED_MAGIC = b"VBM1"
+MAX_RAW_BLOCK = 256 * 1024  # larger content is chunked into a DAG by IPFS and gets another CID
+DEFAULT_BATCH_SIZE = 1024
+DEFAULT_UPLOAD_WORKERS = 16
+
+
+def cid_v1_raw(data):
+    """CIDv1 (raw codec, sha2-256, base32) of a single-block blob"""
+    if len(data) > MAX_RAW_BLOCK:
+        raise ValueError(f"content is {len(data)} bytes; single raw blocks are at most {MAX_RAW_BLOCK}")
+    digest = hashlib.sha256(data).digest()
+    return "b" + base64.b32encode(b"\x01\x55\x12\x20" + digest).decode().lower().rstrip("=")
+
+
+# ========== KEYS & SEALING ==========
+
+def generate_key():
+    """New 256-bit metadata key as hex"""
+    return secrets.token_hex(32)
+
+
+def load_key(value=None):
+    """Metadata key bytes from ``value`` or the BADGE_METADATA_KEY env var (64 hex chars)"""
+    value = value or os.environ.get(KEY_ENV_VAR)
+    if not value:
+        raise ValueError(f"no metadata key - pass one or set {KEY_ENV_VAR} (see --generate-key)")
+    key = bytes.fromhex(value[2:] if value.startswith("0x") else value)
+    if len(key) != 32:
+        raise ValueError("metadata key must be 32 bytes (64 hex characters)")
+    return key
+
+
+def canonical_json(record):
+    return json.dumps(record, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def seal(key, plaintext):
+    """Deterministic AES-256-GCM: the nonce is an HMAC of the plaintext
+
+    Equal plaintexts give equal ciphertexts, which is what makes reruns free;
+    it reveals only that two sealed blobs hold identical metadata.
+    """
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+    nonce = hmac.new(key, plaintext, hashlib.sha256).digest()[:12]
+    return SEALED_MAGIC + nonce + AESGCM(key).encrypt(nonce, plaintext, SEALED_MAGIC)
+
+
+def unseal(key, blob):
+    """Decrypt a sealed blob back to the metadata dict"""
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+    if not blob.startswith(SEALED_MAGIC):
+        raise ValueError("not a sealed badge metadata blob")
+    nonce, ciphertext = blob[4:16], blob[16:]
+    return json.loads(AESGCM(key).decrypt(nonce, ciphertext, SEALED_MAGIC))
+
+
+_worker_key = None
+
+
+def _init_sealer(key):
+    global _worker_key
+    _worker_key = key
+
+
+def _seal_record(record):
+    blob = seal(_worker_key, canonical_json(record))
+    return record["id"], cid_v1_raw(blob), blob
+
+
+# ========== STORES ==========
+
+class FileBlobStore:
+    """Content-addressed blobs on disk, sharded by CID prefix (a local IPFS stand-in)"""
+
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, cid):
+        return os.path.join(self.root, cid[-2:], cid)
+
+    def has(self, cid):
+        return os.path.exists(self._path(cid))
+
+    def put(self, cid, data):
+        path = self._path(cid)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def get(self, cid):
+        with open(self._path(cid), "rb") as f:
+            return f.read()
+
+
+class IpfsHttpStore:
+    """Blobs on an IPFS node through its HTTP RPC API (Kubo, default port 5001)"""
+
+    def __init__(self, api_url="http://127.0.0.1:5001", timeout=30):
+        from provider_factory import get_session
+
+        self.api_url = api_url.rstrip("/")
+        self.timeout = timeout
+        self.session = get_session(self.api_url)
+
+    def has(self, cid):
+        response = self.session.post(f"{self.api_url}/api/v0/block/stat",
+                                     params={"arg": cid, "offline": "true"}, timeout=self.timeout)
+        return response.status_code == 200
+
+    def put(self, cid, data):
+        response = self.session.post(f"{self.api_url}/api/v0/add",
+                                     params={"cid-version": 1, "raw-leaves": "true", "pin": "true"},
+                                     files={"file": (cid, data)}, timeout=self.timeout)
+        response.raise_for_status()
+        stored = response.json()["Hash"]
+        if stored != cid:
+            raise ValueError(f"IPFS stored {stored}, expected {cid}")
+
+    def get(self, cid):
+        response = self.session.post(f"{self.api_url}/api/v0/block/get", params={"arg": cid}, timeout=self.timeout)
+        response.raise_for_status()
+        return response.content
+
+
+# ========== PIPELINE ==========
+
+def _batches(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class MetadataPipeline:
+    """Seal volunteer records across processes and upload them to a store"""
+
+    def __init__(self, store, key, processes=None, upload_workers=DEFAULT_UPLOAD_WORKERS,
+                 batch_size=DEFAULT_BATCH_SIZE):
+        self.store = store
+        self.key = key
+        self.processes = max(1, processes or os.cpu_count() or 1)
+        self.upload_workers = max(1, upload_workers)
+        self.batch_size = max(1, batch_size)
+        self._lock = threading.Lock()
+        self.stats = {"records": 0, "uploaded": 0, "skipped": 0, "failed": 0, "bytes_uploaded": 0}
+
+    def _store_one(self, sealed):
+        volunteer_id, cid, blob = sealed
+        result = {"id": volunteer_id, "cid": cid, "uri": f"ipfs://{cid}"}
+        try:
+            if self.store.has(cid):
+                result["status"] = "skipped"
+            else:
+                self.store.put(cid, blob)
+                result["status"] = "uploaded"
+        except Exception as e:
+            result["status"], result["error"] = "failed", str(e)[:200]
+        with self._lock:
+            self.stats[result["status"]] += 1
+            if result["status"] == "uploaded":
+                self.stats["bytes_uploaded"] += len(blob)
+        telemetry.count("metadata_blobs_total", status=result["status"])
+        return result
+
+    def run(self, records):
+        """Yield {id, cid, uri, status} per record, in input order
+
+        Records are read in batches; the next batch is sealed on the process
+        pool while the current one uploads, so memory stays bounded by the
+        batch size.
+        """
+        chunksize = max(1, self.batch_size // (self.processes * 4))
+        with ProcessPoolExecutor(max_workers=self.processes, initializer=_init_sealer,
+                                 initargs=(self.key,)) as cpu, \
+                ThreadPoolExecutor(max_workers=self.upload_workers) as uploads:
+            sealing = None
+            for batch in _batches(records, self.batch_size):
+                self.stats["records"] += len(batch)
+                next_sealing = cpu.map(_seal_record, batch, chunksize=chunksize)
+                if sealing is not None:
+                    yield from uploads.map(self._store_one, sealing)
+                sealing = next_sealing
+            if sealing is not None:
+                yield from uploads.map(self._store_one, sealing)
+
+
+def seal_volunteer_file(path, store, key, **kwargs):
+    """Run the pipeline over a JSONL/CSV volunteer registry; returns (results, stats)"""
+    from volunteer_ingest import iter_volunteer_records
+
+    pipeline = MetadataPipeline(store, key, **kwargs)
+    results = list(pipeline.run(iter_volunteer_records(path, errors="skip")))
+    return results, pipeline.stats
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Encrypt volunteer metadata and upload it by IPFS CID")
+    parser.add_argument("registry", nargs="?", help="JSONL/CSV volunteer registry")
+    parser.add_argument("--store", default="metadata_blobs", help="blob directory (local IPFS stand-in)")
+    parser.add_argument("--ipfs-api", help="upload to this IPFS HTTP API instead, e.g. http://127.0.0.1:5001")
+    parser.add_argument("--key", help=f"64-hex-char metadata key (default: ${KEY_ENV_VAR})")
+    parser.add_argument("--generate-key", action="store_true", help="print a new metadata key and exit")
+    parser.add_argument("--processes", type=int)
+    parser.add_argument("--upload-workers", type=int, default=DEFAULT_UPLOAD_WORKERS)
+    parser.add_argument("--out", metavar="PATH", help="write id → metadata URI mapping as JSONL")
+    args = parser.parse_args()
+
+    if args.generate_key:
+        print(generate_key())
+        raise SystemExit(0)
+    if not args.registry:
+        parser.error("pass a volunteer registry or --generate-key")
+
+    print("🔐 Badge Metadata Pipeline")
+    print("=" * 40)
+    store = IpfsHttpStore(args.ipfs_api) if args.ipfs_api else FileBlobStore(args.store)
+    started = time.perf_counter()
+    results, stats = seal_volunteer_file(args.registry, store, load_key(args.key), processes=args.processes,
+                                         upload_workers=args.upload_workers)
+    elapsed = time.perf_counter() - started
+    print(f"   ✅ {stats['records']:,} records in {elapsed:.2f}s ({stats['records'] / elapsed:,.0f}/s)")
+    print(f"   ⬆️  Uploaded: {stats['uploaded']:,} ({stats['bytes_uploaded']:,} bytes)")
+    print(f"   ⏭️  Skipped (CID exists): {stats['skipped']:,}")
+    print(f"   ⚠️  Failed: {stats['failed']:,}")
+    if args.out:
+        with open(args.out, "w") as f:
+            for result in results:
+                f.write(json.dumps(result) + "\n")
+        print(f"   💾 Metadata URIs saved to {args.out}")
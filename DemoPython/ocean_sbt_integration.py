@@ -3,12 +3,21 @@ Ocean Protocol Volunteer Data Publishing - Complete Implementation
 Shows both REAL Ocean Protocol usage and simulation for development
 """
 
-import json
 import time
 from datetime import datetime
-from web3 import Web3
-from eth_account import Account
 
+import telemetry
+from async_chain import get_balance_eth
+from provider_factory import get_ocean
+from publish_manifest import DEFAULT_MANIFEST_PATH, record_run
+from publishing_engine import publish_assets, print_publish_results, to_published_asset
+from rpc_selector import OCEAN_NETWORK_CANDIDATES, forget_endpoints, select_endpoints
+from volunteer_ingest import build_volunteer_metadata, validate_volunteer
+from volunteer_merkle import dataset_attestation, summarize_and_attest
+
+SIMULATED_PUBLISHER = "0x90F8bf6A479f320ead074411a4B0e7944Ea8c9C1"
+
+@telemetry.traced("publish.simulation")
 def publish_volunteer_data_simulation():
     """Simulate Ocean Protocol publishing for development/demonstration"""
     print("🎭 Ocean Protocol Volunteer Data Publishing - SIMULATION MODE")
@@ -24,9 +33,8 @@ def publish_volunteer_data_simulation():
     print("   ✅ Ocean instance created")
     
     print("\n2. 👤 NGO Publisher Account")
-    private_key = '0x4f3edf983ac636a65a842ce7c78d9aa706d3b113bce9c46f30d7d21715b23b1d'
-    alice = Account.from_key(private_key)
-    print(f"   ✅ Publisher: {alice.address}")
+    # Address of the well-known Ganache account 0 key used for real publishing; no signing here
+    print(f"   ✅ Publisher: {SIMULATED_PUBLISHER}")
     print("   💰 Balance: 100 ETH (simulated)")
     
     print("\n3. 📊 Publishing Volunteer Data Assets...")
@@ -46,7 +54,12 @@ def publish_volunteer_data_simulation():
         "created": datetime.now().isoformat(),
         "license": "CC0",
         "tags": ["volunteers", "romania", "ngo", "verification", "directory"],
-        "type": "dataset"
+        "type": "dataset",
+        # Same attestation as real publishing, over the sample volunteers
+        "additionalInformation": {
+            "volunteer_statistics": SAMPLE_VOLUNTEER_DATA["metadata"],
+            "merkle_attestation": SAMPLE_VOLUNTEER_DATA["attestation"]
+        }
     }
     
     # Simulate Ocean Protocol asset creation
@@ -128,7 +141,7 @@ def publish_volunteer_data_simulation():
     results = {
         "mode": "simulation",
         "published_at": datetime.now().isoformat(),
-        "publisher": alice.address,
+        "publisher": SIMULATED_PUBLISHER,
         "network": "Simulated Ocean Network",
         "assets": published_assets,
         "integration_notes": {
@@ -138,22 +151,24 @@ def publish_volunteer_data_simulation():
         }
     }
     
-    with open("ocean_published_assets_simulation.json", "w") as f:
-        json.dump(results, f, indent=2)
+    record_run("simulation", results)
     
-    print(f"\n   💾 Simulation results saved to ocean_published_assets_simulation.json")
+    print(f"\n   💾 Simulation run recorded in {DEFAULT_MANIFEST_PATH} (exported to ocean_published_assets_simulation.json)")
     
     return results
 
-def publish_volunteer_data_real():
-    """Real Ocean Protocol publishing (requires deployed contracts)"""
+@telemetry.traced("publish.real")
+def publish_volunteer_data_real(volunteer_source=None):
+    """Real Ocean Protocol publishing (requires deployed contracts)
+
+    volunteer_source is an optional JSONL/CSV registry; its aggregates are
+    computed in one streaming pass and attached to the asset metadata.
+    """
     print("🌊 Ocean Protocol Volunteer Data Publishing - REAL MODE")
     print("=" * 70)
     
     try:
         # Real Ocean Protocol imports
-        from ocean_lib.example_config import get_config_dict
-        from ocean_lib.ocean.ocean import Ocean
         from ocean_lib.structures.file_objects import UrlFile
         from ocean_lib.models.datatoken_base import DatatokenArguments
         from ocean_lib.models.fixed_rate_exchange import ExchangeArguments
@@ -161,28 +176,28 @@ def publish_volunteer_data_real():
         
         print("1. 🌊 Setting up Ocean Protocol...")
         
-        # Try different networks in order of preference
-        networks_to_try = [
-            ("https://polygon-mumbai.g.alchemy.com/v2/demo", "Mumbai Testnet"),
-            ("https://rpc.ankr.com/polygon_mumbai", "Mumbai Testnet (Ankr)"),
-            ("https://polygon-rpc.com", "Polygon Mainnet")
-        ]
-        
-        ocean = None
-        network_name = None
-        
-        for network_url, name in networks_to_try:
-            try:
-                config = get_config_dict(network_url)
-                ocean = Ocean(config)
-                network_name = name
-                print(f"   ✅ Connected to {name}")
-                break
-            except Exception as e:
-                print(f"   ⚠️  {name} failed: {str(e)[:60]}...")
-                continue
+        with telemetry.span("publish.ocean_setup"):
+            # Race all candidate networks in parallel; fastest healthy endpoint first
+            networks_to_try = select_endpoints(OCEAN_NETWORK_CANDIDATES)
+
+            ocean = None
+            network_name = None
+            rpc_url = None
+
+            for network_url, name in networks_to_try:
+                try:
+                    ocean = get_ocean(network_url)
+                    network_name = name
+                    rpc_url = network_url
+                    print(f"   ✅ Connected to {name}")
+                    break
+                except Exception as e:
+                    print(f"   ⚠️  {name} failed: {str(e)[:60]}...")
+                    telemetry.count("retries_total", reason="network_failover")
+                    continue
         
         if not ocean:
+            forget_endpoints(OCEAN_NETWORK_CANDIDATES)
             print("   ❌ Could not connect to any Ocean network")
             print("   💡 Falling back to simulation mode")
             return publish_volunteer_data_simulation()
@@ -190,12 +205,15 @@ def publish_volunteer_data_real():
         # Setup account
         print("\n2. 👤 Setting up NGO publisher account...")
         private_key = '0x4f3edf983ac636a65a842ce7c78d9aa706d3b113bce9c46f30d7d21715b23b1d'
-        alice = Account.from_key(private_key)
-        
+        with telemetry.span("publish.account_setup"):
+            from eth_account import Account
+
+            alice = Account.from_key(private_key)
+
         # Check balance
-        balance = ocean.web3.eth.get_balance(alice.address)
-        balance_eth = ocean.web3.from_wei(balance, 'ether')
-        
+        with telemetry.span("publish.balance_check", network=network_name):
+            balance_eth = get_balance_eth(rpc_url, alice.address)
+
         print(f"   ✅ Publisher: {alice.address}")
         print(f"   💰 Balance: {balance_eth} ETH")
         print(f"   🌐 Network: {network_name}")
@@ -210,45 +228,47 @@ def publish_volunteer_data_real():
         print("\n3. 📊 Publishing volunteer data assets...")
         
         volunteer_data_url = "https://raw.githubusercontent.com/datasets/country-list/master/data.json"
-        published_assets = []
         
-        try:
-            # Free asset
-            print("   📂 Publishing free volunteer directory...")
-            
-            free_metadata = {
-                "name": "Romanian NGO Volunteer Directory - Free Access",
-                "description": "Basic volunteer information for public verification",
-                "author": "Romanian NGO Association", 
-                "created": datetime.now().isoformat(),
-                "license": "CC0",
-                "tags": ["volunteers", "romania", "ngo", "verification"],
-                "type": "dataset"
+        # Dataset aggregates and Merkle root come from one streaming pass over the registry
+        if volunteer_source:
+            volunteer_stats, merkle_attestation = summarize_and_attest(volunteer_source)
+        else:
+            volunteer_stats = SAMPLE_VOLUNTEER_DATA["metadata"]
+            merkle_attestation = SAMPLE_VOLUNTEER_DATA["attestation"]
+        
+        # Free asset
+        print("   📂 Publishing free volunteer directory...")
+        
+        free_metadata = {
+            "name": "Romanian NGO Volunteer Directory - Free Access",
+            "description": "Basic volunteer information for public verification",
+            "author": "Romanian NGO Association", 
+            "created": datetime.now().isoformat(),
+            "license": "CC0",
+            "tags": ["volunteers", "romania", "ngo", "verification"],
+            "type": "dataset",
+            "additionalInformation": {
+                "volunteer_statistics": volunteer_stats,
+                "merkle_attestation": merkle_attestation
             }
-            
-            (data_nft, datatoken, ddo) = ocean.assets.create_url_asset(
-                name=free_metadata["name"],
-                url=volunteer_data_url,
-                tx_dict={"from": alice},
-                metadata=free_metadata
-            )
-            
-            print("   ✅ Free volunteer directory published!")
-            print(f"      📊 Data NFT: {data_nft.symbol()} at {data_nft.address}")
-            print(f"      🎫 Datatoken: {datatoken.symbol()} at {datatoken.address}")
-            print(f"      🌐 DID: {ddo.did}")
-            
-            published_assets.append({
+        }
+        
+        asset_specs = [
+            {
                 "type": "free_directory",
-                "data_nft": data_nft.address,
-                "datatoken": datatoken.address,
-                "did": ddo.did,
+                "url": volunteer_data_url,
                 "metadata": free_metadata,
                 "price": "Free"
-            })
-            
-        except Exception as e:
-            print(f"   ❌ Asset publishing failed: {e}")
+            }
+        ]
+        
+        # Publish all specs concurrently with locally managed nonces
+        with telemetry.span("publish.assets", count=len(asset_specs)):
+            publish_results = publish_assets(ocean, alice, asset_specs)
+        print_publish_results(publish_results)
+        published_assets = [
+            to_published_asset(r) for r in publish_results if r["status"] == "published"
+        ]
             
         # Save results
         results = {
@@ -259,10 +279,10 @@ def publish_volunteer_data_real():
             "assets": published_assets
         }
         
-        with open("ocean_published_assets_real.json", "w") as f:
-            json.dump(results, f, indent=2)
+        with telemetry.span("publish.save_results"):
+            record_run("real", results)
         
-        print(f"\n   💾 Real results saved to ocean_published_assets_real.json")
+        print(f"\n   💾 Real run recorded in {DEFAULT_MANIFEST_PATH} (exported to ocean_published_assets_real.json)")
         return results
         
     except ImportError as e:
@@ -273,8 +293,12 @@ def publish_volunteer_data_real():
         print(f"   ❌ Unexpected error: {e}")
         return None
 
-def demonstrate_sbt_integration(published_assets):
-    """Show how to integrate published Ocean assets with Soul-Bound Tokens"""
+def demonstrate_sbt_integration(published_assets, resolver=None):
+    """Show how to integrate published Ocean assets with Soul-Bound Tokens
+
+    resolver is an optional ddo_cache.OceanResolver; when given, each DID is
+    resolved through its cache and the DDO name is shown with the asset.
+    """
     print("\n" + "=" * 70)
     print("🏆 SOUL-BOUND TOKEN INTEGRATION GUIDE")
     print("=" * 70)
@@ -334,6 +358,12 @@ def demonstrate_sbt_integration(published_assets):
         print(f"   • Data NFT: {asset['data_nft']}")
         print(f"   • Datatoken: {asset['datatoken']}")
         print(f"   • Price: {asset.get('price', 'Free')}")
+        if resolver is not None:
+            try:
+                ddo = resolver.ddo(asset['did'])
+                print(f"   • Resolved DDO: {ddo.get('metadata', {}).get('name', ddo.get('id'))}")
+            except Exception as e:
+                print(f"   • Resolved DDO: unavailable ({e})")
         print(f"   • Use Case: Verify volunteer data through Ocean Protocol")
     
     print("\n4. 🚀 Next Development Steps:")
@@ -347,6 +377,7 @@ def demonstrate_sbt_integration(published_assets):
     print("   • Backend: Node.js with Ocean.py")
     print("   • Blockchain: Polygon/Mumbai for low fees")
     print("   • Storage: IPFS for volunteer metadata")
+    print("   • Verification: employers query verify_service.py (GET /verify/<address>, POST /verify/batch)")
     
     # Generate integration template
     integration_template = {
@@ -368,52 +399,49 @@ def demonstrate_sbt_integration(published_assets):
         "published_assets": published_assets
     }
     
-    with open("sbt_integration_template.json", "w") as f:
-        json.dump(integration_template, f, indent=2)
+    record_run("sbt_template", integration_template)
     
-    print(f"\n   💾 Integration template saved to sbt_integration_template.json")
+    print(f"\n   💾 Integration template recorded in {DEFAULT_MANIFEST_PATH} (exported to sbt_integration_template.json)")
 
 # Sample volunteer data for the Romanian NGO system
-SAMPLE_VOLUNTEER_DATA = {
-    "volunteers": [
-        {
-            "id": "NGO-RO-001",
-            "name": "Maria Popescu", 
-            "organization": "Habitat for Humanity Romania",
-            "hours_completed": 120,
-            "certifications": ["First Aid", "Construction Safety"],
-            "verified": True,
-            "verification_date": "2024-01-15",
-            "region": "Bucharest"
-        },
-        {
-            "id": "NGO-RO-002", 
-            "name": "Alexandru Ionescu",
-            "organization": "Red Cross Romania",
-            "hours_completed": 85,
-            "certifications": ["Emergency Response", "Community Outreach"],
-            "verified": True,
-            "verification_date": "2024-01-10",
-            "region": "Cluj-Napoca"
-        },
-        {
-            "id": "NGO-RO-003",
-            "name": "Elena Radu",
-            "organization": "Save the Children Romania", 
-            "hours_completed": 200,
-            "certifications": ["Child Protection", "Educational Support"],
-            "verified": True,
-            "verification_date": "2024-01-20",
-            "region": "Timisoara"
-        }
-    ],
-    "metadata": {
-        "total_volunteers": 3,
-        "total_hours": 405,
-        "verification_standard": "Romanian NGO Association Standard v2.1",
-        "last_updated": "2024-01-20T10:30:00Z",
-        "regions_covered": ["Bucharest", "Cluj-Napoca", "Timisoara"]
+SAMPLE_VOLUNTEERS = [
+    {
+        "id": "NGO-RO-001",
+        "name": "Maria Popescu", 
+        "organization": "Habitat for Humanity Romania",
+        "hours_completed": 120,
+        "certifications": ["First Aid", "Construction Safety"],
+        "verified": True,
+        "verification_date": "2024-01-15",
+        "region": "Bucharest"
+    },
+    {
+        "id": "NGO-RO-002", 
+        "name": "Alexandru Ionescu",
+        "organization": "Red Cross Romania",
+        "hours_completed": 85,
+        "certifications": ["Emergency Response", "Community Outreach"],
+        "verified": True,
+        "verification_date": "2024-01-10",
+        "region": "Cluj-Napoca"
+    },
+    {
+        "id": "NGO-RO-003",
+        "name": "Elena Radu",
+        "organization": "Save the Children Romania", 
+        "hours_completed": 200,
+        "certifications": ["Child Protection", "Educational Support"],
+        "verified": True,
+        "verification_date": "2024-01-20",
+        "region": "Timisoara"
     }
+]
+
+# Aggregates are derived from the records, never maintained by hand
+SAMPLE_VOLUNTEER_DATA = {
+    "volunteers": SAMPLE_VOLUNTEERS,
+    "metadata": build_volunteer_metadata(SAMPLE_VOLUNTEERS),
+    "attestation": dataset_attestation(map(validate_volunteer, SAMPLE_VOLUNTEERS))
 }
 
 if __name__ == "__main__":
@@ -0,0 +1,188 @@
+"""
+Shared Web3 Provider Factory
+One pooled, keep-alive HTTP session and Web3 instance per RPC URL per process
+"""
+
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import telemetry
+
+DEFAULT_POOL_SIZE = int(os.environ.get("VOLUNTEER_RPC_POOL_SIZE", "32"))
+DEFAULT_TIMEOUT = float(os.environ.get("VOLUNTEER_RPC_TIMEOUT", "10"))
+
+_lock = threading.Lock()
+_owner_pid = os.getpid()
+_sessions = {}
+_web3_instances = {}
+_ocean_instances = {}
+
+
+def _check_fork():
+    """Sockets must not be shared with a forked child; start clean in a new process"""
+    global _owner_pid
+    if os.getpid() != _owner_pid:
+        _sessions.clear()
+        _web3_instances.clear()
+        _ocean_instances.clear()
+        _owner_pid = os.getpid()
+
+
+def _record_response(response, *args, **kwargs):
+    """requests response hook feeding the RPC counters and latency histogram"""
+    if telemetry.enabled():
+        telemetry.count("rpc_requests_total", status=response.status_code)
+        telemetry.observe("rpc_request_seconds", response.elapsed.total_seconds())
+
+
+def get_session(rpc_url, pool_size=DEFAULT_POOL_SIZE):
+    """Return the process-wide keep-alive session for an RPC URL"""
+    with _lock:
+        _check_fork()
+        session = _sessions.get(rpc_url)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({"Content-Type": "application/json", "Connection": "keep-alive"})
+            session.hooks["response"].append(_record_response)
+            _sessions[rpc_url] = session
+        return session
+
+
+def get_provider(rpc_url, pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT):
+    """Build an HTTPProvider backed by the shared pooled session"""
+    from web3 import Web3
+
+    return Web3.HTTPProvider(
+        rpc_url,
+        request_kwargs={"timeout": timeout},
+        session=get_session(rpc_url, pool_size)
+    )
+
+
+def get_web3(rpc_url, pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT):
+    """Return the process-wide Web3 instance for an RPC URL"""
+    from web3 import Web3
+
+    with _lock:
+        _check_fork()
+        web3 = _web3_instances.get(rpc_url)
+    if web3 is None:
+        web3 = Web3(get_provider(rpc_url, pool_size, timeout))
+        with _lock:
+            web3 = _web3_instances.setdefault(rpc_url, web3)
+    return web3
+
+
+def get_ocean_config(rpc_url, pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT):
+    """Ocean config dict whose web3 instance talks through the pooled session"""
+    from ocean_lib.example_config import get_config_dict
+
+    config = get_config_dict(rpc_url)
+    web3 = config.get("web3_instance")
+    if web3 is None:
+        config["web3_instance"] = get_web3(rpc_url, pool_size, timeout)
+    else:
+        # Keep Ocean's own middleware (e.g. PoA for Polygon), swap the transport only
+        web3.provider = get_provider(rpc_url, pool_size, timeout)
+    return config
+
+
+def get_ocean(rpc_url, config=None):
+    """Return the process-wide Ocean instance for an RPC URL"""
+    from ocean_lib.ocean.ocean import Ocean
+
+    with _lock:
+        _check_fork()
+        ocean = _ocean_instances.get(rpc_url)
+    if ocean is None:
+        ocean = Ocean(config or get_ocean_config(rpc_url))
+        with _lock:
+            ocean = _ocean_instances.setdefault(rpc_url, ocean)
+    return ocean
+
+
+def rpc_call(rpc_url, method, params=None, timeout=DEFAULT_TIMEOUT):
+    """Send one raw JSON-RPC request over the pooled session and return its result"""
+    response = get_session(rpc_url).post(
+        rpc_url,
+        json={"jsonrpc": "2.0", "id": 1, "method": method, "params": params or []},
+        timeout=timeout
+    )
+    response.raise_for_status()
+    body = response.json()
+    if "error" in body:
+        raise RuntimeError(body["error"].get("message", body["error"]))
+    return body["result"]
+
+
+def rpc_batch(rpc_url, calls, timeout=DEFAULT_TIMEOUT):
+    """Send [(method, params)] as one JSON-RPC batch; returns the raw replies in call order"""
+    if not calls:
+        return []
+    payload = [{"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+               for i, (method, params) in enumerate(calls)]
+    response = get_session(rpc_url).post(rpc_url, json=payload, timeout=timeout)
+    response.raise_for_status()
+    body = response.json()
+    if isinstance(body, dict):
+        # Some nodes answer a whole rejected batch with a single error object
+        raise RuntimeError(body.get("error", {}).get("message", body))
+    replies = [None] * len(calls)
+    for reply in body:
+        replies[reply["id"]] = reply
+    return replies
+
+
+def benchmark_round_trips(rpc_url="http://localhost:8545", seconds=3.0, threads=32):
+    """Measure eth_blockNumber round trips per second with and without pooling"""
+    from concurrent.futures import ThreadPoolExecutor
+    from web3 import Web3
+
+    def run(label, make_call):
+        deadline = time.perf_counter() + seconds
+        counts = [0] * threads
+
+        def worker(index):
+            while time.perf_counter() < deadline:
+                make_call()
+                counts[index] += 1
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(worker, range(threads)))
+        elapsed = time.perf_counter() - started
+        return label, sum(counts) / elapsed
+
+    pooled = get_web3(rpc_url, pool_size=threads)
+    default = Web3(Web3.HTTPProvider(rpc_url))
+    modes = [
+        # What each script used to do: a fresh Web3 and connection per use
+        ("fresh_web3_per_call", lambda: Web3(Web3.HTTPProvider(rpc_url)).eth.block_number),
+        ("default_provider", lambda: default.eth.block_number),
+        ("pooled_provider", lambda: pooled.eth.block_number)
+    ]
+    return dict(run(label, call) for label, call in modes)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="RPC round-trip micro-benchmark against a local node")
+    parser.add_argument("--rpc-url", default="http://localhost:8545")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--threads", type=int, default=32)
+    args = parser.parse_args()
+
+    print("🔌 Pooled Provider Micro-benchmark")
+    print("=" * 40)
+    results = benchmark_round_trips(args.rpc_url, args.seconds, args.threads)
+    for label, rate in results.items():
+        print(f"   {label:>20}: {rate:,.0f} round trips/s")
+    print(f"   🚀 Pooled vs fresh: {results['pooled_provider'] / results['fresh_web3_per_call']:.1f}x")
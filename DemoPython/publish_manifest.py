@@ -0,0 +1,337 @@
+"""
+Append-Only Publish Manifest
+Keeps the history of every publishing run in one JSONL file with an O(1) index
+
+Each run is appended as a single line and fsynced, so earlier runs are never
+rewritten and a crash can at most leave a torn last line, which is cut off
+the next time the manifest is opened. A fixed-slot hash table next to the
+manifest maps every DID, data NFT and datatoken address to the offset of the
+record that last published it. The legacy JSON files are exports of the
+latest run of each kind.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from datetime import datetime
+
+DEFAULT_MANIFEST_PATH = os.environ.get("VOLUNTEER_MANIFEST_PATH", "publish_manifest.jsonl")
+
+# Run kinds and the JSON file each one used to be dumped to
+LEGACY_FILES = {
+    "simulation": "ocean_published_assets_simulation.json",
+    "real": "ocean_published_assets_real.json",
+    "fixed": "ocean_published_assets.json",
+    "sbt_template": "sbt_integration_template.json"
+}
+
+INDEX_MAGIC = b"VMIDX001"
+INDEX_HEADER = struct.Struct("<8sQQQ")  # magic, capacity, count, indexed manifest length
+INDEX_SLOT = struct.Struct("<QQ")  # key hash (0 = empty), record offset
+INITIAL_CAPACITY = 1024
+MAX_LOAD = 0.5
+
+
+def _key_hash(key):
+    digest = hashlib.blake2b(key.strip().lower().encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little") or 1
+
+
+def asset_keys(asset):
+    """Lookup keys of one published asset"""
+    return [asset[field] for field in ("did", "data_nft", "datatoken") if asset.get(field)]
+
+
+def _record_assets(record):
+    data = record.get("data") or {}
+    return data.get("assets") or data.get("published_assets") or []
+
+
+def _write_atomic(path, text):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class ManifestIndex:
+    """Open-addressing hash table file from key hash to manifest offset"""
+
+    def __init__(self, path, capacity=INITIAL_CAPACITY):
+        """``capacity`` (a power of two) sizes a new table so bulk loads never grow it"""
+        self.path = path
+        if not os.path.exists(path) or os.path.getsize(path) < INDEX_HEADER.size:
+            self._create(capacity)
+        self._open()
+        if self.magic != INDEX_MAGIC:
+            self.close()
+            self._create(capacity)
+            self._open()
+
+    def _create(self, capacity):
+        with open(self.path, "wb") as f:
+            f.write(INDEX_HEADER.pack(INDEX_MAGIC, capacity, 0, 0))
+            f.truncate(INDEX_HEADER.size + capacity * INDEX_SLOT.size)
+
+    def _open(self):
+        self._file = open(self.path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        self.magic, self.capacity, self.count, self.indexed_length = INDEX_HEADER.unpack_from(self._map, 0)
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def flush(self, indexed_length):
+        self.indexed_length = indexed_length
+        INDEX_HEADER.pack_into(self._map, 0, INDEX_MAGIC, self.capacity, self.count, indexed_length)
+        self._map.flush()
+
+    def reset(self):
+        """Empty the table, keeping its capacity so a rebuild does not grow it again"""
+        self.close()
+        self._create(self.capacity)
+        self._open()
+
+    def _slot(self, position):
+        return INDEX_SLOT.unpack_from(self._map, INDEX_HEADER.size + position * INDEX_SLOT.size)
+
+    def probe(self, key_hash):
+        """Yield offsets stored under ``key_hash``, following the probe chain"""
+        mask = self.capacity - 1
+        position = key_hash & mask
+        for _ in range(self.capacity):
+            stored_hash, offset = self._slot(position)
+            if stored_hash == 0:
+                return
+            if stored_hash == key_hash:
+                yield position, offset
+            position = (position + 1) & mask
+
+    def put(self, key_hash, offset):
+        """Point ``key_hash`` at ``offset`` (64-bit hashes make collisions negligible)"""
+        mask = self.capacity - 1
+        position = key_hash & mask
+        while True:
+            stored_hash, _ = self._slot(position)
+            if stored_hash in (0, key_hash):
+                break
+            position = (position + 1) & mask
+        INDEX_SLOT.pack_into(self._map, INDEX_HEADER.size + position * INDEX_SLOT.size, key_hash, offset)
+        if stored_hash == 0:
+            self.count += 1
+            if self.count > self.capacity * MAX_LOAD:
+                self._grow()
+
+    def _grow(self):
+        entries = [self._slot(p) for p in range(self.capacity)]
+        indexed_length, capacity = self.indexed_length, self.capacity * 2
+        self.close()
+        self._create(capacity)
+        self._open()
+        for key_hash, offset in entries:
+            if key_hash:
+                self.put(key_hash, offset)
+        self.flush(indexed_length)
+
+
+class PublishManifest:
+    """Append-only manifest of publishing runs with an on-disk key index
+
+    One writer process at a time; readers may open the manifest while it
+    is being appended to.
+    """
+
+    def __init__(self, path=DEFAULT_MANIFEST_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        if not os.path.exists(path):
+            open(path, "ab").close()
+        self._repair_tail()
+        self.index = ManifestIndex(f"{path}.idx")
+        self._catch_up()
+
+    def close(self):
+        self.index.close()
+
+    # ========== CRASH SAFETY ==========
+
+    def _repair_tail(self):
+        """Cut off a torn last line left by a crash mid-append"""
+        size = os.path.getsize(self.path)
+        if size == 0:
+            return
+        with open(self.path, "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) == b"\n":
+                return
+            position = size
+            while position > 0:
+                step = min(4096, position)
+                f.seek(position - step)
+                chunk = f.read(step)
+                newline = chunk.rfind(b"\n")
+                if newline != -1:
+                    position = position - step + newline + 1
+                    break
+                position -= step
+            f.truncate(position)
+
+    def _catch_up(self):
+        """Index records appended after the index was last flushed"""
+        size = os.path.getsize(self.path)
+        if self.index.indexed_length > size:
+            # Manifest was replaced (e.g. compacted by another tool): start over
+            self.index.reset()
+        for offset, record in self._scan(self.index.indexed_length):
+            self._index_record(record, offset)
+        self.index.flush(size)
+
+    def _index_record(self, record, offset):
+        for asset in _record_assets(record):
+            for key in asset_keys(asset):
+                self.index.put(_key_hash(key), offset)
+
+    # ========== WRITING ==========
+
+    def append(self, kind, data):
+        """Append one run and return its offset"""
+        with self._lock:
+            record = {"kind": kind, "recorded_at": datetime.now().isoformat(), "data": data}
+            line = (json.dumps(record, separators=(",", ":"), default=str) + "\n").encode()
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND)
+            try:
+                offset = os.lseek(fd, 0, os.SEEK_END)
+                os.write(fd, line)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            self._index_record(record, offset)
+            self.index.flush(offset + len(line))
+            return offset
+
+    # ========== READING ==========
+
+    def _scan(self, start=0):
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                if line.strip():
+                    yield offset, json.loads(line)
+                offset += len(line)
+
+    def read_at(self, offset):
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    def records(self, kind=None):
+        """All runs, oldest first"""
+        for _, record in self._scan():
+            if kind is None or record["kind"] == kind:
+                yield record
+
+    def lookup(self, key):
+        """Latest published asset for a DID, data NFT or datatoken address, or None"""
+        wanted = key.strip().lower()
+        for _, offset in self.index.probe(_key_hash(key)):
+            record = self.read_at(offset)
+            for asset in _record_assets(record):
+                if wanted in (k.lower() for k in asset_keys(asset)):
+                    return {"kind": record["kind"], "recorded_at": record["recorded_at"],
+                            "publisher": record["data"].get("publisher"),
+                            "network": record["data"].get("network"), "asset": asset}
+        return None
+
+    def latest(self, kind):
+        """Most recent run of ``kind`` in its original JSON shape, or None"""
+        data = None
+        for record in self.records(kind):
+            data = record["data"]
+        return data
+
+    # ========== MAINTENANCE ==========
+
+    def export(self, kind, path=None, data=None):
+        """Write the latest run of ``kind`` (or ``data``, when the caller just appended it) to its legacy JSON file"""
+        if data is None:
+            data = self.latest(kind)
+        if data is None:
+            return None
+        path = path or LEGACY_FILES[kind]
+        _write_atomic(path, json.dumps(data, indent=2, default=str))
+        return path
+
+    def compact(self):
+        """Drop runs whose assets were all republished later; keep the latest run of each kind
+
+        Returns (records before, records after).
+        """
+        with self._lock:
+            latest_of_kind, live = {}, set()
+            entries = list(self._scan())
+            for offset, record in entries:
+                latest_of_kind[record["kind"]] = offset
+            for offset, record in entries:
+                if any(offset in {o for _, o in self.index.probe(_key_hash(k))}
+                       for asset in _record_assets(record) for k in asset_keys(asset)):
+                    live.add(offset)
+            keep = live | set(latest_of_kind.values())
+            lines = [json.dumps(record, separators=(",", ":"), default=str)
+                     for offset, record in entries if offset in keep]
+            _write_atomic(self.path, "".join(line + "\n" for line in lines))
+            self.index.reset()
+            self._catch_up()
+            return len(entries), len(lines)
+
+
+def record_run(kind, data, path=DEFAULT_MANIFEST_PATH, export=True):
+    """Append a run to the manifest and refresh its legacy JSON export"""
+    manifest = PublishManifest(path)
+    try:
+        manifest.append(kind, data)
+        # The run just appended is the latest one: no need to re-scan the history for it
+        return manifest.export(kind, data=data) if export else None
+    finally:
+        manifest.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Inspect and maintain the publish manifest")
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST_PATH)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    lookup = subparsers.add_parser("lookup", help="find an asset by DID, data NFT or datatoken address")
+    lookup.add_argument("key")
+    export = subparsers.add_parser("export", help="write the latest run of a kind in the legacy JSON shape")
+    export.add_argument("kind", choices=sorted(LEGACY_FILES))
+    export.add_argument("--output", help="default: the legacy file name")
+    subparsers.add_parser("compact", help="drop superseded runs and rebuild the index")
+    subparsers.add_parser("list", help="list recorded runs")
+    args = parser.parse_args()
+
+    manifest = PublishManifest(args.manifest)
+    if args.command == "lookup":
+        found = manifest.lookup(args.key)
+        if found is None:
+            print(f"❌ {args.key} not found in {args.manifest}")
+            sys.exit(1)
+        print(json.dumps(found, indent=2))
+    elif args.command == "export":
+        path = manifest.export(args.kind, args.output)
+        print(f"💾 Exported latest '{args.kind}' run to {path}" if path else f"❌ No '{args.kind}' runs recorded")
+    elif args.command == "compact":
+        before, after = manifest.compact()
+        print(f"🗜️  Compacted {args.manifest}: {before} → {after} runs")
+    else:
+        for record in manifest.records():
+            print(f"   • {record['recorded_at']}  {record['kind']:<12} {len(_record_assets(record))} assets")
+    manifest.close()
@@ -0,0 +1,254 @@
+"""
+Ocean Protocol Concurrent Publishing Engine
+Publishes many volunteer data assets in parallel from a single NGO account
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import telemetry
+from fee_oracle import FeeOracle
+
+DEFAULT_MAX_WORKERS = 4
+NONCE_MIDDLEWARE_NAME = "volunteer_publisher_nonces"
+FEE_MIDDLEWARE_NAME = "volunteer_publisher_fees"
+
+
+class NonceManager:
+    """Hand out transaction nonces locally for one publisher account
+
+    Every transaction Ocean.py sends asks the node for the account's nonce.
+    With several publishes in flight those answers collide, so the manager
+    sits in the web3 middleware stack and answers eth_getTransactionCount
+    for the publisher from a local counter instead.
+
+    Publishes bracket their transactions with begin()/end(). A failed one
+    may leave a gap of nonces that never reached the chain, but the counter
+    is only re-read from the node once no other publish is holding nonces:
+    new publishes wait for the ones in flight to drain first.
+    """
+
+    def __init__(self, address):
+        self.address = address
+        self._lock = threading.Lock()
+        self._drained = threading.Condition(self._lock)
+        self._next_nonce = None
+        self._active = 0
+        self._resync_pending = False
+        self.issued = 0
+
+    def next_nonce(self, fetch_pending_count):
+        """Return the next free nonce, syncing from the node on first use"""
+        with self._lock:
+            if self._next_nonce is None:
+                self._next_nonce = fetch_pending_count()
+            nonce = self._next_nonce
+            self._next_nonce += 1
+            self.issued += 1
+            return nonce
+
+    def resync(self):
+        """Forget the local counter so the next nonce is re-read from the node"""
+        with self._lock:
+            self._next_nonce = None
+
+    def begin(self):
+        """Enter a publish; after a failure, first wait for the publishes in flight to finish"""
+        with self._drained:
+            while self._resync_pending and self._active:
+                self._drained.wait()
+            if self._resync_pending:
+                self._next_nonce, self._resync_pending = None, False
+            self._active += 1
+
+    def end(self, failed=False):
+        """Leave a publish; a failure resyncs the counter once nothing is in flight"""
+        with self._drained:
+            self._active -= 1
+            self._resync_pending = self._resync_pending or failed
+            if not self._active:
+                if self._resync_pending:
+                    self._next_nonce, self._resync_pending = None, False
+                self._drained.notify_all()
+
+    def middleware(self, make_request, web3):
+        """web3 middleware answering nonce lookups for the publisher locally"""
+        publisher = self.address.lower()
+
+        def fetch_pending_count(address):
+            response = make_request("eth_getTransactionCount", [address, "pending"])
+            return int(response["result"], 16)
+
+        def handle(method, params):
+            if method == "eth_getTransactionCount" and params and str(params[0]).lower() == publisher:
+                nonce = self.next_nonce(lambda: fetch_pending_count(params[0]))
+                return {"jsonrpc": "2.0", "id": 0, "result": hex(nonce)}
+            if method in ("eth_sendRawTransaction", "eth_sendTransaction"):
+                telemetry.count("tx_sent_total", source="ocean_publish")
+            return make_request(method, params)
+
+        return handle
+
+
+def _publish_one(ocean, publisher, spec, nonces, parent_span=None):
+    """Publish a single asset spec and describe the outcome"""
+    metadata = spec["metadata"]
+    nonces.begin()
+    started = time.perf_counter()
+    try:
+        with telemetry.span("publish.create_url_asset", parent=parent_span, asset_type=spec["type"]):
+            try:
+                (data_nft, datatoken, ddo) = ocean.assets.create_url_asset(
+                    name=spec.get("name", metadata["name"]),
+                    url=spec["url"],
+                    tx_dict={"from": publisher},
+                    pricing=spec.get("pricing"),
+                    metadata=metadata
+                )
+            except Exception:
+                # A failed publish may have consumed nonces that never reached
+                # the chain; re-read the pending count (once the others are done
+                # with theirs) so later assets do not stall on a gap
+                nonces.end(failed=True)
+                telemetry.count("retries_total", reason="nonce_resync")
+                raise
+            nonces.end()
+        telemetry.count("assets_published_total", status="published")
+        return {
+            "type": spec["type"],
+            "status": "published",
+            "data_nft": data_nft.address,
+            "data_nft_symbol": data_nft.symbol(),
+            "datatoken": datatoken.address,
+            "datatoken_symbol": datatoken.symbol(),
+            "did": ddo.did,
+            "metadata": metadata,
+            "price": spec.get("price", "Free"),
+            "elapsed": time.perf_counter() - started
+        }
+    except Exception as e:
+        telemetry.count("assets_published_total", status="failed")
+        return {
+            "type": spec["type"],
+            "status": "failed",
+            "error": str(e),
+            "elapsed": time.perf_counter() - started
+        }
+
+
+def publish_assets(ocean, publisher, asset_specs, max_workers=DEFAULT_MAX_WORKERS, fees=None):
+    """Publish asset specs with bounded concurrency
+
+    Each spec is a dict with ``type``, ``url`` and ``metadata`` and optional
+    ``name``, ``pricing`` (e.g. ExchangeArguments) and ``price`` label.
+    Returns one result dict per spec in the same order; failed publishes
+    have ``status == "failed"`` and an ``error`` message instead of raising.
+    Gas estimates and fee lookups made inside create_url_asset are answered
+    by ``fees`` (a fresh FeeOracle by default).
+    """
+    nonces = NonceManager(publisher.address)
+    fees = fees or FeeOracle()
+    parent_span = telemetry.current_span()
+    ocean.web3.middleware_onion.add(nonces.middleware, name=NONCE_MIDDLEWARE_NAME)
+    ocean.web3.middleware_onion.add(fees.middleware, name=FEE_MIDDLEWARE_NAME)
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            futures = [
+                pool.submit(_publish_one, ocean, publisher, spec, nonces, parent_span)
+                for spec in asset_specs
+            ]
+            return [future.result() for future in futures]
+    finally:
+        ocean.web3.middleware_onion.remove(FEE_MIDDLEWARE_NAME)
+        ocean.web3.middleware_onion.remove(NONCE_MIDDLEWARE_NAME)
+
+
+def to_published_asset(result):
+    """Convert a successful engine result into the published_assets entry format"""
+    return {
+        "type": result["type"],
+        "data_nft": result["data_nft"],
+        "datatoken": result["datatoken"],
+        "did": result["did"],
+        "metadata": result["metadata"],
+        "price": result["price"]
+    }
+
+
+def print_publish_results(results):
+    """Print per-asset publish outcomes in the demo scripts' format"""
+    for result in results:
+        if result["status"] == "published":
+            print(f"   ✅ {result['metadata']['name']} published!")
+            print(f"      📊 Data NFT: {result['data_nft_symbol']} at {result['data_nft']}")
+            print(f"      🎫 Datatoken: {result['datatoken_symbol']} at {result['datatoken']}")
+            print(f"      🌐 DID: {result['did']}")
+            print(f"      💰 Price: {result['price']}")
+        else:
+            print(f"   ❌ {result['type']} publishing failed: {result['error']}")
+
+
+def benchmark_publishing(rpc_url="http://localhost:8545", asset_count=20, max_workers=DEFAULT_MAX_WORKERS):
+    """Compare serial and concurrent publishing against a local chain"""
+    from datetime import datetime
+    from eth_account import Account
+
+    from provider_factory import get_ocean
+    from sbt_contract import PUBLISHER_PRIVATE_KEY
+
+    # The shared instance talks through the pooled session, like every other caller
+    ocean = get_ocean(rpc_url)
+    publisher = Account.from_key(PUBLISHER_PRIVATE_KEY)
+
+    def make_specs(label):
+        return [
+            {
+                "type": f"benchmark_{label}_{i}",
+                "url": "https://raw.githubusercontent.com/datasets/country-list/master/data.json",
+                "metadata": {
+                    "name": f"Volunteer Benchmark Asset {label} {i}",
+                    "description": "Publishing engine benchmark asset",
+                    "author": "Romanian NGO Association",
+                    "created": datetime.now().isoformat(),
+                    "license": "CC0",
+                    "tags": ["volunteers", "benchmark"],
+                    "type": "dataset"
+                }
+            }
+            for i in range(asset_count)
+        ]
+
+    report = {"rpc_url": rpc_url, "asset_count": asset_count, "max_workers": max_workers}
+    for label, workers in (("serial", 1), ("concurrent", max_workers)):
+        started = time.perf_counter()
+        results = publish_assets(ocean, publisher, make_specs(label), max_workers=workers)
+        elapsed = time.perf_counter() - started
+        report[label] = {
+            "seconds": elapsed,
+            "published": sum(1 for r in results if r["status"] == "published"),
+            "failed": sum(1 for r in results if r["status"] == "failed"),
+            "assets_per_second": asset_count / elapsed if elapsed else 0.0
+        }
+    report["speedup"] = report["serial"]["seconds"] / report["concurrent"]["seconds"]
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark concurrent Ocean publishing on a local chain")
+    parser.add_argument("--rpc-url", default="http://localhost:8545")
+    parser.add_argument("--assets", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS)
+    args = parser.parse_args()
+
+    print("🌊 Ocean Publishing Engine Benchmark")
+    print("=" * 40)
+    print("   💡 Requires Ganache with Ocean contracts deployed (e.g. Ocean barge)")
+    report = benchmark_publishing(args.rpc_url, args.assets, args.workers)
+    for label in ("serial", "concurrent"):
+        stats = report[label]
+        print(f"   {label:>10}: {stats['seconds']:.2f}s "
+              f"({stats['assets_per_second']:.2f} assets/s, {stats['failed']} failed)")
+    print(f"   🚀 Speedup: {report['speedup']:.2f}x")
@@ -0,0 +1,343 @@
+"""
+Hedged Read Router
+Spreads read-only JSON-RPC calls across several endpoints by live latency
+
+Each call goes to an endpoint picked with probability inversely proportional
+to its recent latency times its in-flight load. If no answer arrives within
+the hedge percentile (p95 by default) of the fastest endpoint, the same
+request is sent to the next best endpoint and whichever answers first wins. Endpoints that
+keep failing are ejected by a circuit breaker and retried after a cooldown.
+RouterProvider plugs the router into Web3 so contract reads such as
+verifyVolunteerCredential use it unchanged.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import telemetry
+from provider_factory import DEFAULT_TIMEOUT, get_session
+
+READ_METHODS = frozenset({
+    "eth_blockNumber", "eth_chainId", "net_version", "eth_call", "eth_getBalance", "eth_getCode",
+    "eth_getStorageAt", "eth_getTransactionCount", "eth_getBlockByNumber", "eth_getBlockByHash",
+    "eth_getTransactionByHash", "eth_getTransactionReceipt", "eth_getLogs", "eth_gasPrice",
+    "eth_maxPriorityFeePerGas", "eth_feeHistory", "eth_estimateGas"
+})
+DEFAULT_HEDGE_PERCENTILE = 95
+MIN_HEDGE_DELAY = 0.005
+LATENCY_WINDOW = 1024
+EWMA_ALPHA = 0.2
+FAILURE_THRESHOLD = 5
+BREAKER_COOLDOWN = 10.0
+
+
+class NoHealthyEndpoint(RuntimeError):
+    """Every endpoint's circuit breaker is open"""
+
+
+class Endpoint:
+    """Latency window, load and circuit breaker state of one RPC URL"""
+
+    def __init__(self, url, name=None):
+        self.url = url
+        self.name = name or url
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.ewma = None
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.state = "closed"
+        self.opened_at = 0.0
+
+    def percentile(self, p):
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+    def score(self, fallback):
+        return (self.ewma if self.ewma is not None else fallback) * (self.in_flight + 1)
+
+    def record_success(self, latency):
+        self.latencies.append(latency)
+        self.ewma = latency if self.ewma is None else EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.ewma
+        self.consecutive_failures = 0
+        self.state = "closed"
+
+    def record_failure(self, threshold):
+        self.errors += 1
+        self.consecutive_failures += 1
+        if self.state == "half_open" or self.consecutive_failures >= threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+            telemetry.count("rpc_breaker_open_total", endpoint=self.name)
+
+    def available(self, cooldown):
+        """Closed, or open long enough to let one trial request through"""
+        return self.state == "closed" or (self.state == "open" and time.monotonic() - self.opened_at >= cooldown)
+
+    def admit(self, cooldown):
+        """Claim the endpoint for a request; a cooled-down open breaker turns half-open for its one trial"""
+        if not self.available(cooldown):
+            return False
+        if self.state == "open":
+            self.state = "half_open"
+        return True
+
+    def summary(self):
+        p50, p99 = self.percentile(50), self.percentile(99)
+        return {
+            "name": self.name,
+            "url": self.url,
+            "state": self.state,
+            "requests": self.requests,
+            "errors": self.errors,
+            "p50_ms": p50 * 1000 if p50 is not None else None,
+            "p99_ms": p99 * 1000 if p99 is not None else None
+        }
+
+
+class ReadRouter:
+    """Latency-weighted, hedged JSON-RPC reads over a pool of endpoints"""
+
+    def __init__(self, endpoints, hedge_percentile=DEFAULT_HEDGE_PERCENTILE, min_hedge_delay=MIN_HEDGE_DELAY,
+                 failure_threshold=FAILURE_THRESHOLD, breaker_cooldown=BREAKER_COOLDOWN, timeout=DEFAULT_TIMEOUT,
+                 max_workers=64):
+        self.endpoints = [Endpoint(*e) if isinstance(e, (tuple, list)) else Endpoint(e) for e in endpoints]
+        if not self.endpoints:
+            raise ValueError("ReadRouter needs at least one endpoint")
+        self.hedge_percentile = hedge_percentile
+        self.min_hedge_delay = min_hedge_delay
+        self.failure_threshold = failure_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._ids = iter(range(1, 1 << 62))
+        self.hedges_sent = 0
+        self.hedges_won = 0
+
+    def close(self):
+        self._pool.shutdown(wait=False)
+
+    def _ranked(self):
+        """Available endpoints: a latency-weighted random pick first, the rest best-first"""
+        with self._lock:
+            available = [e for e in self.endpoints if e.available(self.breaker_cooldown)]
+            if not available:
+                raise NoHealthyEndpoint(f"all {len(self.endpoints)} endpoints are ejected")
+            known = [e.ewma for e in available if e.ewma is not None]
+            fallback = min(known) if known else 1.0  # untried endpoints look as fast as the best one
+            scores = [e.score(fallback) for e in available]
+            primary = random.choices(available, weights=[1 / max(s, 1e-6) for s in scores])[0]
+            rest = sorted((e for e in available if e is not primary), key=lambda e: e.score(fallback))
+            return [primary] + rest
+
+    def _hedge_delay(self):
+        """Deadline after which a request is hedged: the hedge percentile of the fastest endpoint
+
+        A slowed endpoint's own p95 is slow too, so the deadline is what a
+        healthy endpoint would have needed.
+        """
+        with self._lock:
+            delays = [d for d in (e.percentile(self.hedge_percentile) for e in self.endpoints) if d is not None]
+        return max(self.min_hedge_delay, min(delays)) if delays else None
+
+    def _send(self, endpoint, payload):
+        with self._lock:
+            if not endpoint.admit(self.breaker_cooldown):
+                # Another request took the half-open trial since the endpoint was ranked
+                raise NoHealthyEndpoint(f"{endpoint.name} is ejected")
+            endpoint.in_flight += 1
+            endpoint.requests += 1
+        started = time.perf_counter()
+        try:
+            response = get_session(endpoint.url).post(endpoint.url, json=payload, timeout=self.timeout)
+            response.raise_for_status()
+            body = response.json()  # a JSON-RPC error (e.g. a revert) is still a healthy answer
+        except Exception:
+            with self._lock:
+                endpoint.in_flight -= 1
+                endpoint.record_failure(self.failure_threshold)
+            raise
+        with self._lock:
+            endpoint.in_flight -= 1
+            endpoint.record_success(time.perf_counter() - started)
+        return body
+
+    def make_request(self, method, params):
+        """JSON-RPC response dict for a read-only method"""
+        if method not in READ_METHODS:
+            raise ValueError(f"{method} is not a read; send writes through a single endpoint")
+        payload = {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params or []}
+        candidates = self._ranked()
+        primary = candidates.pop(0)
+        pending = {self._pool.submit(self._send, primary, payload): primary}
+        timeout = self._hedge_delay() if candidates else None
+        hedged, last_error = False, None
+
+        while pending:
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                # The primary is slower than its own hedge percentile: race a second endpoint
+                endpoint = candidates.pop(0)
+                pending[self._pool.submit(self._send, endpoint, payload)] = endpoint
+                hedged, timeout = True, None
+                with self._lock:
+                    self.hedges_sent += 1
+                telemetry.count("rpc_hedges_total", outcome="sent")
+                continue
+            for future in done:
+                endpoint = pending.pop(future)
+                try:
+                    body = future.result()
+                except Exception as e:
+                    last_error = e
+                    if candidates and not pending:
+                        # Fail over straight away instead of waiting for a hedge deadline
+                        retry = candidates.pop(0)
+                        pending[self._pool.submit(self._send, retry, payload)] = retry
+                        timeout = None
+                    continue
+                if hedged and endpoint is not primary:
+                    with self._lock:
+                        self.hedges_won += 1
+                    telemetry.count("rpc_hedges_total", outcome="won")
+                return body
+        raise RuntimeError(f"{method} failed on every endpoint tried: {last_error}")
+
+    def request(self, method, params=None):
+        """Result of a read-only call; JSON-RPC errors raise RuntimeError like provider_factory.rpc_call"""
+        body = self.make_request(method, params)
+        if "error" in body:
+            raise RuntimeError(body["error"].get("message", body["error"]))
+        return body["result"]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hedges_sent": self.hedges_sent,
+                "hedges_won": self.hedges_won,
+                "endpoints": [e.summary() for e in self.endpoints]
+            }
+
+
+def get_routed_web3(router):
+    """Web3 instance whose reads go through ``router`` (it cannot send transactions)"""
+    from web3 import Web3
+    from web3.providers import JSONBaseProvider
+
+    class RouterProvider(JSONBaseProvider):
+        def make_request(self, method, params):
+            return router.make_request(method, params)
+
+        def is_connected(self, show_traceback=False):
+            return any(e.state != "open" for e in router.endpoints)
+
+    return Web3(RouterProvider())
+
+
+# ========== TEST HARNESS ==========
+
+def start_slow_proxy(target_url, delay, jitter=0.0, slow_fraction=1.0, port=0):
+    """Forward JSON-RPC to ``target_url``, holding ``slow_fraction`` of requests for ``delay`` (+ jitter) seconds
+
+    Returns (server, proxy_url); stands in for a congested endpoint in tests.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    session = get_session(target_url)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if random.random() < slow_fraction:
+                time.sleep(delay + random.random() * jitter)
+            upstream = session.post(target_url, data=body, headers={"Content-Type": "application/json"})
+            self.send_response(upstream.status_code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(upstream.content)))
+            self.end_headers()
+            self.wfile.write(upstream.content)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _latency_profile(call, count, threads):
+    latencies = []
+
+    def timed(_):
+        started = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - started)
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(timed, range(count)))
+    latencies.sort()
+    return {"p50_ms": latencies[len(latencies) // 2] * 1000,
+            "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000}
+
+
+def compare_tail_latency(instances=3, reads=2_000, slow_delay=0.2, slow_fraction=0.3, threads=16):
+    """p50/p99 of credential reads: one slowed endpoint alone vs routed across the cluster
+
+    Starts ``instances`` snapshot chains and puts the first one behind a
+    proxy that holds ``slow_fraction`` of requests for ``slow_delay`` seconds.
+    """
+    from chain_cluster import chain_cluster
+    from sbt_contract import get_sbt_contract
+    from provider_factory import get_web3
+
+    with chain_cluster(instances) as cluster:
+        proxy, slow_url = start_slow_proxy(cluster[0]["rpc_url"], slow_delay, slow_fraction=slow_fraction)
+        try:
+            urls = [(slow_url, "slowed")] + [(c["rpc_url"], f"ganache-{i}") for i, c in enumerate(cluster[1:], 1)]
+            contract_address = cluster[0]["info"]["contract"]
+            volunteer = cluster[0]["info"]["ngos"][0]["address"]
+
+            direct = get_sbt_contract(get_web3(slow_url), contract_address)
+            single = _latency_profile(lambda: direct.functions.verifyVolunteerCredential(volunteer).call(),
+                                      reads, threads)
+
+            router = ReadRouter(urls)
+            routed_contract = get_sbt_contract(get_routed_web3(router), contract_address)
+            routed = _latency_profile(lambda: routed_contract.functions.verifyVolunteerCredential(volunteer).call(),
+                                      reads, threads)
+            report = {"single": single, "routed": routed, "router": router.stats()}
+            router.close()
+            return report
+        finally:
+            proxy.shutdown()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Tail latency of hedged routed reads vs one slowed endpoint")
+    parser.add_argument("--instances", type=int, default=3)
+    parser.add_argument("--reads", type=int, default=2_000)
+    parser.add_argument("--slow-delay", type=float, default=0.2)
+    parser.add_argument("--slow-fraction", type=float, default=0.3)
+    args = parser.parse_args()
+
+    print("🔀 Hedged Read Router")
+    print("=" * 40)
+    report = compare_tail_latency(args.instances, args.reads, args.slow_delay, args.slow_fraction)
+    print(f"   🐢 Slowed endpoint alone: p50 {report['single']['p50_ms']:.1f} ms, "
+          f"p99 {report['single']['p99_ms']:.1f} ms")
+    print(f"   🚀 Routed + hedged:       p50 {report['routed']['p50_ms']:.1f} ms, "
+          f"p99 {report['routed']['p99_ms']:.1f} ms")
+    print(f"   🪁 Hedges: {report['router']['hedges_sent']:,} sent, {report['router']['hedges_won']:,} won")
+    for endpoint in report["router"]["endpoints"]:
+        print(f"      • {endpoint['name']}: {endpoint['requests']:,} requests, {endpoint['state']}, "
+              f"p50 {endpoint['p50_ms'] or 0:.1f} ms, p99 {endpoint['p99_ms'] or 0:.1f} ms")
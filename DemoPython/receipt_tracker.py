@@ -0,0 +1,436 @@
+"""
+Block-Driven Receipt Tracker
+Confirms many in-flight transactions with a fixed number of RPC round trips per poll
+
+Waiting on each receipt costs one HTTP request per pending transaction per
+poll. Each ReceiptTracker poll instead sends eth_blockNumber plus at most
+three JSON-RPC batches, however many transactions are pending:
+
+- the lookup batch: every block mined since the last poll with its
+  transactions, or the receipt of every pending hash when that is the
+  shorter list (automine chains make one block per transaction), together
+  with the mined nonce of each sender. It also checks hashes tracked since
+  the last poll, in case they were mined before tracking began.
+- the receipts of the hashes matched in those blocks.
+- the canonical hashes of the blocks holding transactions about to be
+  confirmed. A receipt whose block was reorganised away goes back to
+  pending.
+
+A block holding another transaction with the same sender and nonce, or a
+sender nonce that moved past a transaction without a receipt, marks it
+replaced. A hash the node no longer knows after
+``drop_after_blocks`` blocks marks it dropped. Futures are resolved only
+after the tracker's lock is released, so done-callbacks may call back into
+the tracker.
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+
+import telemetry
+from provider_factory import rpc_batch
+
+DEFAULT_CONFIRMATIONS = 1
+DEFAULT_POLL_INTERVAL = 0.5
+DROP_AFTER_BLOCKS = 50
+MAX_BLOCKS_PER_POLL = 256
+RECEIPT_QUANTITIES = ("blockNumber", "status", "gasUsed", "cumulativeGasUsed", "effectiveGasPrice",
+                      "transactionIndex", "type")
+
+
+class TransactionDropped(RuntimeError):
+    """The node forgot a tracked transaction without mining it"""
+
+    def __init__(self, tx_hash, message=None):
+        super().__init__(message or f"transaction {tx_hash} was dropped")
+        self.tx_hash = tx_hash
+
+
+class TransactionReplaced(TransactionDropped):
+    """Another transaction with the same sender and nonce was mined instead"""
+
+    def __init__(self, tx_hash, replacement=None):
+        super().__init__(tx_hash, f"transaction {tx_hash} was replaced by "
+                                  f"{replacement or 'another transaction with its nonce'}")
+        self.replacement = replacement
+
+
+def _hex(value):
+    return value.lower() if isinstance(value, str) else "0x" + bytes(value).hex()
+
+
+def _receipt(raw):
+    """JSON-RPC receipt with its quantities decoded to ints"""
+    receipt = dict(raw)
+    for field in RECEIPT_QUANTITIES:
+        if isinstance(receipt.get(field), str):
+            receipt[field] = int(receipt[field], 16)
+    return receipt
+
+
+class _Pending:
+    __slots__ = ("tx_hash", "sender", "nonce", "future", "since_block", "fresh", "receipt")
+
+    def __init__(self, tx_hash, sender, nonce, future):
+        self.tx_hash = tx_hash
+        self.sender = sender
+        self.nonce = nonce
+        self.future = future
+        self.since_block = None
+        self.fresh = True  # not yet checked for a receipt from before tracking began
+        self.receipt = None
+
+
+class ReceiptTracker:
+    """Resolve futures for many pending transactions from one stream of new blocks
+
+    Drive it with poll() or wait(), or start() a background poller. Futures
+    resolve to the receipt (check ``status`` for reverts) or raise
+    TransactionDropped / TransactionReplaced.
+    """
+
+    def __init__(self, web3, confirmations=DEFAULT_CONFIRMATIONS, poll_interval=DEFAULT_POLL_INTERVAL,
+                 drop_after_blocks=DROP_AFTER_BLOCKS, rpc_url=None):
+        self.rpc_url = rpc_url or getattr(web3.provider, "endpoint_uri", None)
+        if not self.rpc_url:
+            raise ValueError("ReceiptTracker needs an HTTP JSON-RPC endpoint (pass rpc_url)")
+        self.web3 = web3
+        self.confirmations = max(1, confirmations)
+        self.poll_interval = poll_interval
+        self.drop_after_blocks = drop_after_blocks
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+        self._pending = {}  # tx hash (hex) -> _Pending, not yet seen in a block
+        self._by_sender = {}  # (sender lowercase, nonce) -> tx hash (hex)
+        self._mined = {}  # tx hash (hex) -> _Pending, waiting for confirmations
+        self._settled = []  # (future, receipt, error) to resolve once the lock is released
+        self._next_block = None
+        self._thread = None
+        self._stop = threading.Event()
+        self.metrics = {"polls": 0, "round_trips": 0, "rpc_calls": 0, "blocks_scanned": 0, "confirmed": 0,
+                        "reverted": 0, "dropped": 0, "replaced": 0, "reorgs": 0}
+
+    # ========== TRACKING ==========
+
+    def track(self, tx_hash, sender=None, nonce=None, callback=None):
+        """Future for ``tx_hash``; pass sender and nonce to detect replacements
+
+        ``callback(future)`` runs once the outcome is known.
+        """
+        key = _hex(tx_hash)
+        future = Future()
+        if callback is not None:
+            future.add_done_callback(callback)
+        with self._lock:
+            existing = self._pending.get(key) or self._mined.get(key)
+            if existing is not None:
+                return existing.future
+            self._pending[key] = _Pending(key, sender.lower() if sender else None, nonce, future)
+            if sender is not None and nonce is not None:
+                self._by_sender[(sender.lower(), nonce)] = key
+        return future
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending) + len(self._mined)
+
+    def _batch(self, calls):
+        """Replies for [(method, params)] in one HTTP request"""
+        if not calls:
+            return []
+        self.metrics["round_trips"] += 1
+        self.metrics["rpc_calls"] += len(calls)
+        return rpc_batch(self.rpc_url, calls)
+
+    def _forget(self, item):
+        self._pending.pop(item.tx_hash, None)
+        self._mined.pop(item.tx_hash, None)
+        if item.sender is not None:
+            self._by_sender.pop((item.sender, item.nonce), None)
+
+    def _settle(self, item, receipt=None, error=None):
+        """Retire ``item`` (lock held); its future is resolved later by _resolve_settled"""
+        self._forget(item)
+        if error is not None:
+            outcome = "replaced" if isinstance(error, TransactionReplaced) else "dropped"
+        else:
+            outcome = "confirmed" if receipt["status"] == 1 else "reverted"
+        self.metrics[outcome] += 1
+        telemetry.count("receipts_tracked_total", outcome=outcome)
+        self._settled.append((item.future, receipt, error))
+
+    def _resolve_settled(self):
+        with self._lock:
+            settled, self._settled = self._settled, []
+        for future, receipt, error in settled:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(receipt)
+
+    def _mark_mined(self, item, receipt):
+        """Move a pending item to the mined set (lock held)"""
+        if self._pending.pop(item.tx_hash, None) is not None:
+            item.receipt = receipt
+            self._mined[item.tx_hash] = item
+
+    # ========== POLLING ==========
+
+    def _lookup(self, head):
+        """The lookup batch: new blocks or pending receipts, plus fresh hashes; returns matched items"""
+        with self._lock:
+            pending = list(self._pending.values())
+        fresh = [item for item in pending if item.fresh]
+        blocks = list(range(self._next_block, min(head, self._next_block + MAX_BLOCKS_PER_POLL - 1) + 1))
+        by_receipt = len(pending) <= len(blocks)
+        checked = pending if by_receipt else fresh
+        # Nonces go first: a nonce used before the receipt lookup with no receipt means replaced
+        senders = sorted({item.sender for item in checked if item.nonce is not None}) if by_receipt else []
+        calls = [("eth_getTransactionCount", [sender, "latest"]) for sender in senders]
+        calls += [("eth_getTransactionReceipt", [item.tx_hash]) for item in checked]
+        if not by_receipt:
+            calls += [("eth_getBlockByNumber", [hex(n), True]) for n in blocks]
+        replies = self._batch(calls)
+        mined_nonces = {sender: int(reply["result"], 16)
+                        for sender, reply in zip(senders, replies) if reply.get("result")}
+        replies = replies[len(senders):]
+
+        matched = []
+        with self._lock:
+            for item, reply in zip(checked, replies):
+                item.fresh = False
+                if item.since_block is None:
+                    item.since_block = head
+                result = reply.get("result")
+                if result and result.get("blockNumber"):
+                    self._mark_mined(item, _receipt(result))
+                elif item.nonce is not None and mined_nonces.get(item.sender, 0) > item.nonce:
+                    self._settle(item, error=TransactionReplaced(item.tx_hash))
+            if by_receipt:
+                self._next_block = head + 1
+                return []
+            for reply in replies[len(checked):]:
+                block = reply.get("result")
+                if block is None:
+                    break  # the head moved back (reorg); scan again next poll
+                for tx in block["transactions"]:
+                    key = _hex(tx["hash"])
+                    item = self._pending.get(key)
+                    if item is not None:
+                        matched.append(item)
+                    elif self._by_sender:
+                        other = self._by_sender.get((tx["from"].lower(), int(tx["nonce"], 16)))
+                        if other is not None and other in self._pending:
+                            self._settle(self._pending[other], error=TransactionReplaced(other, key))
+                self._next_block = int(block["number"], 16) + 1
+                self.metrics["blocks_scanned"] += 1
+        return matched
+
+    def _check_stale(self, head):
+        """Ask the node about hashes unseen for drop_after_blocks blocks, in one batch"""
+        with self._lock:
+            stale = [item for item in self._pending.values()
+                     if item.since_block is not None and head - item.since_block >= self.drop_after_blocks]
+        senders = sorted({item.sender for item in stale if item.sender is not None})
+        replies = self._batch([("eth_getTransactionByHash", [item.tx_hash]) for item in stale]
+                              + [("eth_getTransactionCount", [sender, "latest"]) for sender in senders])
+        mined_nonces = {sender: int(reply["result"], 16)
+                        for sender, reply in zip(senders, replies[len(stale):]) if reply.get("result")}
+        with self._lock:
+            for item, reply in zip(stale, replies):
+                if item.tx_hash not in self._pending:
+                    continue
+                tx = reply.get("result")
+                if tx is None:
+                    # Gone; if its nonce was used anyway, something else took it
+                    replaced = item.sender is not None and mined_nonces.get(item.sender, 0) > item.nonce
+                    self._settle(item, error=TransactionReplaced(item.tx_hash) if replaced
+                                 else TransactionDropped(item.tx_hash))
+                    continue
+                if item.sender is None:
+                    item.sender, item.nonce = tx["from"].lower(), int(tx["nonce"], 16)
+                    self._by_sender[(item.sender, item.nonce)] = item.tx_hash
+                item.since_block = head
+                item.fresh = tx.get("blockNumber") is not None  # mined: pick up its receipt next poll
+
+    def _confirm(self, head):
+        """Settle mined items deep enough, after checking their blocks are still canonical"""
+        with self._lock:
+            due = [item for item in self._mined.values()
+                   if head - item.receipt["blockNumber"] + 1 >= self.confirmations]
+        numbers = sorted({item.receipt["blockNumber"] for item in due})
+        replies = self._batch([("eth_getBlockByNumber", [hex(n), False]) for n in numbers])
+        canonical = {n: (reply.get("result") or {}).get("hash") for n, reply in zip(numbers, replies)}
+        with self._lock:
+            for item in due:
+                if item.tx_hash not in self._mined:
+                    continue
+                number = item.receipt["blockNumber"]
+                if canonical.get(number) and _hex(canonical[number]) == _hex(item.receipt["blockHash"]):
+                    self._settle(item, receipt=item.receipt)
+                    continue
+                # Reorganised away: look for it again from that height
+                self.metrics["reorgs"] += 1
+                telemetry.count("retries_total", reason="receipt_reorg")
+                del self._mined[item.tx_hash]
+                item.receipt, item.fresh = None, True
+                self._pending[item.tx_hash] = item
+                self._next_block = min(self._next_block, number)
+
+    def poll(self):
+        """Advance every tracked transaction; returns how many blocks were scanned"""
+        with self._poll_lock:
+            if not self.pending_count():
+                return 0
+            self.metrics["polls"] += 1
+            head = int(self._batch([("eth_blockNumber", [])])[0]["result"], 16)
+            if self._next_block is None:
+                # A transaction may already sit in the head block, so scan it too
+                self._next_block = head
+            scanned = self.metrics["blocks_scanned"]
+            matched = self._lookup(head)
+            if matched:
+                replies = self._batch([("eth_getTransactionReceipt", [item.tx_hash]) for item in matched])
+                with self._lock:
+                    for item, reply in zip(matched, replies):
+                        if reply.get("result"):
+                            self._mark_mined(item, _receipt(reply["result"]))
+                        else:
+                            item.fresh = True  # seen in a block that is already gone
+            self._check_stale(head)
+            self._confirm(head)
+            with self._lock:
+                if not self._pending and not self._mined:
+                    # Nothing to follow: restart from the head on the next track()
+                    self._next_block = None
+        self._resolve_settled()
+        return self.metrics["blocks_scanned"] - scanned
+
+    # ========== DRIVING ==========
+
+    def wait(self, futures=None, timeout=None):
+        """Poll until ``futures`` (default: everything tracked) are done; returns the done set"""
+        if futures is None:
+            with self._lock:
+                futures = [item.future for item in list(self._pending.values()) + list(self._mined.values())]
+        futures = list(futures)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not all(f.done() for f in futures):
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            if self._thread is None and self.poll():
+                continue
+            time.sleep(self.poll_interval)
+        return {f for f in futures if f.done()}
+
+    def start(self):
+        """Poll in a background thread until stop()"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="receipt-tracker", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                scanned = self.poll()
+            except Exception:
+                telemetry.count("retries_total", reason="receipt_poll_error")
+                scanned = 0
+            if not scanned:
+                self._stop.wait(self.poll_interval)
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def wait_for_receipts(web3, tx_hashes, confirmations=DEFAULT_CONFIRMATIONS, timeout=120):
+    """Receipts for ``tx_hashes`` in order (None for dropped/replaced or timed out)"""
+    with ReceiptTracker(web3, confirmations) as tracker:
+        futures = [tracker.track(tx_hash) for tx_hash in tx_hashes]
+        tracker.wait(futures, timeout=timeout)
+    return [f.result() if f.done() and not f.exception() else None for f in futures]
+
+
+# ========== BENCHMARK ==========
+
+def compare_polling(web3, account, count=500, confirmations=1):
+    """RPC calls to confirm ``count`` self-transfers: one receipt poll per hash vs the block tracker"""
+    from publishing_engine import NonceManager
+    from tx_signer import raw_transaction
+
+    nonces = NonceManager(account.address)
+    chain_id = web3.eth.chain_id
+    gas_price = web3.eth.gas_price
+
+    def send_batch():
+        hashes = []
+        for _ in range(count):
+            nonce = nonces.next_nonce(lambda: web3.eth.get_transaction_count(account.address, "pending"))
+            tx = {"to": account.address, "value": 0, "gas": 21_000, "gasPrice": gas_price, "nonce": nonce,
+                  "chainId": chain_id}
+            hashes.append((web3.eth.send_raw_transaction(raw_transaction(account.sign_transaction(tx))), nonce))
+        return hashes
+
+    hashes = send_batch()
+    started, per_hash_calls, pending = time.perf_counter(), 0, [h for h, _ in hashes]
+    while pending:
+        still = []
+        for tx_hash in pending:
+            per_hash_calls += 1
+            try:
+                web3.eth.get_transaction_receipt(tx_hash)
+            except Exception:
+                still.append(tx_hash)
+        pending = still
+        if pending:
+            time.sleep(DEFAULT_POLL_INTERVAL)
+    per_hash_seconds = time.perf_counter() - started
+
+    with ReceiptTracker(web3, confirmations) as tracker:
+        started = time.perf_counter()
+        futures = [tracker.track(tx_hash, account.address, nonce) for tx_hash, nonce in send_batch()]
+        tracker.wait(futures)
+        tracked_seconds = time.perf_counter() - started
+    return {
+        "transactions": count,
+        "per_hash_rpc_calls": per_hash_calls,
+        "per_hash_seconds": per_hash_seconds,
+        "tracker_rpc_calls": tracker.metrics["rpc_calls"],
+        "tracker_seconds": tracked_seconds,
+        "blocks_scanned": tracker.metrics["blocks_scanned"],
+        "confirmed": tracker.metrics["confirmed"]
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from provider_factory import get_web3
+    from sbt_contract import ganache_account
+
+    parser = argparse.ArgumentParser(description="Confirm bulk transactions from new blocks instead of per hash")
+    parser.add_argument("--rpc-url", default="http://localhost:8545")
+    parser.add_argument("--transactions", type=int, default=500)
+    parser.add_argument("--confirmations", type=int, default=DEFAULT_CONFIRMATIONS)
+    args = parser.parse_args()
+
+    print("🧾 Block-Driven Receipt Tracker")
+    print("=" * 40)
+    report = compare_polling(get_web3(args.rpc_url), ganache_account(2), args.transactions, args.confirmations)
+    print(f"   🐢 Per-hash polling: {report['per_hash_rpc_calls']:,} RPC calls "
+          f"({report['per_hash_seconds']:.2f}s)")
+    print(f"   🚀 Block tracker:    {report['tracker_rpc_calls']:,} RPC calls "
+          f"({report['tracker_seconds']:.2f}s, {report['blocks_scanned']:,} blocks, "
+          f"{report['confirmed']:,} confirmed)")
@@ -0,0 +1,413 @@
+"""
+Volunteer Registry Snapshot
+Sorted fixed-width binary copy of badgeOf/badges for verifiers that start warm
+
+The exporter folds the indexed events into one 72-byte record per volunteer
+(address, tokenId, totalHours, lastUpdate, issuingNGO, activitiesCount,
+isActive). It sorts them by address through 256 on-disk buckets and writes
+them after a header recording the block they reflect. A 65,536-entry fan-out
+table on the first two address bytes narrows each lookup to a handful of
+records.
+
+RegistrySnapshot mmaps the file, so opening it costs the same for ten
+records or ten million. Lookups binary-search the mapped bytes and unpack
+only the record they hit. attach(indexer) then applies the events after the
+snapshot block as an in-memory overlay and follows new ones. A reorg below
+the snapshot block marks it ``stale``: its records may hold events that are
+no longer canonical, so readers must stop answering from it until a fresh
+export replaces it.
+"""
+
+import mmap
+import os
+import shutil
+import struct
+import threading
+import time
+from collections import Counter
+
+SNAPSHOT_MAGIC = b"VOLSNAP1"
+HEADER = struct.Struct("<8sQQ32s20s4x")  # magic, record count, block number, block hash, contract
+FANOUT_ENTRIES = 65536 + 1  # fanout[p]: records whose first two address bytes are below p
+FANOUT_OFFSET = HEADER.size
+RECORDS_OFFSET = -(-(FANOUT_OFFSET + FANOUT_ENTRIES * 4) // 4096) * 4096
+RECORD = struct.Struct("<20sQQQ20sIB3x")  # address, token id, hours, last update, issuing NGO, activities, active
+FANOUT_PAIR = struct.Struct("<II")
+BUCKETS = 256
+ZERO_ADDRESS = "0x" + "00" * 20
+
+
+def _address_bytes(address):
+    if isinstance(address, (bytes, bytearray)):
+        return bytes(address)
+    address = address[2:] if address.startswith(("0x", "0X")) else address
+    if len(address) != 40:
+        raise ValueError(f"Invalid address: {address}")
+    return bytes.fromhex(address)
+
+
+def _record_dict(fields):
+    address, token_id, hours, last_update, ngo, activities, active = fields
+    return {
+        "address": "0x" + address.hex(),
+        "tokenId": token_id,
+        "totalHours": hours,
+        "lastUpdate": last_update,
+        "issuingNGO": "0x" + ngo.hex(),
+        "activitiesCount": activities,
+        "isActive": bool(active)
+    }
+
+
+# ========== WRITER ==========
+
+def write_snapshot(records, path, block_number, block_hash=b"", contract=b""):
+    """Write (address, tokenId, totalHours, lastUpdate, issuingNGO, activitiesCount, isActive) tuples
+
+    Input order does not matter: records are spilled into buckets by first
+    address byte, and each bucket is sorted in memory, so memory is bounded
+    by the largest bucket rather than the registry. Returns the record count.
+    """
+    spill_dir = f"{path}.buckets"
+    os.makedirs(spill_dir, exist_ok=True)
+    buckets = [open(os.path.join(spill_dir, f"{b:02x}"), "wb") for b in range(BUCKETS)]
+    pack = RECORD.pack
+    try:
+        for address, token_id, hours, last_update, ngo, activities, active in records:
+            address = _address_bytes(address)
+            buckets[address[0]].write(pack(address, token_id, hours, last_update, _address_bytes(ngo),
+                                           activities, bool(active)))
+    finally:
+        for bucket in buckets:
+            bucket.close()
+
+    counts = [0] * FANOUT_ENTRIES
+    count = 0
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as out:
+        out.seek(RECORDS_OFFSET)
+        size = RECORD.size
+        for b in range(BUCKETS):
+            bucket_path = os.path.join(spill_dir, f"{b:02x}")
+            with open(bucket_path, "rb") as f:
+                data = f.read()
+            os.remove(bucket_path)
+            rows = sorted(data[i:i + size] for i in range(0, len(data), size))
+            for second, n in Counter(row[1] for row in rows).items():
+                counts[b * 256 + second + 1] = n
+            out.write(b"".join(rows))
+            count += len(rows)
+        for p in range(1, FANOUT_ENTRIES):
+            counts[p] += counts[p - 1]
+        out.seek(0)
+        out.write(HEADER.pack(SNAPSHOT_MAGIC, count, block_number, _hash_bytes(block_hash),
+                              _address_bytes(contract) if contract else bytes(20)))
+        out.write(struct.pack(f"<{FANOUT_ENTRIES}I", *counts))
+        # Seeking past the fanout writes nothing: an empty registry still needs the padded header
+        out.truncate(RECORDS_OFFSET + count * size)
+    shutil.rmtree(spill_dir, ignore_errors=True)
+    os.replace(temp_path, path)
+    return count
+
+
+def _hash_bytes(block_hash):
+    if isinstance(block_hash, str):
+        block_hash = bytes.fromhex(block_hash[2:] if block_hash.startswith("0x") else block_hash)
+    return bytes(block_hash).rjust(32, b"\x00")
+
+
+# ========== EVENT FOLDING ==========
+
+def _apply_event(state, row, timestamp, lookup=None):
+    """Fold one indexer row into {address bytes: [tokenId, hours, lastUpdate, ngo, activities, active] or None}"""
+    event = row["event"]
+    if event not in ("BadgeIssued", "BadgeBurned", "BadgeUpdated"):
+        return
+    volunteer = _address_bytes(row["volunteer"])
+    current = state[volunteer] if volunteer in state else (lookup(volunteer) if lookup else None)
+    if event == "BadgeIssued":
+        if current is None or not current[5]:
+            state[volunteer] = [row["token_id"], row["hours"], timestamp or 0, _address_bytes(row["ngo"]), 1, True]
+        else:
+            current = list(current)
+            current[1] += row["hours"]
+            current[2] = timestamp or current[2]
+            current[4] += 1
+            state[volunteer] = current
+    elif event == "BadgeBurned":
+        state[volunteer] = None  # burn deletes badgeOf and badges on-chain
+    elif current is not None:
+        current = list(current)
+        current[1] = row["hours"]  # BadgeUpdated carries the new total
+        state[volunteer] = current
+
+
+def _indexed_rows(indexer, after_block=None):
+    """(row, timestamp) for indexed events, oldest first"""
+    sql = "SELECT e.*, b.timestamp FROM events e LEFT JOIN blocks b USING (block_number)"
+    params = ()
+    if after_block is not None:
+        sql += " WHERE e.block_number > ?"
+        params = (after_block,)
+    cursor = indexer.db.execute(sql + " ORDER BY e.block_number, e.log_index", params)
+    columns = [c[0] for c in cursor.description]
+    while True:
+        batch = cursor.fetchmany(10_000)
+        if not batch:
+            break
+        for values in batch:
+            row = dict(zip(columns, values))
+            yield row, row["timestamp"]
+
+
+def export_from_indexer(indexer, path):
+    """Snapshot the registry as of the indexer's checkpoint; returns the block number"""
+    checkpoint = indexer.checkpoint()
+    if checkpoint is None:
+        raise ValueError("the indexer has not synced anything yet - run sync() first")
+    block_number, block_hash = checkpoint
+    state = {}
+    for row, timestamp in _indexed_rows(indexer):
+        if row["block_number"] <= block_number:
+            _apply_event(state, row, timestamp)
+    write_snapshot(((address, *fields) for address, fields in state.items() if fields is not None),
+                   path, block_number, block_hash, indexer.address)
+    return block_number
+
+
+# ========== READER ==========
+
+class RegistrySnapshot:
+    """Memory-mapped registry snapshot plus an overlay of newer events"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, self.snapshot_block, block_hash, contract = HEADER.unpack_from(self._map, 0)
+        if magic != SNAPSHOT_MAGIC or len(self._map) < RECORDS_OFFSET + self.count * RECORD.size:
+            self.close()
+            raise ValueError(f"{path} is not a complete volunteer registry snapshot")
+        self.block_hash = "0x" + block_hash.hex()
+        self.contract = "0x" + contract.hex()
+        self.block_number = self.snapshot_block
+        self.stale = False
+        self._lock = threading.Lock()
+        self._overlay = {}
+        self._indexer = None
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def _find(self, key):
+        """Snapshot fields for a 20-byte address, or None"""
+        lo, hi = FANOUT_PAIR.unpack_from(self._map, FANOUT_OFFSET + ((key[0] << 8 | key[1]) << 2))
+        data, size = self._map, RECORD.size
+        while lo < hi:
+            mid = (lo + hi) >> 1
+            offset = RECORDS_OFFSET + mid * size
+            probe = data[offset:offset + 20]
+            if probe < key:
+                lo = mid + 1
+            elif probe > key:
+                hi = mid
+            else:
+                return RECORD.unpack_from(data, offset)
+        return None
+
+    def _current(self, key):
+        """[tokenId, hours, lastUpdate, ngo, activities, active] including caught-up events"""
+        if key in self._overlay:
+            return self._overlay[key]
+        fields = self._find(key)
+        return None if fields is None else list(fields[1:])
+
+    def lookup(self, address):
+        """badgeOf + badges for a volunteer as a dict, or None when they hold no badge"""
+        key = _address_bytes(address)
+        fields = self._current(key)
+        return None if fields is None else _record_dict((key, *fields))
+
+    def has_badge(self, address):
+        """hasVolunteerBadge(address)"""
+        return self._current(_address_bytes(address)) is not None
+
+    def verify(self, address):
+        """verifyVolunteerCredential(address), shaped like credential_verifier results"""
+        fields = self._current(_address_bytes(address))
+        if fields is None:
+            return {"isValid": False, "totalHours": 0, "lastActivity": 0, "issuingNGO": ZERO_ADDRESS}
+        return {"isValid": bool(fields[5]), "totalHours": fields[1], "lastActivity": fields[2],
+                "issuingNGO": "0x" + fields[3].hex()}
+
+    def records(self):
+        """Every snapshot record (without the overlay), in address order"""
+        for i in range(self.count):
+            yield _record_dict(RECORD.unpack_from(self._map, RECORDS_OFFSET + i * RECORD.size))
+
+    # ========== CATCH-UP ==========
+
+    def attach(self, indexer):
+        """Apply the indexer's events after the snapshot block and follow its future batches"""
+        self._indexer = indexer
+        self._replay()
+        indexer.listeners.append(self)
+        return self
+
+    def _replay(self):
+        with self._lock:
+            self._overlay = {}
+            for row, timestamp in _indexed_rows(self._indexer, self.snapshot_block):
+                _apply_event(self._overlay, row, timestamp, self._current)
+                self.block_number = max(self.block_number, row["block_number"])
+        checkpoint = self._indexer.checkpoint()
+        if checkpoint is not None:
+            self.block_number = max(self.snapshot_block, checkpoint[0])
+
+    def on_events(self, rows, timestamps):
+        with self._lock:
+            if self.stale:
+                return
+            for row in rows:
+                if row["block_number"] > self.snapshot_block:
+                    _apply_event(self._overlay, row, timestamps.get(row["block_number"]), self._current)
+            if timestamps:
+                self.block_number = max(self.block_number, max(timestamps))
+
+    def on_rollback(self, block_number):
+        """Rebuild the overlay; a reorg below the snapshot block marks the snapshot stale"""
+        if block_number < self.snapshot_block:
+            # Raising here would abort the indexer's rollback for every other listener
+            with self._lock:
+                self.stale = True
+                self._overlay = {}
+            return
+        self.block_number = block_number
+        self._replay()
+
+    def spot_check(self, contract, sample=100):
+        """Compare up to ``sample`` snapshot records with badgeOf/badges at the snapshot block"""
+        mismatches = []
+        step = max(1, self.count // max(1, sample))
+        for i in range(0, self.count, step):
+            address, token_id, hours, last_update, ngo, activities, active = RECORD.unpack_from(
+                self._map, RECORDS_OFFSET + i * RECORD.size
+            )
+            volunteer = contract.w3.to_checksum_address(address)
+            chain_token = contract.functions.badgeOf(volunteer).call(block_identifier=self.snapshot_block)
+            chain = contract.functions.badges(chain_token).call(block_identifier=self.snapshot_block)
+            local = (token_id, hours, last_update, ngo.hex(), activities, bool(active))
+            remote = (chain_token, chain[0], chain[1], chain[2].lower()[2:], chain[3], chain[4])
+            if local != remote:
+                mismatches.append({"address": volunteer, "local": local, "chain": remote})
+        return mismatches
+
+
+# ========== BENCHMARK ==========
+
+def synthetic_records(count):
+    """Registry tuples for ``count`` pseudo-random volunteer addresses"""
+    import hashlib
+
+    ngos = [hashlib.blake2b(f"ngo-{n}".encode(), digest_size=20).digest() for n in range(16)]
+    for i in range(count):
+        yield (hashlib.blake2b(i.to_bytes(8, "little"), digest_size=20).digest(), i + 1, 1 + i % 400,
+               1_700_000_000 + i, ngos[i % 16], 1 + i % 7, True)
+
+
+def benchmark(count=10_000_000, path="registry_bench.snap", lookups=100_000):
+    """Export, startup and lookup latency for a synthetic registry of ``count`` volunteers"""
+    import hashlib
+    import random
+
+    started = time.perf_counter()
+    write_snapshot(synthetic_records(count), path, block_number=1)
+    export_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    snapshot = RegistrySnapshot(path)
+    startup_ms = (time.perf_counter() - started) * 1000
+
+    indices = [random.randrange(count) for _ in range(lookups)]
+    addresses = [hashlib.blake2b(i.to_bytes(8, "little"), digest_size=20).digest() for i in indices]
+    latencies = []
+    for address in addresses:
+        t = time.perf_counter()
+        snapshot.verify(address)
+        latencies.append(time.perf_counter() - t)
+    misses = sum(not snapshot.has_badge(os.urandom(20)) for _ in range(1000))
+    latencies.sort()
+    report = {
+        "records": count,
+        "file_mb": os.path.getsize(path) / 1e6,
+        "export_seconds": export_seconds,
+        "startup_ms": startup_ms,
+        "lookup_mean_us": sum(latencies) / len(latencies) * 1e6,
+        "lookup_p99_us": latencies[int(len(latencies) * 0.99)] * 1e6,
+        "all_found": all(snapshot.has_badge(a) for a in addresses[:1000]),
+        "random_misses": misses
+    }
+    snapshot.close()
+    os.remove(path)
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Memory-mapped volunteer registry snapshots")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="snapshot the registry from the event index")
+    export.add_argument("--rpc-url", default="http://localhost:8545")
+    export.add_argument("--contract", help="VolunteerBadgeSBT address (default: ignition deployment)")
+    export.add_argument("--db", help="badge indexer database (default: badge_indexer's)")
+    export.add_argument("--out", default="volunteer_registry.snap")
+    export.add_argument("--check", type=int, default=0, metavar="N", help="spot-check N records on-chain")
+    lookup = commands.add_parser("lookup", help="look up volunteers in a snapshot")
+    lookup.add_argument("snapshot")
+    lookup.add_argument("addresses", nargs="+")
+    bench = commands.add_parser("bench", help="time export, startup and lookups on synthetic data")
+    bench.add_argument("--records", type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    print("🗂️  Volunteer Registry Snapshot")
+    print("=" * 40)
+    if args.command == "export":
+        from badge_indexer import DEFAULT_DB_PATH, BadgeIndexer
+        from provider_factory import get_web3
+        from sbt_contract import get_sbt_contract
+
+        web3 = get_web3(args.rpc_url)
+        contract = get_sbt_contract(web3, args.contract)
+        indexer = BadgeIndexer(web3, contract, db_path=args.db or DEFAULT_DB_PATH)
+        indexer.sync()
+        block = export_from_indexer(indexer, args.out)
+        indexer.close()
+        with RegistrySnapshot(args.out) as snapshot:
+            print(f"   ✅ {len(snapshot):,} volunteers at block {block} → {args.out}")
+            if args.check:
+                mismatches = snapshot.spot_check(contract, args.check)
+                print(f"   🔍 Spot check: {len(mismatches)} mismatches in {args.check} records")
+    elif args.command == "lookup":
+        with RegistrySnapshot(args.snapshot) as snapshot:
+            print(f"   ⛓️  Snapshot block {snapshot.block_number}, {len(snapshot):,} volunteers")
+            for address in args.addresses:
+                record = snapshot.lookup(address)
+                print(f"   {'✅' if record else '❌'} {address}: {record or 'no badge'}")
+    else:
+        report = benchmark(args.records)
+        print(f"   🏗️  {report['records']:,} records ({report['file_mb']:,.0f} MB) "
+              f"exported in {report['export_seconds']:.1f}s")
+        print(f"   ⚡ Startup: {report['startup_ms']:.3f} ms")
+        print(f"   🔎 Lookup: {report['lookup_mean_us']:.1f} µs mean, {report['lookup_p99_us']:.1f} µs p99 "
+              f"(all found: {report['all_found']}, random misses: {report['random_misses']}/1000)")
@@ -0,0 +1,152 @@
+"""
+RPC Endpoint Selector
+Races candidate RPC endpoints in parallel and caches the fastest healthy one
+"""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from provider_factory import rpc_call
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".rpc_endpoint_cache.json")
+CACHE_TTL_SECONDS = 15 * 60
+PROBE_TIMEOUT_SECONDS = 5
+MAX_BLOCK_LAG = 5
+
+# Ocean-enabled networks in order of preference: (url, display name, chain id)
+OCEAN_NETWORK_CANDIDATES = [
+    ("https://polygon-mumbai.g.alchemy.com/v2/demo", "Mumbai Testnet", 80001),
+    ("https://rpc.ankr.com/polygon_mumbai", "Mumbai Testnet (Ankr)", 80001),
+    ("https://rpc-mumbai.maticvigil.com", "Mumbai Testnet (MaticVigil)", 80001),
+    ("https://polygon-rpc.com", "Polygon Mainnet", 137)
+]
+
+# Ports scanned by start_ganache.find_available_port
+LOCAL_GANACHE_CANDIDATES = [
+    (f"http://localhost:{port}", f"Ganache (port {port})", None)
+    for port in range(8545, 8555)
+]
+
+
+def _normalize(candidate):
+    """Accept (url, name) or (url, name, chain_id) candidates"""
+    url, name = candidate[0], candidate[1]
+    chain_id = candidate[2] if len(candidate) > 2 else None
+    return url, name, chain_id
+
+
+def probe_endpoint(candidate, timeout=PROBE_TIMEOUT_SECONDS):
+    """Measure an endpoint's latency and check its chain id and block height"""
+    url, name, expected_chain_id = _normalize(candidate)
+    probe = {"url": url, "name": name, "ok": False}
+    started = time.perf_counter()
+    try:
+        chain_id = int(rpc_call(url, "eth_chainId", [], timeout), 16)
+        block_number = int(rpc_call(url, "eth_blockNumber", [], timeout), 16)
+    except Exception as e:
+        probe["error"] = str(e)[:120]
+        return probe
+
+    probe["latency"] = (time.perf_counter() - started) / 2
+    probe["chain_id"] = chain_id
+    probe["block_number"] = block_number
+    if expected_chain_id is not None and chain_id != expected_chain_id:
+        probe["error"] = f"chain id {chain_id} != expected {expected_chain_id}"
+        return probe
+    probe["ok"] = True
+    return probe
+
+
+def rank_endpoints(candidates, timeout=PROBE_TIMEOUT_SECONDS, max_block_lag=MAX_BLOCK_LAG):
+    """Probe all candidates at once and rank the healthy ones
+
+    Endpoints are grouped by chain in the order the chains first appear in
+    ``candidates`` (so preference between networks is kept) and ranked by
+    measured latency inside each group. Endpoints trailing the highest
+    block seen on their chain by more than ``max_block_lag`` are dropped.
+    """
+    candidates = [_normalize(c) for c in candidates]
+    if not candidates:
+        return []
+
+    with ThreadPoolExecutor(max_workers=len(candidates)) as pool:
+        probes = list(pool.map(lambda c: probe_endpoint(c, timeout), candidates))
+
+    preference = {}
+    for (_, _, expected_chain_id), probe in zip(candidates, probes):
+        group = expected_chain_id if expected_chain_id is not None else probe.get("chain_id")
+        preference.setdefault(group, len(preference))
+
+    healthy = [p for p in probes if p["ok"]]
+    best_block = {}
+    for probe in healthy:
+        best_block[probe["chain_id"]] = max(best_block.get(probe["chain_id"], 0), probe["block_number"])
+
+    ranked = [
+        p for p in healthy
+        if best_block[p["chain_id"]] - p["block_number"] <= max_block_lag
+    ]
+    ranked.sort(key=lambda p: (preference.get(p["chain_id"], len(preference)), p["latency"]))
+    return ranked
+
+
+def _cache_key(candidates):
+    """Identify a candidate set independently of its order"""
+    urls = sorted(f"{url}|{chain_id}" for url, _, chain_id in map(_normalize, candidates))
+    return hashlib.sha256("\n".join(urls).encode()).hexdigest()[:16]
+
+
+def _load_cache(cache_path):
+    try:
+        with open(cache_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache_path, cache):
+    tmp_path = f"{cache_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp_path, cache_path)
+
+
+def select_endpoints(candidates, cache_path=CACHE_PATH, ttl=CACHE_TTL_SECONDS, timeout=PROBE_TIMEOUT_SECONDS):
+    """Return healthy (url, name) pairs, fastest first, using the on-disk cache when fresh"""
+    key = _cache_key(candidates)
+    cache = _load_cache(cache_path) if cache_path else {}
+    entry = cache.get(key)
+    if entry and time.time() - entry["probed_at"] < ttl:
+        return [(p["url"], p["name"]) for p in entry["ranked"]]
+
+    ranked = rank_endpoints(candidates, timeout=timeout)
+    if cache_path and ranked:
+        cache[key] = {"probed_at": time.time(), "ranked": ranked}
+        _save_cache(cache_path, cache)
+    return [(p["url"], p["name"]) for p in ranked]
+
+
+def select_endpoint(candidates, **kwargs):
+    """Return the single best (url, name) pair, or None if nothing is reachable"""
+    ranked = select_endpoints(candidates, **kwargs)
+    return ranked[0] if ranked else None
+
+
+def forget_endpoints(candidates, cache_path=CACHE_PATH):
+    """Drop the cached ranking for a candidate set, e.g. after the winner failed"""
+    cache = _load_cache(cache_path)
+    if cache.pop(_cache_key(candidates), None) is not None:
+        _save_cache(cache_path, cache)
+
+
+if __name__ == "__main__":
+    print("🌐 RPC Endpoint Race")
+    print("=" * 40)
+    started = time.perf_counter()
+    for probe in rank_endpoints(OCEAN_NETWORK_CANDIDATES + LOCAL_GANACHE_CANDIDATES):
+        print(f"   ✅ {probe['name']}: {probe['latency'] * 1000:.1f} ms "
+              f"(chain {probe['chain_id']}, block {probe['block_number']})")
+    print(f"   ⏱️  Probed all candidates in {time.perf_counter() - started:.2f}s")
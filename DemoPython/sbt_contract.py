@@ -0,0 +1,108 @@
+"""
+VolunteerBadgeSBT Contract Helpers
+Loads the Hardhat build artifact and binds the contract for the Python tools
+"""
+
+import json
+import os
+
+import telemetry
+from tx_signer import raw_transaction
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARTIFACT_PATH = os.environ.get("SBT_ARTIFACT_PATH") or os.path.join(
+    REPO_ROOT, "artifacts", "contracts", "VolunteerBadgeSBT.sol", "VolunteerBadgeSBT.json"
+)
+IGNITION_DEPLOYMENTS = os.path.join(REPO_ROOT, "ignition", "deployments")
+IGNITION_CONTRACT_KEY = "VolunteerBadgeSBTModule#VolunteerBadgeSBT"
+
+COLLECTION_NAME = "Volunteer ID Romania"
+COLLECTION_SYMBOL = "VID"
+
+# Accounts of `ganache --deterministic`; index 0 is the publisher key used by the demos
+GANACHE_MNEMONIC = "myth like bonus scare over problem client lizard pioneer submit female collect"
+PUBLISHER_PRIVATE_KEY = "0x4f3edf983ac636a65a842ce7c78d9aa706d3b113bce9c46f30d7d21715b23b1d"
+
+EVENT_NAMES = ("BadgeIssued", "BadgeUpdated", "BadgeBurned", "NGORegistered", "NGOVerified")
+
+_artifacts = {}
+
+
+def load_artifact(path=ARTIFACT_PATH):
+    """Return the compiled contract artifact (run `npx hardhat compile` first)"""
+    artifact = _artifacts.get(path)
+    if artifact is None:
+        if not os.path.exists(path):
+            raise FileNotFoundError(
+                f"Contract artifact not found at {path} - run `npx hardhat compile` in {REPO_ROOT}"
+            )
+        with open(path) as f:
+            artifact = _artifacts[path] = json.load(f)
+    return artifact
+
+
+def ganache_account(index):
+    """Deterministic Ganache account ``index`` as an eth_account LocalAccount"""
+    from eth_account import Account
+
+    Account.enable_unaudited_hdwallet_features()
+    return Account.from_mnemonic(GANACHE_MNEMONIC, account_path=f"m/44'/60'/0'/0/{index}")
+
+
+def find_deployed_address(chain_id):
+    """Address recorded by `npx hardhat ignition deploy`, or SBT_CONTRACT_ADDRESS"""
+    address = os.environ.get("SBT_CONTRACT_ADDRESS")
+    if address:
+        return address
+    path = os.path.join(IGNITION_DEPLOYMENTS, f"chain-{chain_id}", "deployed_addresses.json")
+    try:
+        with open(path) as f:
+            return json.load(f).get(IGNITION_CONTRACT_KEY)
+    except (OSError, ValueError):
+        return None
+
+
+def get_sbt_contract(web3, address=None):
+    """Bind VolunteerBadgeSBT at ``address`` (or the recorded deployment)"""
+    address = address or find_deployed_address(web3.eth.chain_id)
+    if not address:
+        raise ValueError("VolunteerBadgeSBT address unknown - pass one or set SBT_CONTRACT_ADDRESS")
+    return web3.eth.contract(address=web3.to_checksum_address(address), abi=load_artifact()["abi"])
+
+
+def send_transaction(web3, account, function_call, nonce=None, gas=None, wait=True, fees=None):
+    """Build, sign locally and send a contract call; return the receipt (or hash if not waiting)
+
+    With a ``fees`` FeeOracle the gas limit and fee fields come from its
+    cache instead of fresh estimate/fee lookups.
+    """
+    tx = {
+        "from": account.address,
+        "nonce": web3.eth.get_transaction_count(account.address, "pending") if nonce is None else nonce,
+        "chainId": web3.eth.chain_id
+    }
+    if fees is not None:
+        tx.update(fees.fee_params())
+        if gas is None:
+            gas = fees.estimate_gas(function_call, {"from": account.address})
+    if gas is not None:
+        tx["gas"] = gas
+    tx = function_call.build_transaction(tx)
+    signed = account.sign_transaction(tx)
+    tx_hash = web3.eth.send_raw_transaction(raw_transaction(signed))
+    telemetry.count("tx_sent_total", source="sbt_contract")
+    return web3.eth.wait_for_transaction_receipt(tx_hash) if wait else tx_hash
+
+
+def deploy_sbt(web3, deployer, name=COLLECTION_NAME, symbol=COLLECTION_SYMBOL):
+    """Deploy VolunteerBadgeSBT from ``deployer`` and return the bound contract"""
+    artifact = load_artifact()
+    factory = web3.eth.contract(abi=artifact["abi"], bytecode=artifact["bytecode"])
+    receipt = send_transaction(web3, deployer, factory.constructor(name, symbol))
+    return web3.eth.contract(address=receipt.contractAddress, abi=artifact["abi"])
+
+
+def register_verified_ngo(web3, contract, admin, ngo_address, name):
+    """Register an NGO and mark it verified so it can issue badges"""
+    send_transaction(web3, admin, contract.functions.registerNGO(ngo_address, name))
+    send_transaction(web3, admin, contract.functions.verifyNGO(ngo_address, True))
@@ -2,10 +2,13 @@
 Simple Ocean Protocol Test - Basic Connection
 """
 
-from web3 import Web3
 from eth_account import Account
 import os
 
+from async_chain import check_connection, get_balance_eth
+from provider_factory import get_ocean, get_ocean_config
+from rpc_selector import LOCAL_GANACHE_CANDIDATES, forget_endpoints, select_endpoint
+
 def test_basic_setup():
     """Test basic blockchain and account setup"""
     print("🌊 Basic Ocean Protocol Setup Test")
@@ -14,15 +17,19 @@ def test_basic_setup():
     try:
         # 1. Test blockchain connection
         print("1. Testing blockchain connection...")
-        w3 = Web3(Web3.HTTPProvider('http://localhost:8545'))
+        endpoint = select_endpoint(LOCAL_GANACHE_CANDIDATES)
+        if not endpoint:
+            print("   ❌ No local blockchain found on ports 8545-8554")
+            return False
+        rpc_url, network_name = endpoint
+        info = check_connection(rpc_url)
         
-        if w3.is_connected():
-            chain_id = w3.eth.chain_id
-            block_number = w3.eth.block_number
-            print(f"   ✅ Connected to Ganache")
-            print(f"   📊 Chain ID: {chain_id}")
-            print(f"   📦 Current block: {block_number}")
+        if info:
+            print(f"   ✅ Connected to {network_name}")
+            print(f"   📊 Chain ID: {info['chain_id']}")
+            print(f"   📦 Current block: {info['block_number']}")
         else:
+            forget_endpoints(LOCAL_GANACHE_CANDIDATES)
             print("   ❌ Cannot connect to blockchain")
             return False
         
@@ -31,8 +38,7 @@ def test_basic_setup():
         private_key = '0x4f3edf983ac636a65a842ce7c78d9aa706d3b113bce9c46f30d7d21715b23b1d'  # Ganache test key
         account = Account.from_key(private_key)
         
-        balance = w3.eth.get_balance(account.address)
-        balance_eth = w3.from_wei(balance, 'ether')
+        balance_eth = get_balance_eth(rpc_url, account.address)
         
         print(f"   ✅ Account: {account.address}")
         print(f"   💰 Balance: {balance_eth} ETH")
@@ -59,11 +65,11 @@ def test_basic_setup():
         
         try:
             # Try to create Ocean config for local network
-            config = get_config_dict('http://localhost:8545')
+            config = get_ocean_config(rpc_url)
             print("   ✅ Ocean configuration created")
             
             # Create Ocean instance
-            ocean = Ocean(config)
+            ocean = get_ocean(rpc_url, config)
             print("   ✅ Ocean instance created successfully!")
             
             # Test basic publishing capability
@@ -1,13 +1,38 @@
 """
 Simple Ganache Starter for Ocean.py
 Starts local blockchain for development
+
+With --snapshot the chain starts from a pre-warmed database that already
+holds VolunteerBadgeSBT, verified NGOs and seeded badges. Snapshots are
+keyed by a hash of the contract bytecode, the fixtures and the Ganache
+version (database formats differ between releases), and every launch runs on
+a private copy so the snapshot itself never changes.
 """
 
+import contextlib
+import hashlib
+import json
+import shutil
+import signal
 import subprocess
 import socket
 import sys
+import tempfile
 import time
 import os
+import re
+
+SNAPSHOT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".chain_snapshots")
+SNAPSHOT_INFO = "snapshot.json"
+
+# Deployed into every snapshot: account 0 is the admin, NGOs use the listed accounts
+DEFAULT_FIXTURES = {
+    "ngos": [
+        {"account": 1, "name": "Asociatia Voluntarilor Bucuresti"},
+        {"account": 2, "name": "Crucea Rosie Cluj"}
+    ],
+    "badges_per_ngo": 50
+}
 
 def check_port(port):
     """Check if a port is available"""
@@ -27,32 +52,241 @@ def find_available_port(start_port=8545):
             return port
     return None
 
-def start_ganache():
-    """Start Ganache CLI with available port"""
-    print("🌊 Ocean.py Local Blockchain Starter")
-    print("=" * 40)
-    
-    # Find Ganache CLI executable
-    ganache_paths = [
-        'ganache-cli',  # If in PATH
-        'C:\\Users\\vonic\\AppData\\Roaming\\npm\\ganache-cli.cmd',  # Windows npm global
-        os.path.expanduser('~\\AppData\\Roaming\\npm\\ganache-cli.cmd')  # Current user
-    ]
-    
-    ganache_exe = None
-    for path in ganache_paths:
+GANACHE_PATHS = [
+    'ganache',  # ganache v7+ in PATH
+    'ganache-cli',  # If in PATH
+    'C:\\Users\\vonic\\AppData\\Roaming\\npm\\ganache-cli.cmd',  # Windows npm global
+    os.path.expanduser('~\\AppData\\Roaming\\npm\\ganache-cli.cmd')  # Current user
+]
+
+def find_ganache_executable():
+    """Return the first working Ganache CLI executable, or None"""
+    for path in GANACHE_PATHS:
         try:
             subprocess.run([path, '--version'], capture_output=True, text=True, check=True)
-            ganache_exe = path
-            print(f"✅ Found Ganache CLI: {path}")
-            break
+            return path
         except:
             continue
+    return None
+
+def ganache_version(ganache_exe):
+    """``--version`` output, e.g. 'ganache v7.9.2 (@ganache/cli: 0.10.2, @ganache/core: 0.10.2)'"""
+    return subprocess.run([ganache_exe, '--version'], capture_output=True, text=True, check=True).stdout.strip()
+
+def _major_version(version):
+    """7 for 'ganache v7.9.2 ...'; 0 for ganache-cli v6 ('Ganache CLI v6.12.2 ...') or anything else"""
+    match = re.match(r"ganache v(\d+)\.", version)
+    return int(match.group(1)) if match else 0
+
+def ganache_command(ganache_exe, port, host='0.0.0.0', extra_args=()):
+    """Command line for a deterministic Ganache chain on ``port``"""
+    return [
+        ganache_exe,
+        '--deterministic',
+        '--accounts', '10',
+        '--host', host,
+        '--port', str(port),
+        '--gasLimit', '0x1fffffffffffff',
+        '--gasPrice', '0x1',
+        *extra_args
+    ]
+
+def wait_until_ready(rpc_url, timeout=30, process=None):
+    """Poll eth_blockNumber until the node answers; False on timeout or early exit"""
+    from provider_factory import rpc_call
+
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process is not None and process.poll() is not None:
+            return False
+        try:
+            rpc_call(rpc_url, "eth_blockNumber", [], timeout=1)
+            return True
+        except Exception:
+            time.sleep(0.1)
+    return False
+
+def launch_ganache(port=None, extra_args=(), timeout=30, ganache_exe=None):
+    """Start Ganache in the background and wait for it
+
+    Returns (process, rpc_url); raises RuntimeError if Ganache is missing,
+    no port is free or the node does not come up.
+    """
+    ganache_exe = ganache_exe or find_ganache_executable()
+    if not ganache_exe:
+        raise RuntimeError("Ganache CLI not found - install with: npm install -g ganache")
+    port = port or find_available_port(8545)
+    if not port:
+        raise RuntimeError("No available ports found (8545-8554)")
+
+    process = subprocess.Popen(
+        ganache_command(ganache_exe, port, host='127.0.0.1', extra_args=extra_args),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    rpc_url = f"http://127.0.0.1:{port}"
+    if not wait_until_ready(rpc_url, timeout, process):
+        stop_ganache(process)
+        raise RuntimeError(f"Ganache did not become ready on port {port}")
+    return process, rpc_url
+
+def stop_ganache(process, timeout=10):
+    """Terminate a background Ganache started by launch_ganache"""
+    if process.poll() is None:
+        if os.name == "nt":
+            # send_signal() only knows SIGTERM and console events on Windows
+            process.terminate()
+        else:
+            # SIGINT lets Ganache close its database cleanly
+            process.send_signal(signal.SIGINT)
+        try:
+            process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+    workdir = getattr(process, "snapshot_workdir", None)
+    if workdir:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+# ========== PRE-WARMED SNAPSHOTS ==========
+
+def snapshot_key(fixtures=DEFAULT_FIXTURES, version=""):
+    """Hash of the contract bytecode, the fixtures, the chain options and the Ganache version"""
+    from sbt_contract import load_artifact
+
+    digest = hashlib.sha256()
+    digest.update(load_artifact()["bytecode"].encode())
+    digest.update(json.dumps(fixtures, sort_keys=True).encode())
+    digest.update(" ".join(ganache_command("ganache", 0)[2:]).encode())
+    digest.update(version.encode())
+    return digest.hexdigest()[:16]
+
+def snapshot_ready(path):
+    """True when ``path`` holds a finished build: its info file and a non-empty database"""
+    db = os.path.join(path, "db")
+    return os.path.exists(os.path.join(path, SNAPSHOT_INFO)) and os.path.isdir(db) and bool(os.listdir(db))
+
+def _deploy_fixtures(rpc_url, fixtures):
+    """Deploy the contract and fixtures on a running chain; return the snapshot info"""
+    from badge_indexer import seed_issuances
+    from provider_factory import get_web3
+    from sbt_contract import deploy_sbt, ganache_account, register_verified_ngo
+
+    web3 = get_web3(rpc_url)
+    admin = ganache_account(0)
+    contract = deploy_sbt(web3, admin)
+    ngos = []
+    for ngo in fixtures["ngos"]:
+        account = ganache_account(ngo["account"])
+        register_verified_ngo(web3, contract, admin, account.address, ngo["name"])
+        ngos.append({"account": ngo["account"], "address": account.address, "name": ngo["name"]})
+    for ngo in fixtures["ngos"]:
+        seed_issuances(web3, contract, ganache_account(ngo["account"]), fixtures["badges_per_ngo"])
+    return {
+        "contract": contract.address,
+        "admin": admin.address,
+        "ngos": ngos,
+        "block_number": web3.eth.block_number,
+        "fixtures": fixtures
+    }
+
+def build_snapshot(fixtures=DEFAULT_FIXTURES, rebuild=False, ganache_exe=None):
+    """Return the directory of the snapshot for ``fixtures``, building it if needed
+
+    Needs Ganache v7+, whose ``--database.dbPath`` persists the chain.
+    """
+    ganache_exe = ganache_exe or find_ganache_executable()
+    if not ganache_exe:
+        raise RuntimeError("Ganache CLI not found - install with: npm install -g ganache")
+    version = ganache_version(ganache_exe)
+    if _major_version(version) < 7:
+        raise RuntimeError(f"Snapshots need Ganache v7+, found {version!r} - install with: npm install -g ganache")
+    path = os.path.join(SNAPSHOT_ROOT, snapshot_key(fixtures, version))
+    if snapshot_ready(path) and not rebuild:
+        return path
+
+    os.makedirs(SNAPSHOT_ROOT, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix="building-", dir=SNAPSHOT_ROOT)
+    try:
+        process, rpc_url = launch_ganache(extra_args=("--database.dbPath", os.path.join(staging, "db")),
+                                          ganache_exe=ganache_exe)
+        try:
+            info = _deploy_fixtures(rpc_url, fixtures)
+        finally:
+            stop_ganache(process)
+        info["ganache_version"] = version
+        with open(os.path.join(staging, SNAPSHOT_INFO), "w") as f:
+            json.dump(info, f, indent=2)
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(staging, path)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return path
+
+def _working_copy(path):
+    """Copy a snapshot database to a temporary directory; return (workdir, ganache args)"""
+    workdir = tempfile.mkdtemp(prefix="ganache-")
+    shutil.copytree(os.path.join(path, "db"), os.path.join(workdir, "db"))
+    return workdir, ("--database.dbPath", os.path.join(workdir, "db"))
+
+def load_snapshot_info(path):
+    with open(os.path.join(path, SNAPSHOT_INFO)) as f:
+        return json.load(f)
+
+def launch_snapshot_chain(fixtures=DEFAULT_FIXTURES, port=None, rebuild=False):
+    """Start Ganache on a private copy of the pre-warmed snapshot
+
+    Returns (process, rpc_url, info); info holds the contract and NGO
+    addresses. stop_ganache() also removes the copy.
+    """
+    path = build_snapshot(fixtures, rebuild)
+    workdir, extra_args = _working_copy(path)
+    try:
+        process, rpc_url = launch_ganache(port, extra_args=extra_args)
+    except BaseException:
+        shutil.rmtree(workdir, ignore_errors=True)
+        raise
+    process.snapshot_workdir = workdir
+    return process, rpc_url, load_snapshot_info(path)
+
+def evm_snapshot(rpc_url):
+    """Take an in-memory chain snapshot and return its id"""
+    from provider_factory import rpc_call
+
+    return rpc_call(rpc_url, "evm_snapshot")
+
+def evm_revert(rpc_url, snapshot_id):
+    """Roll the chain back to ``snapshot_id`` (Ganache forgets the id afterwards)"""
+    from provider_factory import rpc_call
+
+    return bool(rpc_call(rpc_url, "evm_revert", [snapshot_id]))
+
+@contextlib.contextmanager
+def clean_state(rpc_url):
+    """Run a block against the chain and revert everything it did afterwards
+
+        with clean_state(rpc_url):
+            ...  # transactions here are undone on exit
+    """
+    snapshot_id = evm_snapshot(rpc_url)
+    try:
+        yield snapshot_id
+    finally:
+        evm_revert(rpc_url, snapshot_id)
+
+def start_ganache(snapshot=False, rebuild=False):
+    """Start Ganache CLI with available port (from the pre-warmed snapshot if asked)"""
+    print("🌊 Ocean.py Local Blockchain Starter")
+    print("=" * 40)
     
+    # Find Ganache CLI executable
+    ganache_exe = find_ganache_executable()
     if not ganache_exe:
         print("❌ Ganache CLI not found!")
-        print("   Install with: npm install -g ganache-cli")
+        print("   Install with: npm install -g ganache")
         return False
+    print(f"✅ Found Ganache CLI: {ganache_exe}")
     
     # Find available port
     port = find_available_port(8545)
@@ -63,15 +297,21 @@ def start_ganache():
     print(f"✅ Using port {port}")
     
     # Ganache command
-    cmd = [
-        ganache_exe,
-        '--deterministic',
-        '--accounts', '10',
-        '--host', '0.0.0.0',
-        '--port', str(port),
-        '--gasLimit', '0x1fffffffffffff',
-        '--gasPrice', '0x1'
-    ]
+    extra_args = ()
+    workdir = None
+    if snapshot:
+        print("📦 Preparing pre-warmed chain snapshot...")
+        try:
+            path = build_snapshot(rebuild=rebuild, ganache_exe=ganache_exe)
+        except Exception as e:
+            print(f"❌ Snapshot build failed: {e}")
+            return False
+        info = load_snapshot_info(path)
+        workdir, extra_args = _working_copy(path)
+        print(f"✅ Snapshot {os.path.basename(path)}: VolunteerBadgeSBT at {info['contract']}")
+        for ngo in info["ngos"]:
+            print(f"   🏢 {ngo['name']}: {ngo['address']}")
+    cmd = ganache_command(ganache_exe, port, extra_args=extra_args)
     
     print("🚀 Starting Ganache...")
     print("   This terminal will stay open while blockchain runs")
@@ -86,7 +326,7 @@ def start_ganache():
         subprocess.run(cmd)
     except FileNotFoundError:
         print("❌ Ganache CLI not found!")
-        print("   Install with: npm install -g ganache-cli")
+        print("   Install with: npm install -g ganache")
         return False
     except KeyboardInterrupt:
         print("\n🛑 Ganache stopped")
@@ -94,6 +334,16 @@ def start_ganache():
     except Exception as e:
         print(f"❌ Error: {e}")
         return False
+    finally:
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
 
 if __name__ == "__main__":
-    start_ganache()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Start a local Ganache chain")
+    parser.add_argument("--snapshot", action="store_true",
+                        help="start from the pre-warmed snapshot with VolunteerBadgeSBT and fixtures deployed")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the snapshot even if it exists")
+    args = parser.parse_args()
+    start_ganache(snapshot=args.snapshot, rebuild=args.rebuild)
@@ -0,0 +1,318 @@
+"""
+Telemetry: Timing Spans, Counters and Histograms
+Records where publishing time goes and exports it for later analysis
+
+Spans nest per thread and are appended to a JSON-lines trace file as they
+finish; counters and histograms are written as a Prometheus textfile. While
+telemetry is disabled every call returns after a single flag check.
+
+Enable with enable(trace_path, metrics_path), the VOLUNTEER_TRACE_PATH /
+VOLUNTEER_METRICS_PATH environment variables, or the CLI's --trace/--metrics.
+"""
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from itertools import count as _counter
+
+HISTOGRAM_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_enabled = False
+_lock = threading.Lock()
+_local = threading.local()
+_span_ids = _counter(1)
+_trace_file = None
+_metrics_path = None
+_counters = {}
+_histograms = {}
+
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class Span:
+    """One timed operation; use through span()"""
+
+    def __init__(self, name, parent, attrs):
+        self.name = name
+        self.span_id = next(_span_ids)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.attrs = attrs
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        stack = _stack()
+        stack.append(self)
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self._started
+        stack = _stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        record = {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.started_at,
+            "duration_ms": duration * 1000,
+            "thread": threading.current_thread().name
+        }
+        if self.attrs:
+            record["attrs"] = self.attrs
+        if exc_type is not None:
+            record["error"] = f"{exc_type.__name__}: {exc}"
+        observe("span_duration_seconds", duration, span=self.name)
+        _write_trace(record)
+        return False
+
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def _write_trace(record):
+    if _trace_file is not None:
+        line = json.dumps(record, default=str) + "\n"
+        with _lock:
+            _trace_file.write(line)
+            _trace_file.flush()
+
+
+def _label_key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+# ========== PUBLIC API ==========
+
+def enabled():
+    return _enabled
+
+
+def span(name, parent=None, **attrs):
+    """Context manager timing ``name``; nests under the current span of this thread
+
+    Pass ``parent=current_span()`` captured in another thread to keep the
+    nesting across a thread pool.
+    """
+    if not _enabled:
+        return _NOOP
+    if parent is None:
+        stack = _stack()
+        parent = stack[-1] if stack else None
+    return Span(name, parent, attrs)
+
+
+def current_span():
+    if not _enabled:
+        return None
+    stack = _stack()
+    return stack[-1] if stack else None
+
+
+def traced(name=None):
+    """Decorator wrapping every call of a function in a span"""
+    def decorate(function):
+        span_name = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            with span(span_name):
+                return function(*args, **kwargs)
+
+        return wrapper
+    return decorate
+
+
+def count(name, value=1, **labels):
+    """Increase a counter"""
+    if not _enabled:
+        return
+    key = _label_key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name, value, **labels):
+    """Record one histogram sample"""
+    if not _enabled:
+        return
+    key = _label_key(name, labels)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = {"buckets": [0] * len(HISTOGRAM_BUCKETS), "count": 0, "sum": 0.0}
+        for i, bound in enumerate(HISTOGRAM_BUCKETS):
+            if value <= bound:
+                histogram["buckets"][i] += 1
+        histogram["count"] += 1
+        histogram["sum"] += value
+
+
+def snapshot():
+    """Current counters and histograms as plain dicts"""
+    with _lock:
+        return {
+            "counters": {_format_series(name, labels): value for (name, labels), value in _counters.items()},
+            "histograms": {_format_series(name, labels): dict(h, buckets=list(h["buckets"]))
+                           for (name, labels), h in _histograms.items()}
+        }
+
+
+# ========== EXPORT ==========
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (key + '="' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"' for key, value in pairs)
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_series(name, labels):
+    return f"volunteer_{name}{_format_labels(labels)}"
+
+
+def prometheus_text():
+    """Counters and histograms in the Prometheus text exposition format"""
+    lines = []
+    with _lock:
+        counters = sorted(_counters.items())
+        histograms = sorted(_histograms.items())
+    seen = set()
+    for (name, labels), value in counters:
+        metric = f"volunteer_{name}"
+        if metric not in seen:
+            lines.append(f"# TYPE {metric} counter")
+            seen.add(metric)
+        lines.append(f"{metric}{_format_labels(labels)} {value}")
+    for (name, labels), histogram in histograms:
+        metric = f"volunteer_{name}"
+        if metric not in seen:
+            lines.append(f"# TYPE {metric} histogram")
+            seen.add(metric)
+        for bound, bucket_count in zip(HISTOGRAM_BUCKETS, histogram["buckets"]):
+            lines.append(f"{metric}_bucket{_format_labels(labels, [('le', bound)])} {bucket_count}")
+        lines.append(f"{metric}_bucket{_format_labels(labels, [('le', '+Inf')])} {histogram['count']}")
+        lines.append(f"{metric}_sum{_format_labels(labels)} {histogram['sum']}")
+        lines.append(f"{metric}_count{_format_labels(labels)} {histogram['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(path=None):
+    """Atomically write the Prometheus textfile (node_exporter textfile collector format)"""
+    path = path or _metrics_path
+    if not path:
+        return None
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(prometheus_text())
+    os.replace(tmp_path, path)
+    return path
+
+
+def enable(trace_path=None, metrics_path=None):
+    """Start recording; spans go to ``trace_path``, metrics to ``metrics_path`` at exit"""
+    global _enabled, _trace_file, _metrics_path
+    with _lock:
+        if trace_path and _trace_file is None:
+            _trace_file = open(trace_path, "a")
+        if metrics_path:
+            _metrics_path = metrics_path
+        _enabled = True
+
+
+def disable():
+    """Stop recording, write the metrics file and close the trace"""
+    global _enabled, _trace_file
+    _enabled = False
+    write_metrics()
+    with _lock:
+        if _trace_file is not None:
+            _trace_file.close()
+            _trace_file = None
+
+
+def reset():
+    """Forget all counters and histograms"""
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+atexit.register(lambda: _enabled and disable())
+
+if os.environ.get("VOLUNTEER_TRACE_PATH") or os.environ.get("VOLUNTEER_METRICS_PATH"):
+    enable(os.environ.get("VOLUNTEER_TRACE_PATH"), os.environ.get("VOLUNTEER_METRICS_PATH"))
+
+
+# ========== REPORT ==========
+
+def load_trace(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def summarize_trace(records):
+    """Per span name: calls, total, p50, p95 and max duration in ms, slowest total first"""
+    by_name = {}
+    for record in records:
+        by_name.setdefault(record["name"], []).append(record["duration_ms"])
+    rows = []
+    for name, durations in by_name.items():
+        durations.sort()
+        rows.append({
+            "name": name,
+            "calls": len(durations),
+            "total_ms": sum(durations),
+            "p50_ms": durations[len(durations) // 2],
+            "p95_ms": durations[min(len(durations) - 1, int(len(durations) * 0.95))],
+            "max_ms": durations[-1]
+        })
+    rows.sort(key=lambda row: row["total_ms"], reverse=True)
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Print the slowest spans of a telemetry trace")
+    parser.add_argument("trace", help="JSON-lines trace written with VOLUNTEER_TRACE_PATH or --trace")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    records = load_trace(args.trace)
+    print(f"⏱️  Telemetry Report: {args.trace} ({len(records):,} spans)")
+    print("=" * 40)
+    print(f"   {'span':<32} {'calls':>6} {'total ms':>10} {'p50':>9} {'p95':>9} {'max':>9}")
+    for row in summarize_trace(records)[:args.top]:
+        print(f"   {row['name']:<32} {row['calls']:>6} {row['total_ms']:>10.1f} {row['p50_ms']:>9.1f} "
+              f"{row['p95_ms']:>9.1f} {row['max_ms']:>9.1f}")
+
+    print("\n   🐢 Slowest individual spans:")
+    for record in sorted(records, key=lambda r: r["duration_ms"], reverse=True)[:args.top]:
+        error = f"  ❌ {record['error']}" if record.get("error") else ""
+        print(f"   • {record['name']}: {record['duration_ms']:.1f} ms{error}")
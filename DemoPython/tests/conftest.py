@@ -0,0 +1,20 @@
+import os
+import sys
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.dirname(HERE), HERE]
+
+from fake_chain import FakeChain, serve_fake_chain  # noqa: E402
+
+
+@pytest.fixture
+def chain():
+    """A fresh fake chain and its JSON-RPC URL"""
+    fake = FakeChain()
+    server, url = serve_fake_chain(fake)
+    fake.url = url
+    yield fake
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,285 @@
+"""
+Fake JSON-RPC Chain
+In-memory blocks, transactions and logs served over HTTP for the tests
+
+Answers single and batched JSON-RPC requests for the handful of eth_*
+methods the DemoPython modules use. Tests build the chain directly
+(``send``, ``mine``, ``add_log``, ``reorg``, ``call_results`` for eth_call)
+and count what the code under test asked for in ``calls`` and ``requests``.
+Signed transactions sent with eth_sendRawTransaction join the pool, and
+with ``automine`` each one is mined in its own block like Ganache does.
+"""
+
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CHAIN_ID = 1337
+GENESIS_TIMESTAMP = 1_700_000_000
+ESTIMATED_GAS = 150_000
+
+
+def _quantity(value):
+    return hex(value)
+
+
+def _hash(*parts):
+    return "0x" + hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+def _decode_raw(raw):
+    """Pool entry for a signed legacy or EIP-1559 transaction"""
+    import rlp
+    from eth_account import Account
+    from eth_utils import keccak
+
+    typed = raw[0] <= 0x7f
+    fields = rlp.decode(raw[1:] if typed else raw)
+    nonce, to, value, data = (fields[1], fields[5], fields[6], fields[7]) if typed else \
+        (fields[0], fields[3], fields[4], fields[5])
+    return {"hash": "0x" + keccak(raw).hex(), "from": Account.recover_transaction(raw).lower(),
+            "to": "0x" + to.hex() if to else None, "nonce": _quantity(int.from_bytes(nonce, "big")),
+            "value": _quantity(int.from_bytes(value, "big")), "input": "0x" + data.hex()}
+
+
+class FakeChain:
+    """A single-node chain whose blocks only change when a test says so"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.blocks = []
+        self.pool = {}  # tx hash -> tx, sent but not mined
+        self.receipts = {}  # tx hash -> receipt of the canonical block
+        self.nonces = {}  # sender -> next nonce mined
+        self.calls = []  # every method asked for, batched or not
+        self.requests = 0  # HTTP requests
+        self.reverts = set()
+        self.revert_if = None  # optional predicate: mined transactions it accepts revert
+        self.automine = False
+        self.call_results = {}  # (contract lowercase, calldata) -> eth_call return data
+        self.balances = {}  # address lowercase -> wei
+        self._fork = 0
+        self._snapshots = []  # evm_snapshot: chain length at each snapshot
+        self.mine()  # genesis
+
+    # ========== BUILDING ==========
+
+    def send(self, sender, nonce=None, to=None, mine=False):
+        """Add a transaction to the pool; returns its hash"""
+        with self.lock:
+            sender = sender.lower()
+            if nonce is None:
+                nonce = self.nonces.get(sender, 0) + sum(1 for tx in self.pool.values() if tx["from"] == sender)
+            tx_hash = _hash("tx", sender, nonce, to, len(self.calls), len(self.pool), self._fork)
+            self.pool[tx_hash] = {"hash": tx_hash, "from": sender, "to": to, "nonce": _quantity(nonce),
+                                  "value": "0x0", "input": "0x"}
+        if mine:
+            self.mine([tx_hash])
+        return tx_hash
+
+    def send_raw(self, raw):
+        """Add a signed transaction to the pool (mining it with ``automine``); returns its hash"""
+        tx = _decode_raw(raw)
+        with self.lock:
+            self.pool[tx["hash"]] = tx
+        if self.automine:
+            self.mine([tx["hash"]])
+        return tx["hash"]
+
+    def drop(self, tx_hash):
+        with self.lock:
+            self.pool.pop(tx_hash, None)
+
+    def mine(self, tx_hashes=None, logs=None):
+        """Mine one block with ``tx_hashes`` (default: the whole pool); returns its number"""
+        with self.lock:
+            number = len(self.blocks)
+            parent = self.blocks[-1]["hash"] if self.blocks else "0x" + "00" * 32
+            block_hash = _hash("block", number, parent, self._fork)
+            hashes = list(self.pool) if tx_hashes is None else tx_hashes
+            transactions = []
+            for index, tx_hash in enumerate(hashes):
+                tx = dict(self.pool.pop(tx_hash), blockHash=block_hash, blockNumber=_quantity(number),
+                          transactionIndex=_quantity(index))
+                transactions.append(tx)
+                self.nonces[tx["from"]] = max(self.nonces.get(tx["from"], 0), int(tx["nonce"], 16) + 1)
+            block = {"number": _quantity(number), "hash": block_hash, "parentHash": parent,
+                     "timestamp": _quantity(GENESIS_TIMESTAMP + number), "transactions": transactions,
+                     "logs": []}
+            self.blocks.append(block)
+            for index, tx in enumerate(transactions):
+                self.receipts[tx["hash"]] = {
+                    "transactionHash": tx["hash"], "blockHash": block_hash, "blockNumber": _quantity(number),
+                    "transactionIndex": _quantity(index), "from": tx["from"], "to": tx["to"],
+                    "status": "0x0" if self._reverts(tx) else "0x1", "gasUsed": "0x5208",
+                    "cumulativeGasUsed": _quantity(21_000 * (index + 1)), "effectiveGasPrice": "0x3b9aca00",
+                    "logs": []}
+        for log in logs or []:
+            self.add_log(number, **log)
+        return number
+
+    def mine_empty(self, count):
+        for _ in range(count):
+            self.mine([])
+
+    def add_log(self, number, address, topics, data="0x"):
+        """Attach a log to block ``number`` (from a synthetic transaction)"""
+        with self.lock:
+            block = self.blocks[number]
+            index = len(block["logs"])
+            block["logs"].append({
+                "address": address, "topics": list(topics), "data": data, "blockNumber": _quantity(number),
+                "blockHash": block["hash"], "transactionHash": _hash("logtx", number, index, self._fork),
+                "transactionIndex": "0x0", "logIndex": _quantity(index), "removed": False})
+
+    def reorg(self, depth):
+        """Replace the last ``depth`` blocks with empty ones; their transactions return to the pool"""
+        with self.lock:
+            self._fork += 1
+            dropped = self.blocks[-depth:]
+            del self.blocks[-depth:]
+            for block in dropped:
+                for tx in block["transactions"]:
+                    self.receipts.pop(tx["hash"], None)
+                    self.pool[tx["hash"]] = {k: tx[k] for k in ("hash", "from", "to", "nonce", "value", "input")}
+            self.nonces = {}
+            for block in self.blocks:
+                for tx in block["transactions"]:
+                    self.nonces[tx["from"]] = max(self.nonces.get(tx["from"], 0), int(tx["nonce"], 16) + 1)
+        self.mine_empty(depth)
+
+    def _reverts(self, tx):
+        return tx["hash"] in self.reverts or (self.revert_if is not None and self.revert_if(tx))
+
+    def revert_to(self, length):
+        """evm_revert: forget every block after the first ``length`` and what they mined"""
+        with self.lock:
+            for block in self.blocks[length:]:
+                for tx in block["transactions"]:
+                    self.receipts.pop(tx["hash"], None)
+            del self.blocks[length:]
+            self.pool.clear()
+            self.nonces = {}
+            for block in self.blocks:
+                for tx in block["transactions"]:
+                    self.nonces[tx["from"]] = max(self.nonces.get(tx["from"], 0), int(tx["nonce"], 16) + 1)
+
+    @property
+    def head(self):
+        return len(self.blocks) - 1
+
+    def count(self, method):
+        return sum(1 for call in self.calls if call == method)
+
+    # ========== JSON-RPC ==========
+
+    def _number(self, tag):
+        if tag in ("latest", "pending", "safe", "finalized"):
+            return self.head
+        if tag == "earliest":
+            return 0
+        return int(tag, 16) if isinstance(tag, str) else int(tag)
+
+    def _block(self, tag):
+        number = self._number(tag)
+        return self.blocks[number] if number < len(self.blocks) else None
+
+    def handle(self, method, params):
+        self.calls.append(method)
+        if method == "eth_sendRawTransaction":
+            return self.send_raw(bytes.fromhex(params[0][2:]))
+        if method == "evm_snapshot":
+            self._snapshots.append(len(self.blocks))
+            return _quantity(len(self._snapshots))
+        if method == "evm_revert":
+            index = int(params[0], 16)
+            if index > len(self._snapshots):
+                return False
+            self.revert_to(self._snapshots[index - 1])
+            del self._snapshots[index - 1:]  # like Ganache, the id (and later ones) cannot be reused
+            return True
+        with self.lock:
+            if method == "eth_chainId":
+                return _quantity(CHAIN_ID)
+            if method == "net_version":
+                return str(CHAIN_ID)
+            if method == "eth_blockNumber":
+                return _quantity(self.head)
+            if method == "eth_gasPrice":
+                return "0x3b9aca00"
+            if method == "eth_getBlockByNumber":
+                block = self._block(params[0])
+                if block is None:
+                    return None
+                view = {k: v for k, v in block.items() if k != "logs"}
+                if not params[1]:
+                    view["transactions"] = [tx["hash"] for tx in block["transactions"]]
+                return dict(view, baseFeePerGas="0x3b9aca00", gasLimit="0x1c9c380", gasUsed="0x0")
+            if method == "eth_getTransactionReceipt":
+                return self.receipts.get(params[0])
+            if method == "eth_getTransactionByHash":
+                if params[0] in self.pool:
+                    return dict(self.pool[params[0]], blockHash=None, blockNumber=None)
+                for block in self.blocks:
+                    for tx in block["transactions"]:
+                        if tx["hash"] == params[0]:
+                            return tx
+                return None
+            if method == "eth_call":
+                call = params[0]
+                return self.call_results.get((str(call.get("to")).lower(), call.get("data") or call.get("input")),
+                                             "0x")
+            if method == "eth_getTransactionCount":
+                sender = params[0].lower()
+                pending = sum(1 for tx in self.pool.values() if tx["from"] == sender) if params[1:] == ["pending"] else 0
+                return _quantity(self.nonces.get(sender, 0) + pending)
+            if method == "eth_getBalance":
+                return _quantity(self.balances.get(params[0].lower(), 0))
+            if method == "eth_estimateGas":
+                return _quantity(ESTIMATED_GAS)
+            if method == "eth_getLogs":
+                query = params[0]
+                start = self._number(query.get("fromBlock", "earliest"))
+                end = self._number(query.get("toBlock", "latest"))
+                addresses = query.get("address") or []
+                addresses = {a.lower() for a in ([addresses] if isinstance(addresses, str) else addresses)}
+                wanted = (query.get("topics") or [None])[0] or []
+                wanted = {t.lower() for t in ([wanted] if isinstance(wanted, str) else wanted)}
+                return [log for block in self.blocks[start:end + 1] for log in block["logs"]
+                        if (not addresses or log["address"].lower() in addresses)
+                        and (not wanted or log["topics"][0].lower() in wanted)]
+        raise LookupError(method)
+
+    def reply(self, request):
+        try:
+            return {"jsonrpc": "2.0", "id": request["id"], "result": self.handle(request["method"],
+                                                                                request.get("params", []))}
+        except LookupError as e:
+            return {"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32601, "message": f"no method {e}"}}
+
+
+def serve_fake_chain(chain, port=0):
+    """Serve ``chain`` over JSON-RPC on localhost; returns (server, url)"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            chain.requests += 1
+            payload = [chain.reply(r) for r in body] if isinstance(body, list) else chain.reply(body)
+            data = json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
@@ -0,0 +1,23 @@
+import gc
+import logging
+
+from web3 import Web3
+
+from async_chain import _async_instances, check_connection, get_balance_eth
+
+VOLUNTEER = Web3.to_checksum_address("0x" + "aa" * 20)
+
+
+def test_sync_wrappers_close_their_sessions(chain, caplog):
+    chain.balances[VOLUNTEER.lower()] = 3 * 10 ** 18
+    with caplog.at_level(logging.ERROR, logger="asyncio"):
+        for _ in range(3):
+            assert get_balance_eth(chain.url, VOLUNTEER) == 3
+        assert check_connection(chain.url) == {"chain_id": 1337, "block_number": 0}
+        gc.collect()
+    assert "Unclosed" not in caplog.text
+    assert not _async_instances
+
+
+def test_unreachable_node_reports_none():
+    assert check_connection("http://127.0.0.1:9") is None
@@ -0,0 +1,78 @@
+from eth_abi import encode
+from eth_utils import event_abi_to_log_topic
+
+from badge_indexer import BadgeIndexer
+from provider_factory import get_web3
+
+CONTRACT = "0x" + "5b" * 20
+VOLUNTEER = "0x" + "aa" * 20
+NGO = "0x" + "cc" * 20
+
+
+def _event(name, *inputs):
+    return {"type": "event", "name": name, "anonymous": False,
+            "inputs": [{"name": n, "type": t, "indexed": i} for n, t, i in inputs]}
+
+
+ABI = [
+    _event("BadgeIssued", ("volunteer", "address", True), ("tokenId", "uint256", True),
+           ("hoursAdded", "uint256", False), ("ngo", "address", True), ("activityType", "string", False)),
+    _event("NGORegistered", ("ngo", "address", True), ("name", "string", False)),
+    _event("NGOVerified", ("ngo", "address", True), ("verified", "bool", False)),
+    _event("BadgeUpdated", ("volunteer", "address", True), ("tokenId", "uint256", True),
+           ("newTotalHours", "uint256", False)),
+    _event("BadgeBurned", ("volunteer", "address", True), ("tokenId", "uint256", True)),
+]
+
+
+def _word(value, kind):
+    return "0x" + encode([kind], [value]).hex()
+
+
+def badge_issued(token_id, hours):
+    return {"address": CONTRACT,
+            "topics": ["0x" + event_abi_to_log_topic(ABI[0]).hex().replace("0x", ""), _word(VOLUNTEER, "address"),
+                       _word(token_id, "uint256"), _word(NGO, "address")],
+            "data": "0x" + encode(["uint256", "string"], [hours, "community-service"]).hex()}
+
+
+def test_sync_indexes_events_with_batched_block_headers(chain, tmp_path):
+    web3 = get_web3(chain.url)
+    contract = web3.eth.contract(address=web3.to_checksum_address(CONTRACT), abi=ABI)
+    for token_id in range(1, 41):
+        chain.mine([], logs=[badge_issued(token_id, 8)])
+    chain.mine_empty(5)
+
+    indexer = BadgeIndexer(web3, contract, db_path=str(tmp_path / "index.sqlite"), workers=2)
+    try:
+        before = chain.count("eth_getBlockByNumber")
+        requests = chain.requests
+        stats = indexer.sync()
+        assert stats["events"] == 40
+        assert indexer.checkpoint()[0] == chain.head
+        assert chain.count("eth_getBlockByNumber") - before == 41  # every event block plus the batch end
+        assert chain.requests - requests < 10  # ...but in a handful of HTTP round trips
+
+        rows = indexer.events(event="BadgeIssued")
+        assert [row["token_id"] for row in rows] == list(range(1, 41))
+        stored = dict(indexer.db.execute("SELECT block_number, timestamp FROM blocks"))
+        assert stored[1] == int(chain.blocks[1]["timestamp"], 16)
+        assert indexer.checkpoint()[1] == chain.blocks[-1]["hash"]
+    finally:
+        indexer.close()
+
+
+def test_reorg_rolls_back_and_reindexes(chain, tmp_path):
+    web3 = get_web3(chain.url)
+    contract = web3.eth.contract(address=web3.to_checksum_address(CONTRACT), abi=ABI)
+    for token_id in range(1, 6):
+        chain.mine([], logs=[badge_issued(token_id, 4)])
+    indexer = BadgeIndexer(web3, contract, db_path=str(tmp_path / "index.sqlite"))
+    try:
+        indexer.sync()
+        chain.reorg(2)
+        stats = indexer.sync()
+        assert stats["rolled_back_to"] == chain.head - 2
+        assert [row["token_id"] for row in indexer.events()] == [1, 2, 3]
+    finally:
+        indexer.close()
@@ -0,0 +1,69 @@
+from eth_account import Account
+
+from badge_issuer import BulkIssuer, HourSheetError, iter_hour_sheet, synthetic_rows
+from provider_factory import get_web3
+from tx_signer import SigningPool
+
+CONTRACT = "0x" + "5b" * 20
+NGO = Account.from_key("0x" + "42" * 32)
+
+ABI = [{"type": "function", "name": "issueBadge", "stateMutability": "nonpayable", "outputs": [],
+        "inputs": [{"name": "volunteer", "type": "address"}, {"name": "hoursToAdd", "type": "uint256"},
+                   {"name": "metadataURI", "type": "string"}, {"name": "activityType", "type": "string"}]}]
+
+
+def issuer_for(chain, **kwargs):
+    chain.automine = True
+    web3 = get_web3(chain.url)
+    contract = web3.eth.contract(address=web3.to_checksum_address(CONTRACT), abi=ABI)
+    return BulkIssuer(web3, contract, NGO, **kwargs)
+
+
+def mined_nonces(chain):
+    return [int(tx["nonce"], 16) for block in chain.blocks for tx in block["transactions"]]
+
+
+def test_issues_every_row_with_consecutive_nonces(chain):
+    rows = list(synthetic_rows(10))
+    rows.insert(3, (99, HourSheetError("hours must be positive")))
+    report = issuer_for(chain, window=4).issue(rows)
+
+    assert report["rows"] == 11
+    assert report["submitted"] == report["confirmed"] == 10
+    assert report["gas_used"] == 10 * 21_000
+    assert [f["line"] for f in report["failures"]] == [99]
+    assert mined_nonces(chain) == list(range(10))
+    assert all(tx["from"] == NGO.address.lower() and tx["to"] == CONTRACT
+               for block in chain.blocks for tx in block["transactions"])
+    assert chain.count("eth_estimateGas") == 1  # one call shape
+
+
+def test_reverted_row_is_reported_with_its_transaction_hash(chain):
+    rows = list(synthetic_rows(3))
+    unlucky = rows[1][1]["volunteer"][2:].lower()
+    chain.revert_if = lambda tx: unlucky in tx["input"]
+    report = issuer_for(chain).issue(rows)
+
+    assert report["confirmed"] == 2
+    [failure] = report["failures"]
+    assert failure["line"] == 2 and failure["error"] == "reverted"
+    assert failure["tx_hash"] == chain.blocks[2]["transactions"][0]["hash"]
+
+
+def test_presigned_windows_match_in_process_signing(chain):
+    with SigningPool.for_account(NGO, processes=1) as signer:
+        report = issuer_for(chain, window=4, signer=signer).issue(synthetic_rows(9))
+    assert report["confirmed"] == 9
+    assert mined_nonces(chain) == list(range(9))
+
+
+def test_hour_sheet_rows_are_validated_one_by_one(tmp_path):
+    sheet = tmp_path / "hours.csv"
+    sheet.write_text("volunteer,hours,metadata_uri,activity_type\n"
+                     f"{'0x' + 'ab' * 20},4,ipfs://a,cleanup\n"
+                     f"{'0x' + 'ab' * 20},-1,ipfs://b,cleanup\n"
+                     "not-an-address,2,ipfs://c,cleanup\n")
+    rows = list(iter_hour_sheet(str(sheet)))
+    assert [line for line, _ in rows] == [2, 3, 4]
+    assert rows[0][1]["hours"] == 4 and rows[0][1]["volunteer"].startswith("0x")
+    assert all(isinstance(row, HourSheetError) for _, row in rows[1:])
@@ -0,0 +1,115 @@
+import sqlite3
+
+from badge_indexer import SCHEMA
+from badge_stats import BadgeStatistics
+
+NGO = "0x" + "cc" * 20
+OTHER_NGO = "0x" + "dd" * 20
+ALICE = "0x" + "aa" * 20
+BOB = "0x" + "bb" * 20
+DAY = 86_400
+JAN_1 = 1_704_067_200  # 2024-01-01T00:00:00Z
+
+COLUMNS = ("block_number", "log_index", "block_hash", "tx_hash", "event", "volunteer", "token_id", "ngo", "hours",
+           "activity_type", "ngo_name", "verified")
+
+
+def row(block, event, **fields):
+    return dict(dict.fromkeys(COLUMNS), block_number=block, log_index=0, block_hash=f"0x{block:064x}",
+                tx_hash=f"0x{block:064x}", event=event, **fields)
+
+
+def issued(block, volunteer, token_id, hours, ngo=NGO):
+    return row(block, "BadgeIssued", volunteer=volunteer, token_id=token_id, hours=hours, ngo=ngo,
+               activity_type="community-service")
+
+
+HISTORY = [
+    row(1, "NGORegistered", ngo=NGO, ngo_name="Crucea Rosie Cluj"),
+    row(2, "NGOVerified", ngo=NGO, verified=1),
+    row(3, "NGORegistered", ngo=OTHER_NGO, ngo_name="Salvati Copiii"),
+    issued(4, ALICE, 1, 10),
+    issued(5, BOB, 2, 4),
+    issued(6, ALICE, 1, 6),  # repeat issue: same token, more hours
+    row(7, "BadgeUpdated", volunteer=BOB, token_id=2, hours=7),
+    row(8, "BadgeBurned", volunteer=BOB, token_id=2),
+    row(9, "NGOVerified", ngo=NGO, verified=0),
+    row(10, "NGOVerified", ngo=NGO, verified=1),
+    row(11, "NGOVerified", ngo=NGO, verified=1),  # no change
+]
+
+
+def timestamps(rows):
+    return {r["block_number"]: JAN_1 + r["block_number"] * DAY for r in rows}
+
+
+class RowIndexer:
+    """The parts of BadgeIndexer that BadgeStatistics uses, fed synthetic rows"""
+
+    def __init__(self):
+        self.db = sqlite3.connect(":memory:")
+        self.db.executescript(SCHEMA)
+        self.listeners = []
+        self.head = None
+
+    def checkpoint(self):
+        return None if self.head is None else (self.head, f"0x{self.head:064x}")
+
+    def commit(self, rows):
+        times = timestamps(rows)
+        with self.db:
+            self.db.executemany(f"INSERT INTO events VALUES ({', '.join('?' * len(COLUMNS))})",
+                                [tuple(r[c] for c in COLUMNS) for r in rows])
+            self.db.executemany("INSERT INTO blocks VALUES (?, ?, ?)",
+                                [(n, f"0x{n:064x}", t) for n, t in times.items()])
+        self.head = max(times)
+        for listener in self.listeners:
+            listener.on_events(rows, times)
+
+    def rollback_to(self, block_number):
+        with self.db:
+            self.db.execute("DELETE FROM events WHERE block_number > ?", (block_number,))
+            self.db.execute("DELETE FROM blocks WHERE block_number > ?", (block_number,))
+        self.head = block_number
+        for listener in self.listeners:
+            listener.on_rollback(block_number)
+
+
+def test_event_fold():
+    stats = BadgeStatistics()
+    stats.on_events(HISTORY, timestamps(HISTORY))
+
+    assert stats.platform() == {"total_volunteers": 2, "active_badges": 1, "burned_badges": 1, "total_hours": 16,
+                                "total_ngos": 2, "verified_ngos": 1, "issuances": 3, "block_number": 11}
+    ngo = stats.ngo(NGO.upper().replace("0X", "0x"))
+    assert ngo["name"] == "Crucea Rosie Cluj" and ngo["verified"] is True
+    assert (ngo["badges_issued"], ngo["hours_issued"], ngo["volunteers_minted"], ngo["active_badges"]) == (3, 20, 2, 1)
+    assert stats.ngo(OTHER_NGO)["verified"] is False
+    assert stats.total_hours(ALICE) == 16 and stats.total_hours(BOB) == 0
+
+    assert stats.daily("2024-01-05") == {"issuances": 1, "hours": 10, "new_badges": 1, "burned": 0}
+    assert stats.daily("2024-01-07", ngo=NGO) == {"issuances": 1, "hours": 6, "new_badges": 0, "burned": 0}
+    assert stats.daily("2024-01-09")["burned"] == 1
+    assert stats.monthly("2024-01", ngo=NGO) == {"issuances": 3, "hours": 20, "new_badges": 2, "burned": 1}
+    assert [period for period, _ in stats.series("daily", ngo=NGO)] == ["2024-01-05", "2024-01-06", "2024-01-07",
+                                                                       "2024-01-09"]
+
+
+def test_rollback_replays_the_surviving_events():
+    indexer = RowIndexer()
+    indexer.commit(HISTORY[:6])
+    stats = BadgeStatistics().attach(indexer)
+    assert stats.platform()["total_hours"] == 20
+    indexer.commit(HISTORY[6:])
+
+    indexer.rollback_to(5)  # drops the repeat issue, the update, the burn and the verification toggles
+    platform = stats.platform()
+    assert platform["block_number"] == 5
+    assert (platform["total_hours"], platform["active_badges"], platform["burned_badges"],
+            platform["issuances"], platform["verified_ngos"]) == (14, 2, 0, 2, 1)
+    assert stats.total_hours(BOB) == 4
+    assert stats.daily("2024-01-07") == {"issuances": 0, "hours": 0, "new_badges": 0, "burned": 0}
+
+    indexer.commit([issued(6, BOB, 2, 1, ngo=OTHER_NGO)])  # the new fork
+    assert stats.total_hours(BOB) == 5
+    assert stats.ngo(OTHER_NGO)["badges_issued"] == 1
@@ -0,0 +1,26 @@
+from benchmarks import compare
+
+
+def metric(value, benchmark, higher_is_better=False):
+    return {"value": value, "unit": "ms", "higher_is_better": higher_is_better, "benchmark": benchmark}
+
+
+BASELINE = {"metrics": {"cold_start_ms": metric(10.0, "cold_start"), "verify_ms": metric(5.0, "verify")}}
+
+
+def test_slower_metric_regresses():
+    results = {"metrics": {"cold_start_ms": metric(20.0, "cold_start"), "verify_ms": metric(5.0, "verify")},
+               "skipped": {}}
+    rows = {row["name"]: row for row in compare(results, BASELINE, tolerance=0.25)}
+    assert rows["cold_start_ms"]["regressed"]
+    assert not rows["verify_ms"]["regressed"]
+
+
+def test_missing_metric_regresses_unless_skipped_on_purpose():
+    results = {"metrics": {"cold_start_ms": metric(10.0, "cold_start")}, "failed": {"verify": "boom"},
+               "skipped": {}}
+    rows = {row["name"]: row for row in compare(results, BASELINE)}
+    assert rows["verify_ms"]["regressed"] and rows["verify_ms"]["value"] is None
+
+    results = dict(results, failed={}, skipped={"verify": "--no-chain"})
+    assert [row["name"] for row in compare(results, BASELINE)] == ["cold_start_ms"]
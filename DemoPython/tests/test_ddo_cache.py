@@ -0,0 +1,101 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from eth_abi import encode
+
+from ddo_cache import NAME_SELECTOR, SYMBOL_SELECTOR, OceanResolver, ResolutionCache, serve_stub_aquarius
+
+DDOS = {f"did:op:{i:064x}": {"id": f"did:op:{i:064x}", "metadata": {"name": f"Volunteer Dataset {i}"}}
+        for i in range(5)}
+DID = next(iter(DDOS))
+DATATOKEN = "0x" + "d7" * 20
+
+
+@pytest.fixture
+def aquarius():
+    server, url = serve_stub_aquarius(DDOS, latency=0.05)
+    yield server, url
+    server.shutdown()
+    server.server_close()
+
+
+def test_concurrent_misses_make_one_request(aquarius):
+    server, url = aquarius
+    resolver = OceanResolver(url, cache=ResolutionCache(ttl=60))
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(lambda _: resolver.ddo(DID), range(16)))
+    assert server.requests == 1
+    assert all(result == DDOS[DID] for result in results)
+    assert resolver.cache.metrics["coalesced"] + resolver.cache.metrics["misses"] == 16
+
+
+def test_invalidation_and_expiry_reload(aquarius):
+    server, url = aquarius
+    resolver = OceanResolver(url, cache=ResolutionCache(ttl=60))
+    resolver.ddo(DID)
+    resolver.ddo(DID)
+    resolver.invalidate(did=DID)
+    resolver.ddo(DID)
+    assert server.requests == 2
+
+    expiring = OceanResolver(url, cache=ResolutionCache(ttl=0))
+    expiring.ddo(DID)
+    expiring.ddo(DID)
+    assert server.requests == 4
+
+
+def test_load_finishing_after_invalidation_is_not_cached():
+    cache = ResolutionCache(ttl=60)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_loader():
+        started.set()
+        release.wait(5)
+        return "old"
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        in_flight = pool.submit(cache.get, DID, slow_loader)
+        started.wait(5)
+        cache.invalidate(DID)
+        assert cache.get(DID, lambda: "new") == "new"  # does not join the stale load
+        release.set()
+        assert in_flight.result() == "old"
+    assert cache.get(DID, lambda: "newer") == "new"
+    assert cache.metrics["stale_loads"] == 1 and cache.metrics["loads"] == 2
+    assert not cache._pending and not cache._generations
+
+
+def test_unknown_did_raises_and_is_not_cached(aquarius):
+    server, url = aquarius
+    resolver = OceanResolver(url)
+    for _ in range(2):
+        with pytest.raises(LookupError):
+            resolver.ddo("did:op:missing")
+    assert server.requests == 2
+
+
+def test_persistent_tier_starts_warm(aquarius, tmp_path):
+    server, url = aquarius
+    path = str(tmp_path / "resolutions.sqlite")
+    first = ResolutionCache(path=path)
+    OceanResolver(url, cache=first).ddo(DID)
+    first.close()
+
+    restarted = ResolutionCache(path=path)
+    assert OceanResolver(url, cache=restarted).ddo(DID) == DDOS[DID]
+    assert server.requests == 1 and restarted.metrics["disk_hits"] == 1
+    restarted.close()
+
+
+def test_token_metadata_comes_from_the_chain_once(aquarius, chain):
+    _, url = aquarius
+    chain.call_results[(DATATOKEN, NAME_SELECTOR)] = "0x" + encode(["string"], ["Volunteer Token"]).hex()
+    chain.call_results[(DATATOKEN, SYMBOL_SELECTOR)] = "0x" + encode(["string"], ["VOL-DT"]).hex()
+    resolver = OceanResolver(url, rpc_url=chain.url)
+
+    for _ in range(3):
+        resolved = resolver.resolve_asset({"did": DID, "datatoken": DATATOKEN.upper().replace("0X", "0x")})
+    assert resolved["ddo"] == DDOS[DID]
+    assert resolved["datatoken"] == {"address": DATATOKEN, "name": "Volunteer Token", "symbol": "VOL-DT"}
+    assert chain.count("eth_call") == 2
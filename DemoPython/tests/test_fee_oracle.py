@@ -0,0 +1,54 @@
+from fee_oracle import FeeOracle
+
+BASE_FEE = 1_000_000_000
+PRIORITY = 2_000_000_000
+REVERT = {"jsonrpc": "2.0", "id": 7, "error": {"code": 3, "message": "execution reverted: not an NGO"}}
+
+
+def fake_node(calls):
+    def make_request(method, params):
+        calls.append(method)
+        if method == "eth_blockNumber":
+            return {"result": "0x10"}
+        if method == "eth_getBlockByNumber":
+            return {"result": {"number": params[0], "baseFeePerGas": hex(BASE_FEE)}}
+        if method == "eth_maxPriorityFeePerGas":
+            return {"result": hex(PRIORITY)}
+        if method == "eth_estimateGas":
+            if params[0].get("data", "").endswith("dead"):
+                return REVERT
+            return {"result": hex(50_000 + len(params[0]["data"]))}
+        return {"result": None}
+    return make_request
+
+
+def middleware(calls, **kwargs):
+    return FeeOracle(gas_margin=1.0, **kwargs).middleware(fake_node(calls), None)
+
+
+def test_gas_price_is_base_fee_plus_priority_fee():
+    handle = middleware([])
+    assert int(handle("eth_gasPrice", [])["result"], 16) == BASE_FEE + PRIORITY
+    assert int(handle("eth_maxPriorityFeePerGas", [])["result"], 16) == PRIORITY
+
+
+def test_raw_estimates_are_keyed_by_sender_and_calldata():
+    calls = []
+    handle = middleware(calls)
+    call = {"from": "0xAA", "to": "0xCC", "data": "0x12345678" + "00" * 32}
+    first = handle("eth_estimateGas", [call])
+    assert handle("eth_estimateGas", [dict(call)]) == first
+    assert calls.count("eth_estimateGas") == 1
+
+    handle("eth_estimateGas", [dict(call, **{"from": "0xBB"})])
+    handle("eth_estimateGas", [dict(call, data="0x12345678" + "00" * 31 + "01")])
+    assert calls.count("eth_estimateGas") == 3
+
+
+def test_error_responses_pass_through_unchanged():
+    calls = []
+    handle = middleware(calls)
+    call = {"from": "0xAA", "to": "0xCC", "data": "0x1234dead"}
+    assert handle("eth_estimateGas", [call]) == REVERT
+    assert handle("eth_estimateGas", [call]) == REVERT  # errors are not cached
+    assert calls.count("eth_estimateGas") == 2
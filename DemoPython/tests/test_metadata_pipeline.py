@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from cryptography.exceptions import InvalidTag  # noqa: E402
+
+from metadata_pipeline import (FileBlobStore, MetadataPipeline, canonical_json, cid_v1_raw,  # noqa: E402
+                               generate_key, load_key, seal, seal_volunteer_file, unseal)
+
+RECORDS = [{"id": f"VOL_{i:03d}", "name": f"Volunteer {i}", "organization": "Crucea Rosie Cluj",
+            "hours_completed": 10 + i, "certifications": ["First Aid"], "verified": True,
+            "verification_date": "2024-03-01"} for i in range(12)]
+
+
+def test_cid_matches_ipfs_add_raw_leaves():
+    # `printf 'hello world' | ipfs add --cid-version 1 --raw-leaves -q` and an empty file
+    assert cid_v1_raw(b"hello world") == "bafkreifzjut3te2nhyekklss27nh3k72ysco7y32koao5eei66wof36n5e"
+    assert cid_v1_raw(b"") == "bafkreihdwdcefgh4dqkjv67uzcmw7ojee6xedzdetojuzjevtenxquvyku"
+
+
+def test_seal_is_deterministic_and_round_trips():
+    key = load_key(generate_key())
+    blob = seal(key, canonical_json(RECORDS[0]))
+    assert seal(key, canonical_json(dict(reversed(RECORDS[0].items())))) == blob
+    assert unseal(key, blob) == RECORDS[0]
+    with pytest.raises(InvalidTag):
+        unseal(load_key(generate_key()), blob)
+
+
+def test_pipeline_uploads_once_and_skips_on_rerun(tmp_path):
+    key = load_key(generate_key())
+    store = FileBlobStore(str(tmp_path / "blobs"))
+    pipeline = MetadataPipeline(store, key, processes=1, upload_workers=4, batch_size=5)
+    results = list(pipeline.run(RECORDS))
+    assert [r["id"] for r in results] == [r["id"] for r in RECORDS]
+    assert {r["status"] for r in results} == {"uploaded"}
+    for record, result in zip(RECORDS, results):
+        blob = store.get(result["cid"])
+        assert cid_v1_raw(blob) == result["cid"] and result["uri"] == f"ipfs://{result['cid']}"
+        assert unseal(key, blob) == record
+
+    rerun = MetadataPipeline(store, key, processes=1, batch_size=5)
+    assert [r["cid"] for r in rerun.run(RECORDS)] == [r["cid"] for r in results]
+    assert rerun.stats["skipped"] == len(RECORDS) and rerun.stats["uploaded"] == 0
+
+
+def test_seal_volunteer_file_skips_malformed_rows(tmp_path):
+    registry = tmp_path / "registry.jsonl"
+    registry.write_text("\n".join([json.dumps(RECORDS[0]), json.dumps(dict(RECORDS[1], name={"x": 1})), "{bad"]))
+    results, stats = seal_volunteer_file(str(registry), FileBlobStore(str(tmp_path / "blobs")),
+                                         load_key(generate_key()), processes=1)
+    assert [r["id"] for r in results] == ["VOL_000"]
+    assert stats["uploaded"] == 1
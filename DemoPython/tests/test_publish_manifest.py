@@ -0,0 +1,33 @@
+import json
+
+from publish_manifest import PublishManifest, record_run
+
+
+def run(did, name):
+    return {"publisher": "0xabc", "network": "ganache",
+            "assets": [{"did": did, "data_nft": f"0xnft{name}", "datatoken": f"0xdt{name}", "name": name}]}
+
+
+def test_record_run_exports_the_run_it_appended(tmp_path):
+    path = str(tmp_path / "manifest.jsonl")
+    export = str(tmp_path / "export.json")
+    record_run("simulation", run("did:op:1", "first"), path, export=False)
+
+    manifest = PublishManifest(path)
+    manifest.append("simulation", run("did:op:2", "second"))
+    assert manifest.export("simulation", export, data=run("did:op:3", "given")) == export
+    with open(export) as f:
+        assert json.load(f)["assets"][0]["name"] == "given"
+    manifest.close()
+
+
+def test_compact_keeps_the_index_capacity(tmp_path):
+    path = str(tmp_path / "manifest.jsonl")
+    manifest = PublishManifest(path)
+    for i in range(2_000):
+        manifest.append("simulation", run(f"did:op:{i}", str(i)))
+    capacity = manifest.index.capacity
+    manifest.compact()
+    assert manifest.index.capacity == capacity
+    assert manifest.lookup("did:op:1999")["asset"]["name"] == "1999"
+    manifest.close()
@@ -0,0 +1,35 @@
+import threading
+
+from publishing_engine import NonceManager
+
+
+def test_failure_resyncs_only_after_nonces_in_flight_are_done():
+    nonces = NonceManager("0x" + "22" * 20)
+    pending_counts = iter([0, 7])
+    fetch = lambda: next(pending_counts)  # noqa: E731
+
+    nonces.begin()
+    held = nonces.next_nonce(fetch)
+    nonces.begin()
+    nonces.next_nonce(fetch)
+    nonces.end(failed=True)
+
+    started, later = threading.Event(), []
+
+    def publish():
+        started.set()
+        nonces.begin()
+        later.append(nonces.next_nonce(fetch))
+        nonces.end()
+
+    waiter = threading.Thread(target=publish)
+    waiter.start()
+    started.wait()
+    waiter.join(timeout=0.1)
+    assert waiter.is_alive() and not later  # held back while a publish still holds nonces
+
+    # The publish in flight keeps counting from the local counter
+    assert nonces.next_nonce(fetch) == held + 2
+    nonces.end()
+    waiter.join(timeout=5)
+    assert later == [7]
@@ -0,0 +1,76 @@
+import time
+
+import pytest
+
+from fake_chain import FakeChain, serve_fake_chain
+from read_router import Endpoint, NoHealthyEndpoint, ReadRouter
+
+
+def test_reads_are_answered_and_counted(chain):
+    router = ReadRouter([chain.url])
+    try:
+        assert int(router.request("eth_blockNumber"), 16) == chain.head
+        assert router.stats()["endpoints"][0]["requests"] == 1
+        with pytest.raises(ValueError):
+            router.request("eth_sendRawTransaction", ["0x"])
+    finally:
+        router.close()
+
+
+def test_failed_endpoint_recovers_after_cooldown(chain):
+    other = FakeChain()
+    server, flaky_url = serve_fake_chain(other)
+    server.shutdown()
+    server.server_close()  # connection refused from now on
+
+    router = ReadRouter([(flaky_url, "flaky"), (chain.url, "healthy")], failure_threshold=1,
+                        breaker_cooldown=0.05, timeout=1)
+    flaky = router.endpoints[0]
+    try:
+        while flaky.state != "open":
+            router.request("eth_blockNumber")  # fails over to the healthy endpoint
+        assert flaky not in router._ranked()
+
+        time.sleep(0.06)
+        # Being ranked without being picked must not use up the trial
+        for _ in range(20):
+            assert flaky in router._ranked()
+        assert flaky.state == "open"
+
+        flaky.url = chain.url  # the node comes back
+        for _ in range(200):
+            router.request("eth_blockNumber")
+            if flaky.state == "closed":
+                break
+        assert flaky.state == "closed"
+    finally:
+        router.close()
+
+
+def test_half_open_endpoint_admits_one_trial_at_a_time():
+    endpoint = Endpoint("http://127.0.0.1:1")
+    for _ in range(3):
+        endpoint.record_failure(threshold=3)
+    assert not endpoint.admit(cooldown=60)
+
+    endpoint.opened_at -= 61
+    assert endpoint.admit(cooldown=60)
+    assert endpoint.state == "half_open"
+    assert not endpoint.admit(cooldown=60)
+
+    endpoint.record_failure(threshold=3)
+    assert endpoint.state == "open" and not endpoint.available(cooldown=60)
+    endpoint.opened_at -= 61
+    assert endpoint.admit(cooldown=60)
+    endpoint.record_success(0.01)
+    assert endpoint.state == "closed" and endpoint.admit(cooldown=60)
+
+
+def test_no_healthy_endpoint(chain):
+    router = ReadRouter([chain.url], breaker_cooldown=60)
+    try:
+        router.endpoints[0].record_failure(threshold=1)
+        with pytest.raises(NoHealthyEndpoint):
+            router.request("eth_blockNumber")
+    finally:
+        router.close()
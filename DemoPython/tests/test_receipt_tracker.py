@@ -0,0 +1,113 @@
+import threading
+
+import pytest
+
+from provider_factory import get_web3
+from receipt_tracker import ReceiptTracker, TransactionDropped, TransactionReplaced
+
+SENDER = "0x" + "11" * 20
+
+
+def tracker_for(chain, **kwargs):
+    return ReceiptTracker(get_web3(chain.url), poll_interval=0.01, **kwargs)
+
+
+def test_already_mined_transaction_resolves_on_first_poll(chain):
+    tx_hash = chain.send(SENDER, mine=True)
+    chain.mine_empty(10)
+    tracker = tracker_for(chain)
+    future = tracker.track(tx_hash)
+    tracker.poll()
+    assert future.done()
+    assert future.result()["status"] == 1
+
+
+def test_round_trips_per_poll_stay_flat(chain):
+    tracker = tracker_for(chain)
+    hashes = [chain.send(SENDER) for _ in range(200)]
+    futures = [tracker.track(h, sender=SENDER, nonce=n) for n, h in enumerate(hashes)]
+    tracker.poll()
+    # Automine: one block per transaction
+    for tx_hash in hashes:
+        chain.mine([tx_hash])
+    before = chain.requests
+    tracker.poll()
+    assert all(f.done() for f in futures)
+    assert chain.requests - before <= 4
+
+
+def test_done_callback_may_call_back_into_the_tracker(chain):
+    tracker = tracker_for(chain)
+    seen = []
+
+    def callback(future):
+        seen.append(tracker.pending_count())
+        tracker.track(chain.send(SENDER))
+
+    tracker.track(chain.send(SENDER, mine=True), callback=callback)
+    finished = threading.Thread(target=tracker.poll)
+    finished.start()
+    finished.join(timeout=5)
+    assert not finished.is_alive()
+    assert seen == [0]
+    assert tracker.pending_count() == 1
+
+
+def test_replacement_is_detected_from_the_block(chain):
+    tracker = tracker_for(chain)
+    others = [chain.send(SENDER, nonce=n) for n in range(1, 4)]
+    original = chain.send(SENDER, nonce=0)
+    future = tracker.track(original, sender=SENDER, nonce=0)
+    for n, tx_hash in enumerate(others, start=1):
+        tracker.track(tx_hash, sender=SENDER, nonce=n)
+    tracker.poll()
+    chain.drop(original)
+    replacement = chain.send(SENDER, nonce=0)
+    chain.mine([replacement])  # fewer new blocks than pending hashes: the tracker scans blocks
+    tracker.poll()
+    with pytest.raises(TransactionReplaced) as raised:
+        future.result(timeout=0)
+    assert raised.value.replacement == replacement
+
+
+def test_replacement_is_detected_from_the_sender_nonce(chain):
+    tracker = tracker_for(chain)
+    original = chain.send(SENDER, nonce=0)
+    future = tracker.track(original, sender=SENDER, nonce=0)
+    tracker.poll()
+    chain.drop(original)
+    chain.mine([chain.send(SENDER, nonce=0)])
+    chain.mine_empty(3)  # more new blocks than pending hashes: the tracker asks for receipts
+    tracker.poll()
+    with pytest.raises(TransactionReplaced):
+        future.result(timeout=0)
+
+
+def test_forgotten_transaction_is_dropped(chain):
+    tracker = tracker_for(chain, drop_after_blocks=5)
+    tx_hash = chain.send(SENDER)
+    future = tracker.track(tx_hash)
+    tracker.poll()
+    chain.drop(tx_hash)
+    chain.mine_empty(6)
+    tracker.poll()
+    with pytest.raises(TransactionDropped) as raised:
+        future.result(timeout=0)
+    assert not isinstance(raised.value, TransactionReplaced)
+
+
+def test_reorged_receipt_goes_back_to_pending(chain):
+    tracker = tracker_for(chain, confirmations=3)
+    tx_hash = chain.send(SENDER, mine=True)
+    future = tracker.track(tx_hash)
+    tracker.poll()
+    assert not future.done()
+    chain.reorg(1)
+    chain.mine_empty(2)
+    tracker.poll()
+    assert not future.done()
+    assert tracker.metrics["reorgs"] == 1
+    chain.mine([tx_hash])
+    chain.mine_empty(2)
+    tracker.poll()
+    assert future.result(timeout=0)["blockNumber"] == chain.head - 2
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from registry_snapshot import RegistrySnapshot, write_snapshot
+from verify_service import VerificationService
+
+ACTIVE = "0x" + "aa" * 20
+INACTIVE = "0x" + "bb" * 20
+NGO = "0x" + "cc" * 20
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    path = str(tmp_path / "registry.snap")
+    write_snapshot([(ACTIVE, 1, 40, 1_700_000_000, NGO, 3, True),
+                    (INACTIVE, 2, 8, 1_700_000_100, NGO, 1, False)], path, block_number=100)
+    return path
+
+
+def test_verify_reports_is_active_as_is_valid(snapshot_path):
+    with RegistrySnapshot(snapshot_path) as snapshot:
+        assert snapshot.verify(ACTIVE) == {"isValid": True, "totalHours": 40, "lastActivity": 1_700_000_000,
+                                           "issuingNGO": NGO}
+        assert snapshot.verify(INACTIVE)["isValid"] is False
+        assert snapshot.verify("0x" + "dd" * 20)["isValid"] is False
+
+
+def test_empty_registry_snapshot_opens(tmp_path):
+    path = str(tmp_path / "empty.snap")
+    assert write_snapshot([], path, block_number=7) == 0
+    with RegistrySnapshot(path) as snapshot:
+        assert len(snapshot) == 0 and snapshot.block_number == 7
+        assert list(snapshot.records()) == []
+        assert snapshot.verify(ACTIVE)["isValid"] is False
+
+
+class RecordingFallback:
+    def __init__(self):
+        self.calls = []
+        self.last_stats = {"block_number": 105}
+
+    def verify_many(self, addresses, block_number=None):
+        self.calls.append(list(addresses))
+        return {address: {"isValid": True} for address in addresses}
+
+
+def test_deep_rollback_marks_snapshot_stale_and_service_falls_back(snapshot_path):
+    fallback = RecordingFallback()
+    service = VerificationService(snapshot_path, fallback=fallback)
+    service.snapshot = RegistrySnapshot(snapshot_path)
+    try:
+        _, block, source = asyncio.run(service.resolve([ACTIVE]))
+        assert (block, source) == (100, "index")
+
+        service.snapshot.on_rollback(90)  # below the snapshot block: must not raise
+        assert service.snapshot.stale
+        _, block, source = asyncio.run(service.resolve([ACTIVE]))
+        assert (block, source) == (105, "rpc")
+        assert fallback.calls == [[ACTIVE]]
+        assert service.index_block() is None
+    finally:
+        service.snapshot.close()
@@ -0,0 +1,96 @@
+import json
+import os
+import shutil
+import sys
+
+import pytest
+
+import sbt_contract
+import start_ganache
+from start_ganache import DEFAULT_FIXTURES, SNAPSHOT_INFO, build_snapshot, clean_state, snapshot_key
+
+V7 = "ganache v7.9.2 (@ganache/cli: 0.10.2, @ganache/core: 0.10.2)"
+SENDER = "0x" + "11" * 20
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="fake Ganache is a POSIX script")
+
+
+def fake_ganache(tmp_path, version):
+    path = tmp_path / "ganache"
+    path.write_text(f"#!{sys.executable}\nprint({version!r})\n")
+    path.chmod(0o755)
+    return str(path)
+
+
+@pytest.fixture
+def snapshots(tmp_path, monkeypatch):
+    """Snapshot root in tmp_path; launching a real chain fails the test"""
+    def launch(*args, **kwargs):
+        raise AssertionError("launched Ganache")
+
+    monkeypatch.setattr(sbt_contract, "load_artifact", lambda: {"bytecode": "0x6080604052"})
+    monkeypatch.setattr(start_ganache, "SNAPSHOT_ROOT", str(tmp_path / "snapshots"))
+    monkeypatch.setattr(start_ganache, "launch_ganache", launch)
+    return tmp_path / "snapshots"
+
+
+def make_snapshot(root, version, database=True):
+    path = root / snapshot_key(DEFAULT_FIXTURES, version)
+    (path / "db").mkdir(parents=True)
+    if database:
+        (path / "db" / "CURRENT").write_text("MANIFEST-000001\n")
+    (path / SNAPSHOT_INFO).write_text(json.dumps({"contract": "0x" + "5b" * 20, "ganache_version": version}))
+    return path
+
+
+def test_snapshot_key_tracks_bytecode_fixtures_and_version(snapshots, monkeypatch):
+    key = snapshot_key(DEFAULT_FIXTURES, V7)
+    assert key == snapshot_key(dict(DEFAULT_FIXTURES), V7)
+    assert key != snapshot_key(dict(DEFAULT_FIXTURES, badges_per_ngo=1), V7)
+    assert key != snapshot_key(DEFAULT_FIXTURES, V7.replace("7.9.2", "7.9.1"))
+    monkeypatch.setattr(sbt_contract, "load_artifact", lambda: {"bytecode": "0x6080604053"})
+    assert key != snapshot_key(DEFAULT_FIXTURES, V7)
+
+
+def test_ready_snapshot_is_reused(snapshots, tmp_path):
+    path = make_snapshot(snapshots, V7)
+    assert build_snapshot(ganache_exe=fake_ganache(tmp_path, V7)) == str(path)
+
+
+def test_snapshot_without_a_database_is_rebuilt(snapshots, tmp_path):
+    make_snapshot(snapshots, V7, database=False)
+    with pytest.raises(AssertionError, match="launched Ganache"):
+        build_snapshot(ganache_exe=fake_ganache(tmp_path, V7))
+
+
+def test_snapshot_of_another_version_is_not_trusted(snapshots, tmp_path):
+    make_snapshot(snapshots, V7)
+    with pytest.raises(AssertionError, match="launched Ganache"):
+        build_snapshot(ganache_exe=fake_ganache(tmp_path, V7.replace("7.9.2", "7.10.0")))
+
+
+def test_ganache_cli_v6_cannot_build_snapshots(snapshots, tmp_path):
+    with pytest.raises(RuntimeError, match="Ganache v7"):
+        build_snapshot(ganache_exe=fake_ganache(tmp_path, "Ganache CLI v6.12.2 (ganache-core: 2.13.2)"))
+
+
+def test_working_copy_leaves_the_snapshot_untouched(snapshots):
+    path = make_snapshot(snapshots, V7)
+    workdir, args = start_ganache._working_copy(str(path))
+    try:
+        assert args == ("--database.dbPath", os.path.join(workdir, "db"))
+        with open(os.path.join(workdir, "db", "CURRENT"), "a") as f:
+            f.write("changed\n")
+        assert (path / "db" / "CURRENT").read_text() == "MANIFEST-000001\n"
+    finally:
+        shutil.rmtree(workdir)
+
+
+def test_clean_state_restores_the_chain(chain):
+    chain.send(SENDER, mine=True)
+    with clean_state(chain.url):
+        for _ in range(3):
+            chain.send(SENDER, mine=True)
+        assert chain.head == 4
+    assert chain.head == 1
+    assert chain.nonces[SENDER] == 1
@@ -0,0 +1,23 @@
+import random
+
+from eth_account import Account
+
+from tx_signer import SigningPool, raw_transaction, synthetic_transactions
+
+
+def test_pool_signs_in_nonce_order():
+    account = Account.create()
+    txs = synthetic_transactions(12)
+    random.Random(7).shuffle(txs)
+    with SigningPool.for_account(account, processes=2, chunk_size=3) as pool:
+        signed = pool.sign_all(txs)
+
+    assert len(signed) == 12
+    for nonce, raw in enumerate(signed):
+        assert raw == bytes(raw_transaction(account.sign_transaction(synthetic_transactions(12)[nonce])))
+        assert Account.recover_transaction(raw) == account.address
+
+
+def test_empty_batch_needs_no_workers():
+    with SigningPool(Account.create().key, processes=1) as pool:
+        assert pool.sign_all([]) == []
@@ -0,0 +1,23 @@
+import importlib.util
+
+import pytest
+
+from volunteer_cli import DEFAULT_MAX_COLD_START, heavy_modules_after_dispatch, main, measure_cold_start
+
+
+@pytest.mark.parametrize("argv", [["--help"], ["simulate", "--help"], ["publish", "--help"]])
+def test_help_loads_no_heavy_modules(argv):
+    assert heavy_modules_after_dispatch(argv) == []
+
+
+def test_cold_start_stays_under_the_cap():
+    assert measure_cold_start() < DEFAULT_MAX_COLD_START
+
+
+@pytest.mark.skipif(importlib.util.find_spec("ocean_lib") is not None, reason="ocean-lib installed")
+def test_publish_without_ocean_lib_falls_back_to_simulation(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    assert main(["publish", "--skip-guide"]) == 0
+    output = capsys.readouterr().out
+    assert "falling back to simulation" in output
+    assert (tmp_path / "publish_manifest.jsonl").exists()
@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from volunteer_ingest import VolunteerRecordError, iter_volunteer_records, summarize_volunteer_file, validate_volunteer
+
+GOOD = {"id": "VOL_001", "name": "Ana Popescu", "organization": "Crucea Rosie", "hours_completed": 40,
+        "certifications": ["First Aid"], "verified": True, "verification_date": "2024-03-01", "region": "Cluj"}
+MALFORMED = [
+    dict(GOOD, id="VOL_002", name={"first": "Ion"}),
+    dict(GOOD, id="VOL_003", name=["Ion"], hours_completed="many"),
+    dict(GOOD, id="VOL_004", certifications=[{"name": "First Aid"}]),
+    dict(GOOD, id="VOL_005", verified="sometimes"),
+    dict(GOOD, id="VOL_006", organization=None),
+]
+
+
+def write_registry(path, records, garbage=()):
+    lines = [json.dumps(r) for r in records] + list(garbage)
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+def test_loose_json_types_are_normalized():
+    volunteer = validate_volunteer(dict(GOOD, name=12345, verified=None, certifications=[1, " CPR "]))
+    assert volunteer["name"] == "12345"
+    assert volunteer["verified"] is False
+    assert volunteer["certifications"] == ["1", "CPR"]
+
+
+def test_skip_counts_malformed_rows_instead_of_crashing(tmp_path):
+    path = write_registry(tmp_path / "registry.jsonl", [GOOD] + MALFORMED + [dict(GOOD, id="VOL_007", name=7)],
+                          garbage=["{not json", "[1, 2]"])
+    metadata, stats = summarize_volunteer_file(path)
+    assert stats.total_volunteers == 2
+    assert stats.rejected == 7
+    assert metadata["total_hours"] == 80
+
+
+@pytest.mark.parametrize("record", MALFORMED, ids=lambda r: r["id"])
+def test_raise_reports_the_line_of_a_malformed_row(tmp_path, record):
+    path = write_registry(tmp_path / "registry.jsonl", [GOOD, record])
+    with pytest.raises(VolunteerRecordError) as error:
+        list(iter_volunteer_records(path))
+    assert error.value.line_number == 2
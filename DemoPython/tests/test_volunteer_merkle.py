@@ -0,0 +1,57 @@
+import hashlib
+
+import pytest
+
+from volunteer_merkle import (attestation, build_tree, dataset_attestation, leaf_hash, merkle_root,
+                              synthetic_records, verify_proof)
+
+
+def reference_root(leaves):
+    """Level by level, promoting an unpaired last hash"""
+    level = list(leaves)
+    while len(level) > 1:
+        parents = [hashlib.sha256(b"\x01" + min(a, b) + max(a, b)).digest()
+                   for a, b in zip(level[0::2], level[1::2])]
+        level = parents + level[len(parents) * 2:]
+    return level[0]
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 4, 5, 7, 8, 13, 64])
+def test_root_and_proofs_for_odd_and_even_leaf_counts(tmp_path, count):
+    records = list(synthetic_records(count))
+    root = reference_root(leaf_hash(r) for r in records)
+    assert merkle_root(records) == root
+
+    with build_tree(records, str(tmp_path / "volunteers.tree"), batch_size=2) as tree:
+        assert tree.root == root and tree.count == count
+        assert tree.attestation() == attestation(root, count) == dataset_attestation(iter(records))
+        for record in records:
+            proof = tree.proof(record["id"])
+            assert len(proof) <= (count - 1).bit_length()
+            assert verify_proof(root, record, proof)
+        assert tree.proof("VOL_missing") is None
+
+
+def test_proof_rejects_a_changed_record(tmp_path):
+    records = list(synthetic_records(6))
+    with build_tree(records, str(tmp_path / "volunteers.tree")) as tree:
+        proof = tree.proof(records[4]["id"])
+        assert not verify_proof(tree.root, dict(records[4], hours_completed=999), proof)
+        assert not verify_proof(tree.root, records[3], proof)
+
+
+def test_empty_dataset_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        merkle_root([])
+    with pytest.raises(ValueError):
+        build_tree([], str(tmp_path / "empty.tree"))
+
+
+def test_simulation_attaches_the_sample_attestation(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    from ocean_sbt_integration import SAMPLE_VOLUNTEER_DATA, publish_volunteer_data_simulation
+
+    free = publish_volunteer_data_simulation()["assets"][0]
+    info = free["metadata"]["additionalInformation"]
+    assert info["merkle_attestation"] == SAMPLE_VOLUNTEER_DATA["attestation"]
+    assert info["merkle_attestation"]["leaf_count"] == len(SAMPLE_VOLUNTEER_DATA["volunteers"])
@@ -0,0 +1,42 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from volunteer_ingest import VolunteerStats, validate_volunteer  # noqa: E402
+from volunteer_store import VolunteerStore, _dict_aggregates, generate_volunteers  # noqa: E402
+
+EXTRA = [
+    {"id": "VOL_DUP", "organization": "Red Cross Romania", "hours_completed": 5,
+     "certifications": ["First Aid", "First Aid", "CPR"], "verified": False,
+     "verification_date": "2025-02-03T10:00:00"},
+    {"id": "VOL_NONE", "organization": "Caritas Romania", "hours_completed": 0, "certifications": [],
+     "verified": False, "verification_date": None},
+]
+
+
+@pytest.fixture
+def volunteers():
+    return [validate_volunteer(v) for v in [*generate_volunteers(500), *EXTRA]]
+
+
+def test_aggregates_match_the_dict_reference(volunteers):
+    store = VolunteerStore.from_records(volunteers)
+    assert (store.hours_by_region(), store.hours_by_organization(), store.certification_counts()) == \
+        _dict_aggregates(volunteers)
+    assert store.certification_counts()["CPR"] == 1
+
+
+def test_metadata_has_the_volunteer_stats_shape(volunteers):
+    stats = VolunteerStats()
+    for volunteer in volunteers:
+        stats.add(volunteer)
+    assert VolunteerStore.from_records(volunteers).metadata() == stats.as_metadata()
+
+
+def test_record_round_trip_keeps_rows_up_to_day_precision(volunteers):
+    store = VolunteerStore.from_records(volunteers)
+    assert store.record(0) == volunteers[0]
+    duplicate, missing = store.record(len(store) - 2), store.record(len(store) - 1)
+    assert duplicate["certifications"] == ["First Aid", "CPR"]
+    assert duplicate["verification_date"] == "2025-02-03"
+    assert missing["verification_date"] is None and "region" not in missing
@@ -0,0 +1,131 @@
+"""
+Process-Pool Transaction Signing
+Signs pre-built transactions for one account across CPU cores
+
+eth_account signing is pure-Python elliptic-curve work, so one core caps
+bulk submissions long before the node does. Each worker process loads the
+key once and signs whole chunks of unsigned transaction dicts; the raw
+transactions come back in nonce order, ready to send.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+DEFAULT_CHUNK_SIZE = 32
+
+_worker_account = None
+
+
+def raw_transaction(signed):
+    """Raw bytes of an eth_account SignedTransaction (``rawTransaction`` before eth-account 0.13)"""
+    raw = getattr(signed, "raw_transaction", None)
+    return raw if raw is not None else signed.rawTransaction
+
+
+def _init_worker(private_key):
+    global _worker_account
+    from eth_account import Account
+
+    _worker_account = Account.from_key(private_key)
+
+
+def _sign_chunk(txs):
+    return [(tx["nonce"], bytes(raw_transaction(_worker_account.sign_transaction(tx)))) for tx in txs]
+
+
+class SigningPool:
+    """Sign transactions for one private key in a pool of worker processes
+
+    Use as a context manager (or call close()) so the workers are shut down.
+    """
+
+    def __init__(self, private_key, processes=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.processes = max(1, processes or os.cpu_count() or 1)
+        self.chunk_size = max(1, chunk_size)
+        self._pool = ProcessPoolExecutor(max_workers=self.processes, initializer=_init_worker,
+                                         initargs=(bytes(private_key),))
+
+    @classmethod
+    def for_account(cls, account, **kwargs):
+        """Pool for an eth_account LocalAccount"""
+        return cls(account.key, **kwargs)
+
+    def sign_all(self, txs):
+        """Raw signed transactions for unsigned tx dicts (each with a ``nonce``), in nonce order"""
+        txs = list(txs)
+        if not txs:
+            return []
+        # Small batches still spread over every worker
+        size = min(self.chunk_size, -(-len(txs) // self.processes))
+        chunks = [txs[i:i + size] for i in range(0, len(txs), size)]
+        signed = [item for chunk in self._pool.map(_sign_chunk, chunks) for item in chunk]
+        signed.sort(key=lambda item: item[0])
+        return [raw for _, raw in signed]
+
+    def close(self):
+        self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ========== BENCHMARK ==========
+
+def synthetic_transactions(count, chain_id=1337, data_size=196):
+    """Unsigned legacy transactions shaped like issueBadge calls"""
+    data = bytes(range(256))[:data_size]
+    return [{
+        "to": (i + 1).to_bytes(20, "big"),
+        "value": 0,
+        "gas": 250_000,
+        "gasPrice": 1,
+        "nonce": i,
+        "chainId": chain_id,
+        "data": data
+    } for i in range(count)]
+
+
+def benchmark(count=2_000, process_counts=None):
+    """Signatures per second in-process and with pools of increasing size"""
+    from eth_account import Account
+
+    account = Account.create()
+    txs = synthetic_transactions(count)
+    if process_counts is None:
+        cores = os.cpu_count() or 1
+        process_counts = sorted({1, cores} | {n for n in (2, 4, 8, 16) if n < cores})
+
+    started = time.perf_counter()
+    for tx in txs:
+        account.sign_transaction(tx)
+    serial = count / (time.perf_counter() - started)
+    report = {"transactions": count, "serial_per_second": serial, "pools": []}
+
+    for processes in process_counts:
+        with SigningPool.for_account(account, processes=processes) as pool:
+            pool.sign_all(txs[:processes])  # start the workers outside the timing
+            started = time.perf_counter()
+            pool.sign_all(txs)
+            rate = count / (time.perf_counter() - started)
+        report["pools"].append({"processes": processes, "per_second": rate, "speedup": rate / serial})
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark process-pool transaction signing")
+    parser.add_argument("--transactions", type=int, default=2_000)
+    parser.add_argument("--processes", type=int, nargs="*", help="pool sizes to try (default: 1, 2, 4, ... cores)")
+    args = parser.parse_args()
+
+    print("✍️  Process-Pool Transaction Signing")
+    print("=" * 40)
+    report = benchmark(args.transactions, args.processes)
+    print(f"   🐢 In-process: {report['serial_per_second']:,.0f} tx/s")
+    for pool in report["pools"]:
+        print(f"   🚀 {pool['processes']:>2} processes: {pool['per_second']:,.0f} tx/s ({pool['speedup']:.2f}x)")
@@ -0,0 +1,137 @@
+"""
+Credential Verification Load Test
+Requests per second and latency percentiles for verify_service on one machine
+
+Drives GET /verify/<address> (and optionally POST /verify/batch) from many
+concurrent aiohttp clients on one event loop. With --synthetic N it first
+writes an N-volunteer registry snapshot and starts the service in a
+subprocess, so the whole run needs no chain.
+"""
+
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+
+from verify_service import DEFAULT_PORT
+
+
+async def _run_load(base_url, addresses, requests, concurrency, batch_size, conditional):
+    import aiohttp
+
+    latencies, statuses = [], {}
+    etags = {}
+    remaining = iter(range(requests))
+
+    async def worker(session):
+        for _ in remaining:
+            address = random.choice(addresses)
+            headers = {"If-None-Match": etags[address]} if conditional and address in etags else {}
+            started = time.perf_counter()
+            if batch_size > 1:
+                request = session.post(f"{base_url}/verify/batch",
+                                       json={"addresses": random.sample(addresses, batch_size)})
+            else:
+                request = session.get(f"{base_url}/verify/{address}", headers=headers)
+            async with request as response:
+                await response.read()
+                if conditional and "ETag" in response.headers:
+                    etags[address] = response.headers["ETag"]
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status] = statuses.get(response.status, 0) + 1
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(session) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "requests_per_second": len(latencies) / elapsed,
+        "credentials_per_second": len(latencies) * max(1, batch_size) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "statuses": statuses
+    }
+
+
+def load_test(base_url, addresses, requests=20_000, concurrency=64, batch_size=1, conditional=False):
+    """Hit a running service with ``requests`` requests over ``concurrency`` connections"""
+    return asyncio.run(_run_load(base_url, list(addresses), requests, concurrency, batch_size, conditional))
+
+
+def _wait_until_up(base_url, timeout=30):
+    import requests
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"verify_service did not come up at {base_url}")
+
+
+def synthetic_service(count, path="verify_load_test.snap", port=DEFAULT_PORT):
+    """Write a synthetic snapshot and start verify_service on it; returns (process, base URL, sample addresses)"""
+    from registry_snapshot import RegistrySnapshot, synthetic_records, write_snapshot
+
+    write_snapshot(synthetic_records(count), path, block_number=1)
+    with RegistrySnapshot(path) as snapshot:
+        step = max(1, count // 10_000)
+        sample = [record["address"] for i, record in enumerate(snapshot.records()) if i % step == 0][:10_000]
+    process = subprocess.Popen([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                             "verify_service.py"),
+                                "--snapshot", path, "--port", str(port)], stdout=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        _wait_until_up(base_url)
+    except Exception:
+        process.terminate()
+        raise
+    return process, base_url, sample
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load-test the credential verification service")
+    parser.add_argument("--url", help="running service base URL (default: start one on a synthetic snapshot)")
+    parser.add_argument("--addresses", help="file with one volunteer address per line (with --url)")
+    parser.add_argument("--synthetic", type=int, default=1_000_000, help="volunteers in the synthetic snapshot")
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=1, help="addresses per POST /verify/batch (1: GET)")
+    parser.add_argument("--conditional", action="store_true", help="send If-None-Match with the last ETag")
+    args = parser.parse_args()
+
+    print("🏋️  Credential Verification Load Test")
+    print("=" * 40)
+    process = None
+    if args.url:
+        if not args.addresses:
+            parser.error("--url needs --addresses")
+        with open(args.addresses) as f:
+            addresses = [line.strip() for line in f if line.strip()]
+        base_url = args.url.rstrip("/")
+    else:
+        process, base_url, addresses = synthetic_service(args.synthetic)
+        print(f"   🗂️  Serving a synthetic snapshot of {args.synthetic:,} volunteers at {base_url}")
+    try:
+        report = load_test(base_url, addresses, args.requests, args.concurrency, args.batch_size, args.conditional)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+            os.remove("verify_load_test.snap")
+    print(f"   🚀 {report['requests_per_second']:,.0f} requests/s "
+          f"({report['credentials_per_second']:,.0f} credentials/s) over {args.concurrency} connections")
+    print(f"   ⏱️  p50 {report['p50_ms']:.2f} ms, p99 {report['p99_ms']:.2f} ms")
+    print(f"   📊 Status codes: {report['statuses']}")
@@ -0,0 +1,286 @@
+"""
+Credential Verification Service
+Async HTTP API answering verifyVolunteerCredential from a local index
+
+Employers and universities call GET /verify/<address> or POST /verify/batch
+instead of the chain. Answers come from a registry_snapshot.RegistrySnapshot
+kept current by a BadgeIndexer syncing in a background thread. Three cases
+fall back to batched eth_calls through credential_verifier: requests pinned
+to another block (?block=N), an index that is not ready yet or was made
+stale by a reorg below the snapshot block (the sync thread re-exports it),
+and an index lagging the head by more than ``max_lag`` blocks. Responses carry the block
+they reflect as ETag, so a client that sends If-None-Match gets
+304 Not Modified until a new block is indexed. GET /metrics exposes
+Prometheus counters and latency quantiles. The aiohttp server ships with
+web3.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import telemetry
+from credential_verifier import _normalize_address
+
+DEFAULT_PORT = 8600
+DEFAULT_SYNC_INTERVAL = 2.0
+DEFAULT_MAX_LAG = 5
+MAX_BATCH = 10_000
+LATENCY_WINDOW = 10_000
+
+
+def _etag(block_number, extra=""):
+    return f'"{block_number}{extra}"'
+
+
+class VerificationService:
+    """aiohttp application over a registry snapshot, an optional indexer and an optional RPC fallback
+
+    ``open_indexer`` is called inside the sync thread (SQLite connections
+    stay on the thread that opened them). The snapshot at ``snapshot_path``
+    is exported from the indexer first if it does not exist yet.
+    """
+
+    def __init__(self, snapshot_path, open_indexer=None, fallback=None, sync_interval=DEFAULT_SYNC_INTERVAL,
+                 max_lag=DEFAULT_MAX_LAG, max_batch=MAX_BATCH):
+        self.snapshot_path = snapshot_path
+        self.open_indexer = open_indexer
+        self.fallback = fallback
+        self.sync_interval = sync_interval
+        self.max_lag = max_lag
+        self.max_batch = max_batch
+        self.snapshot = None
+        self.head = None
+        self.started = time.time()
+        self._indexer = None
+        self._sync_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="verify-sync")
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+
+    # ========== INDEX ==========
+
+    def _open_index(self):
+        from registry_snapshot import RegistrySnapshot, export_from_indexer
+
+        if self.open_indexer is not None:
+            self._indexer = self.open_indexer()
+            self._indexer.sync()
+            if not os.path.exists(self.snapshot_path):
+                export_from_indexer(self._indexer, self.snapshot_path)
+            snapshot = RegistrySnapshot(self.snapshot_path).attach(self._indexer)
+            self.head = self._indexer.web3.eth.block_number
+        else:
+            snapshot = RegistrySnapshot(self.snapshot_path)
+        self.snapshot = snapshot
+
+    def _sync(self):
+        self._indexer.sync()
+        self.head = self._indexer.web3.eth.block_number
+        if self.snapshot.stale:
+            self._reexport()
+
+    def _reexport(self):
+        """Replace a snapshot invalidated by a deep reorg with a fresh export"""
+        from registry_snapshot import RegistrySnapshot, export_from_indexer
+
+        stale = self.snapshot
+        export_from_indexer(self._indexer, self.snapshot_path)
+        self._indexer.listeners.remove(stale)
+        # The stale map is left to the garbage collector: a request may still be reading it
+        self.snapshot = RegistrySnapshot(self.snapshot_path).attach(self._indexer)
+        telemetry.count("retries_total", reason="verify_snapshot_reexport")
+
+    async def _follow(self, app):
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self._sync_thread, self._open_index)
+        except Exception as e:
+            telemetry.count("retries_total", reason="verify_index_open")
+            print(f"   ⚠️  Local index unavailable, serving from RPC only: {e}")
+            return
+        while self._indexer is not None:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await loop.run_in_executor(self._sync_thread, self._sync)
+            except Exception:
+                telemetry.count("retries_total", reason="verify_index_sync")
+
+    def index_block(self):
+        return self.snapshot.block_number if self.snapshot is not None and not self.snapshot.stale else None
+
+    def _local_usable(self, block_number):
+        if self.snapshot is None or self.snapshot.stale:
+            return False
+        if block_number is not None:
+            return block_number == self.snapshot.block_number
+        lagging = self.head is not None and self.head - self.snapshot.block_number > self.max_lag
+        return not (lagging and self.fallback is not None)
+
+    async def resolve(self, addresses, block_number=None):
+        """({address: credential}, block number, source) for normalized addresses"""
+        if self._local_usable(block_number):
+            verify = self.snapshot.verify
+            return {address: verify(address) for address in addresses}, self.snapshot.block_number, "index"
+        if self.fallback is None:
+            raise LookupError(f"block {block_number} is not indexed and no RPC fallback is configured"
+                              if block_number is not None
+                              else "index not ready or stale and no RPC fallback is configured")
+        results = await asyncio.to_thread(self.fallback.verify_many, addresses, block_number)
+        return results, self.fallback.last_stats["block_number"], "rpc"
+
+    # ========== HTTP ==========
+
+    def _respond(self, request, payload, etag, source, endpoint, started, addresses):
+        from aiohttp import web
+
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "X-Credential-Source": source}
+        if etag in request.headers.get("If-None-Match", ""):
+            response, status = web.Response(status=304, headers=headers), 304
+        else:
+            response = web.Response(body=json.dumps(payload).encode(), content_type="application/json",
+                                    headers=headers)
+            status = 200
+        elapsed = time.perf_counter() - started
+        self._latencies.append(elapsed)
+        telemetry.count("verify_requests_total", endpoint=endpoint, status=status, source=source)
+        telemetry.count("verify_addresses_total", value=addresses, source=source)
+        telemetry.observe("verify_request_seconds", elapsed, endpoint=endpoint)
+        return response
+
+    def _error(self, status, message, endpoint):
+        from aiohttp import web
+
+        telemetry.count("verify_requests_total", endpoint=endpoint, status=status, source="none")
+        return web.json_response({"error": message}, status=status)
+
+    @staticmethod
+    def _block_param(value):
+        return None if value in (None, "", "latest") else int(value, 0)
+
+    async def handle_verify(self, request):
+        started = time.perf_counter()
+        try:
+            address = _normalize_address(request.match_info["address"])
+            block_number = self._block_param(request.query.get("block"))
+        except ValueError as e:
+            return self._error(400, str(e), "verify")
+        try:
+            results, block, source = await self.resolve([address], block_number)
+        except LookupError as e:
+            return self._error(503, str(e), "verify")
+        payload = dict(results[address], address=address, blockNumber=block)
+        return self._respond(request, payload, _etag(block), source, "verify", started, 1)
+
+    async def handle_batch(self, request):
+        started = time.perf_counter()
+        try:
+            body = await request.json()
+            addresses = list(dict.fromkeys(_normalize_address(a) for a in body["addresses"]))
+            block_number = self._block_param(str(body["block"]) if body.get("block") is not None else None)
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            return self._error(400, f"expected {{\"addresses\": [...], \"block\": optional}}: {e}", "batch")
+        if len(addresses) > self.max_batch:
+            return self._error(413, f"at most {self.max_batch} addresses per batch", "batch")
+        try:
+            results, block, source = await self.resolve(addresses, block_number)
+        except LookupError as e:
+            return self._error(503, str(e), "batch")
+        # The same address list at the same block always gives the same body
+        digest = "-" + hashlib.blake2b("".join(addresses).encode(), digest_size=8).hexdigest()
+        payload = {"blockNumber": block, "source": source, "results": results}
+        return self._respond(request, payload, _etag(block, digest), source, "batch", started, len(addresses))
+
+    async def handle_health(self, request):
+        from aiohttp import web
+
+        block = self.index_block()
+        return web.json_response({
+            "index_block": block,
+            "head": self.head,
+            "lag": None if block is None or self.head is None else self.head - block,
+            "fallback": self.fallback is not None,
+            "uptime_seconds": time.time() - self.started
+        }, status=200 if block is not None or self.fallback is not None else 503)
+
+    def latency_quantiles(self):
+        ordered = sorted(self._latencies)
+        if not ordered:
+            return {}
+        return {q: ordered[min(len(ordered) - 1, int(len(ordered) * q))] for q in (0.5, 0.9, 0.99)}
+
+    async def handle_metrics(self, request):
+        from aiohttp import web
+
+        lines = [telemetry.prometheus_text().rstrip("\n"), "# TYPE volunteer_verify_index_block gauge",
+                 f"volunteer_verify_index_block {self.index_block() or 0}",
+                 "# TYPE volunteer_verify_head_block gauge", f"volunteer_verify_head_block {self.head or 0}",
+                 "# TYPE volunteer_verify_latency_seconds summary"]
+        for q, value in self.latency_quantiles().items():
+            lines.append(f'volunteer_verify_latency_seconds{{quantile="{q}"}} {value:.6f}')
+        return web.Response(text="\n".join(lines) + "\n", content_type="text/plain")
+
+    def app(self):
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_get("/verify/{address}", self.handle_verify)
+        app.router.add_post("/verify/batch", self.handle_batch)
+        app.router.add_get("/health", self.handle_health)
+        app.router.add_get("/metrics", self.handle_metrics)
+
+        async def start_following(app):
+            app["follow"] = asyncio.create_task(self._follow(app))
+
+        async def stop_following(app):
+            app["follow"].cancel()
+            self._sync_thread.shutdown(wait=False)
+
+        app.on_startup.append(start_following)
+        app.on_cleanup.append(stop_following)
+        return app
+
+
+def build_service(snapshot_path, rpc_url=None, contract_address=None, db_path=None, **kwargs):
+    """Service over ``snapshot_path``; with an RPC URL it also follows the chain and falls back to it"""
+    if rpc_url is None:
+        return VerificationService(snapshot_path, **kwargs)
+
+    from badge_indexer import DEFAULT_DB_PATH, BadgeIndexer
+    from credential_verifier import CredentialVerifier
+    from provider_factory import get_web3
+    from sbt_contract import get_sbt_contract
+
+    web3 = get_web3(rpc_url)
+    contract = get_sbt_contract(web3, contract_address)
+
+    def open_indexer():
+        return BadgeIndexer(web3, contract, db_path=db_path or DEFAULT_DB_PATH)
+
+    return VerificationService(snapshot_path, open_indexer=open_indexer,
+                               fallback=CredentialVerifier(rpc_url, contract.address), **kwargs)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from aiohttp import web
+
+    parser = argparse.ArgumentParser(description="Serve volunteer credential verification over HTTP")
+    parser.add_argument("--snapshot", default="volunteer_registry.snap", help="registry_snapshot file")
+    parser.add_argument("--rpc-url", help="follow this chain and fall back to it (omit to serve the snapshot only)")
+    parser.add_argument("--contract", help="VolunteerBadgeSBT address (default: ignition deployment)")
+    parser.add_argument("--db", help="badge indexer database (default: badge_indexer's)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-lag", type=int, default=DEFAULT_MAX_LAG)
+    args = parser.parse_args()
+
+    telemetry.enable()
+    service = build_service(args.snapshot, args.rpc_url, args.contract, args.db, max_lag=args.max_lag)
+    print("🛂 Credential Verification Service")
+    print("=" * 40)
+    print(f"   🌐 http://{args.host}:{args.port}/verify/<address>  (POST /verify/batch, /health, /metrics)")
+    web.run_app(service.app(), host=args.host, port=args.port, print=None, access_log=None)
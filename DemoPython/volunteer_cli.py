@@ -0,0 +1,220 @@
+"""
+Volunteer Verification CLI
+Single entry point for the DemoPython tools: python -m volunteer_cli <command>
+
+Heavy libraries (ocean_lib, web3, eth_account) are imported only by the
+subcommands that need them, so --help, start-chain and failure paths start fast.
+"""
+
+import argparse
+import importlib
+import os
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ("ocean_lib", "web3", "eth_account")
+DEFAULT_MAX_COLD_START = 0.25  # seconds on top of a bare interpreter start
+
+_import_times = {}
+
+
+def _lazy_import(name):
+    """Import a module on demand and record how long the first import took"""
+    if name in sys.modules:
+        return sys.modules[name]
+    started = time.perf_counter()
+    module = importlib.import_module(name)
+    _import_times[name] = time.perf_counter() - started
+    return module
+
+
+def _load(dependencies, module_name):
+    """Import a subcommand's heavy dependencies one by one, then its module"""
+    for dependency in dependencies:
+        _lazy_import(dependency)
+    return _lazy_import(module_name)
+
+
+def cmd_publish(args):
+    """Publish volunteer data assets to Ocean Protocol"""
+    if args.script == "fixed":
+        module = _load(("eth_account", "web3", "ocean_lib"), "volunteer_demo_fixed")
+        return module.publish_volunteer_data(args.volunteers) is not None
+
+    # The integration script falls back to the simulated flow, as the README promises
+    try:
+        module = _load(("eth_account", "web3", "ocean_lib"), "ocean_sbt_integration")
+    except ImportError as e:
+        print(f"⚠️  Real publishing unavailable ({e}) - falling back to simulation\n")
+        return cmd_simulate(args)
+    result = module.publish_volunteer_data_real(args.volunteers)
+    if not result:
+        print("⚠️  Real publishing failed - falling back to simulation\n")
+        return cmd_simulate(args)
+    if result.get("assets") and not args.skip_guide:
+        module.demonstrate_sbt_integration(result["assets"])
+    return True
+
+
+def cmd_simulate(args):
+    """Run the simulated publishing flow (no chain access)"""
+    module = _load((), "ocean_sbt_integration")
+    result = module.publish_volunteer_data_simulation()
+    if result and not args.skip_guide:
+        module.demonstrate_sbt_integration(result["assets"])
+    return bool(result)
+
+
+def cmd_verify(args):
+    """Verify the local blockchain, account and Ocean.py setup"""
+    module = _load(("eth_account", "web3"), "simple_test")
+    return module.test_basic_setup()
+
+
+def cmd_start_chain(args):
+    """Start a local Ganache chain"""
+    module = _load((), "start_ganache")
+    return module.start_ganache(snapshot=args.snapshot, rebuild=args.rebuild) is not False
+
+
+def _time_subprocess(*args):
+    """Wall-clock seconds for a fresh interpreter run with ``args`` in this directory"""
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, *args],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True
+    )
+    return time.perf_counter() - started, completed
+
+
+def measure_cold_start(repeats=5):
+    """Best-of-N wall time of ``python -m volunteer_cli --help``, net of bare interpreter start-up"""
+    baseline = min(_time_subprocess("-c", "pass")[0] for _ in range(repeats))
+    cli = min(_time_subprocess("-m", "volunteer_cli", "--help")[0] for _ in range(repeats))
+    return max(0.0, cli - baseline)
+
+
+def heavy_modules_after_dispatch(argv=("--help",)):
+    """Heavy modules loaded once a fresh interpreter has run the CLI with ``argv``; None if it crashed"""
+    _, completed = _time_subprocess("-c", (
+        "import contextlib, io, runpy, sys\n"
+        f"sys.argv = ['volunteer_cli', *{list(argv)!r}]\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        "    try:\n"
+        "        runpy.run_module('volunteer_cli', run_name='__main__')\n"
+        "    except SystemExit:\n"
+        "        pass\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    ))
+    if completed.returncode != 0:
+        return None
+    return [name for name in completed.stdout.strip().split(",") if name]
+
+
+def cmd_self_test(args):
+    """Check that the CLI stays cheap to start and report heavy import costs"""
+    print("🧪 Volunteer CLI Self-Test")
+    print("=" * 40)
+    passed = True
+
+    # 1. No heavy module may be loaded by parsing and dispatching --help
+    leaked = heavy_modules_after_dispatch()
+    if leaked is None or leaked:
+        print(f"   ❌ Heavy modules loaded by --help: {', '.join(leaked) if leaked else 'the CLI crashed'}")
+        passed = False
+    else:
+        print("   ✅ No heavy modules loaded by --help")
+
+    # 2. Cold start must stay under the cap
+    cold_start = measure_cold_start()
+    if cold_start > args.max_cold_start:
+        print(f"   ❌ Cold start {cold_start * 1000:.0f} ms exceeds cap {args.max_cold_start * 1000:.0f} ms")
+        passed = False
+    else:
+        print(f"   ✅ Cold start {cold_start * 1000:.0f} ms (cap {args.max_cold_start * 1000:.0f} ms)")
+
+    # 3. What each deferred import would have cost every invocation
+    print("\n   📦 Deferred import costs:")
+    for name in HEAVY_MODULES:
+        seconds, completed = _time_subprocess(
+            "-c", "import time; started = time.perf_counter(); "
+            f"import {name}; print(time.perf_counter() - started)"
+        )
+        if completed.returncode == 0:
+            print(f"   • {name}: {float(completed.stdout.strip()) * 1000:.0f} ms")
+        else:
+            print(f"   • {name}: not installed")
+
+    return passed
+
+
+COMMANDS = {
+    "publish": cmd_publish,
+    "simulate": cmd_simulate,
+    "verify": cmd_verify,
+    "start-chain": cmd_start_chain,
+    "self-test": cmd_self_test
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m volunteer_cli",
+        description="Ocean Protocol + Soul-Bound Token volunteer verification tools"
+    )
+    parser.add_argument("--import-times", action="store_true",
+                        help="report time spent importing heavy modules")
+    parser.add_argument("--trace", metavar="PATH", help="append timing spans to a JSON-lines trace file")
+    parser.add_argument("--metrics", metavar="PATH", help="write counters and histograms as a Prometheus textfile")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    publish = subparsers.add_parser("publish", help=cmd_publish.__doc__)
+    publish.add_argument("--script", choices=["integration", "fixed"], default="integration",
+                         help="integration: ocean_sbt_integration (default); fixed: volunteer_demo_fixed")
+    publish.add_argument("--skip-guide", action="store_true", help="do not print the SBT integration guide")
+    publish.add_argument("--volunteers", metavar="PATH",
+                         help="JSONL/CSV volunteer registry streamed for the dataset statistics")
+
+    simulate = subparsers.add_parser("simulate", help=cmd_simulate.__doc__)
+    simulate.add_argument("--skip-guide", action="store_true", help="do not print the SBT integration guide")
+
+    subparsers.add_parser("verify", help=cmd_verify.__doc__)
+    start_chain = subparsers.add_parser("start-chain", help=cmd_start_chain.__doc__)
+    start_chain.add_argument("--snapshot", action="store_true",
+                             help="start from the pre-warmed snapshot with VolunteerBadgeSBT and fixtures deployed")
+    start_chain.add_argument("--rebuild", action="store_true", help="rebuild the snapshot even if it exists")
+
+    self_test = subparsers.add_parser("self-test", help=cmd_self_test.__doc__)
+    self_test.add_argument("--max-cold-start", type=float, default=DEFAULT_MAX_COLD_START,
+                           help="maximum --help wall time in seconds, on top of a bare interpreter start")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.trace or args.metrics:
+        import telemetry
+
+        telemetry.enable(args.trace, args.metrics)
+    try:
+        ok = COMMANDS[args.command](args)
+    except KeyboardInterrupt:
+        print("\n\n👋 Cancelled by user")
+        ok = False
+    except ImportError as e:
+        print(f"❌ Missing dependency for '{args.command}': {e}")
+        print("   💡 Install with: pip install ocean-lib")
+        ok = False
+    finally:
+        if args.import_times and _import_times:
+            print("\n⏱️  Import times:")
+            for name, seconds in _import_times.items():
+                print(f"   • {name}: {seconds * 1000:.0f} ms")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
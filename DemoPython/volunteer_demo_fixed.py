@@ -3,34 +3,47 @@ Ocean Protocol Volunteer Data Publishing - REAL Implementation
 Using actual Ocean.py library to publish volunteer data assets
 """
 
-import json
 import time
 from datetime import datetime
-from web3 import Web3
-from eth_account import Account
 
-# Ocean Protocol imports
-from ocean_lib.example_config import get_config_dict
-from ocean_lib.ocean.ocean import Ocean
-from ocean_lib.structures.file_objects import UrlFile
-from ocean_lib.models.datatoken_base import DatatokenArguments
-from ocean_lib.models.fixed_rate_exchange import ExchangeArguments
-from ocean_lib.ocean.util import to_wei
+import telemetry
+from provider_factory import get_ocean, get_ocean_config
+from publish_manifest import DEFAULT_MANIFEST_PATH, record_run
+from publishing_engine import publish_assets, print_publish_results, to_published_asset
+from rpc_selector import OCEAN_NETWORK_CANDIDATES, select_endpoint
+from volunteer_ingest import build_volunteer_metadata, validate_volunteer
+from volunteer_merkle import dataset_attestation, summarize_and_attest
 
-def publish_volunteer_data():
-    """Publish volunteer data using real Ocean Protocol"""
+@telemetry.traced("publish.fixed")
+def publish_volunteer_data(volunteer_source=None):
+    """Publish volunteer data using real Ocean Protocol
+
+    volunteer_source is an optional JSONL/CSV registry; its aggregates are
+    computed in one streaming pass and attached to the asset metadata.
+    """
+    # Heavy imports are deferred so importing this module stays cheap
+    from eth_account import Account
+    from ocean_lib.models.fixed_rate_exchange import ExchangeArguments
+    from ocean_lib.ocean.util import to_wei
+    
     print("🌊 Ocean Protocol Volunteer Data Publishing - REAL Implementation")
     print("=" * 70)
     
     # 1. Setup Ocean Protocol
     print("1. 🌊 Setting up Ocean Protocol...")
     try:
-        # Try Mumbai testnet (chain ID 80001) - has Ocean contracts deployed
-        config = get_config_dict("https://rpc-mumbai.maticvigil.com")  
-        print("   ✅ Ocean configuration loaded for Mumbai testnet")
-        
-        # Create Ocean instance
-        ocean = Ocean(config)
+        with telemetry.span("publish.ocean_setup"):
+            # Race Mumbai testnet endpoints (chain ID 80001) - has Ocean contracts deployed
+            mumbai_candidates = [c for c in OCEAN_NETWORK_CANDIDATES if c[2] == 80001]
+            endpoint = select_endpoint(mumbai_candidates)
+            if not endpoint:
+                raise ConnectionError("no healthy Mumbai RPC endpoint")
+            network_url, network_name = endpoint
+            config = get_ocean_config(network_url)
+            print(f"   ✅ Ocean configuration loaded for {network_name}")
+
+            # Create Ocean instance
+            ocean = get_ocean(network_url, config)
         print("   ✅ Ocean instance created successfully!")
         print("   💡 Note: Using Mumbai testnet - you'll need Mumbai MATIC for transactions")
         
@@ -50,11 +63,13 @@ def publish_volunteer_data():
     # 2. Setup publisher account
     print("\n2. 👤 Setting up NGO publisher account...")
     private_key = '0x4f3edf983ac636a65a842ce7c78d9aa706d3b113bce9c46f30d7d21715b23b1d'
-    alice = Account.from_key(private_key)
+    with telemetry.span("publish.account_setup"):
+        alice = Account.from_key(private_key)
     
     # Check balance
-    balance = ocean.web3.eth.get_balance(alice.address)
-    balance_eth = ocean.web3.from_wei(balance, 'ether')
+    with telemetry.span("publish.balance_check", network=network_name):
+        balance = ocean.web3.eth.get_balance(alice.address)
+        balance_eth = ocean.web3.from_wei(balance, 'ether')
     
     print(f"   ✅ Publisher: {alice.address}")
     print(f"   💰 Balance: {balance_eth} ETH")
@@ -68,119 +83,88 @@ def publish_volunteer_data():
     # Sample volunteer data URL (this would be the Romanian NGO's volunteer database)
     volunteer_data_url = "https://raw.githubusercontent.com/datasets/country-list/master/data.json"
     
-    published_assets = []
+    # Dataset aggregates and Merkle root come from one streaming pass over the registry
+    if volunteer_source:
+        volunteer_stats, merkle_attestation = summarize_and_attest(volunteer_source)
+    else:
+        volunteer_stats = SAMPLE_VOLUNTEER_DATA["metadata"]
+        merkle_attestation = SAMPLE_VOLUNTEER_DATA["attestation"]
     
-    try:
-        # A. Free volunteer directory asset
-        print("   📂 Publishing free volunteer directory...")
-        
-        # Metadata for the free asset
-        free_metadata = {
-            "name": "Romanian NGO Volunteer Directory - Free Access",
-            "description": "Basic volunteer information for public verification - Romanian NGO volunteer verification system",
-            "author": "Romanian NGO Association", 
-            "created": datetime.now().isoformat(),
-            "license": "CC0",
-            "tags": ["volunteers", "romania", "ngo", "verification", "directory"],
-            "type": "dataset",
-            "additionalInformation": {
-                "purpose": "Soul-Bound Token verification",
-                "region": "Romania",
-                "language": "Romanian/English",
-                "verification_level": "basic"
-            }
+    # A. Free volunteer directory asset
+    free_metadata = {
+        "name": "Romanian NGO Volunteer Directory - Free Access",
+        "description": "Basic volunteer information for public verification - Romanian NGO volunteer verification system",
+        "author": "Romanian NGO Association", 
+        "created": datetime.now().isoformat(),
+        "license": "CC0",
+        "tags": ["volunteers", "romania", "ngo", "verification", "directory"],
+        "type": "dataset",
+        "additionalInformation": {
+            "purpose": "Soul-Bound Token verification",
+            "region": "Romania",
+            "language": "Romanian/English",
+            "verification_level": "basic",
+            "volunteer_statistics": volunteer_stats,
+            "merkle_attestation": merkle_attestation
         }
-        
-        # Create URL file object
-        url_file = UrlFile(url=volunteer_data_url)
-        
-        # Free pricing (no cost)
-        free_pricing = None  # Free access
-        
-        # Publish free asset
-        (free_data_nft, free_datatoken, free_ddo) = ocean.assets.create_url_asset(
-            name=free_metadata["name"],
-            url=volunteer_data_url,
-            tx_dict={"from": alice},
-            pricing=free_pricing,
-            metadata=free_metadata
-        )
-        
-        print("   ✅ Free volunteer directory published!")
-        print(f"      📊 Data NFT: {free_data_nft.symbol()} at {free_data_nft.address}")
-        print(f"      🎫 Datatoken: {free_datatoken.symbol()} at {free_datatoken.address}")
-        print(f"      🌐 DID: {free_ddo.did}")
-        
-        published_assets.append({
-            "type": "free_directory",
-            "data_nft": free_data_nft.address,
-            "datatoken": free_datatoken.address,
-            "did": free_ddo.did,
-            "metadata": free_metadata
-        })
-        
-    except Exception as e:
-        print(f"   ❌ Free asset publishing failed: {e}")
+    }
     
-    try:
-        # B. Premium volunteer verification asset
-        print("\n   💎 Publishing premium volunteer verification data...")
-        
-        # Metadata for premium asset
-        premium_metadata = {
-            "name": "Romanian NGO Volunteer Verification - Premium Access",
-            "description": "Detailed volunteer verification data with background checks and certifications",
-            "author": "Romanian NGO Association",
-            "created": datetime.now().isoformat(),
-            "license": "Commercial",
-            "tags": ["volunteers", "romania", "ngo", "verification", "premium", "background-check"],
-            "type": "dataset",
-            "additionalInformation": {
-                "purpose": "Soul-Bound Token verification with premium features",
-                "region": "Romania", 
-                "language": "Romanian/English",
-                "verification_level": "premium",
-                "includes": ["background_check", "certifications", "references", "skills_assessment"]
-            }
+    # B. Premium volunteer verification asset
+    premium_metadata = {
+        "name": "Romanian NGO Volunteer Verification - Premium Access",
+        "description": "Detailed volunteer verification data with background checks and certifications",
+        "author": "Romanian NGO Association",
+        "created": datetime.now().isoformat(),
+        "license": "Commercial",
+        "tags": ["volunteers", "romania", "ngo", "verification", "premium", "background-check"],
+        "type": "dataset",
+        "additionalInformation": {
+            "purpose": "Soul-Bound Token verification with premium features",
+            "region": "Romania", 
+            "language": "Romanian/English",
+            "verification_level": "premium",
+            "includes": ["background_check", "certifications", "references", "skills_assessment"],
+            "volunteer_statistics": volunteer_stats,
+            "merkle_attestation": merkle_attestation
         }
-        
-        # Premium pricing (cost in OCEAN tokens)
-        premium_exchange_args = ExchangeArguments(
-            rate=to_wei("1"),  # 1 OCEAN token per access
-            base_token_addr=ocean.OCEAN_token.address,
-            owner_addr=alice.address,
-            publish_market_order_fee_address=alice.address,
-            publish_market_order_fee_token=ocean.OCEAN_token.address,
-            publish_market_order_fee_amount=0,
-            publish_market_swap_fee=to_wei("0.01")  # 1% swap fee
-        )
-        
-        # Publish premium asset with pricing
-        (premium_data_nft, premium_datatoken, premium_ddo) = ocean.assets.create_url_asset(
-            name=premium_metadata["name"],
-            url=volunteer_data_url,
-            tx_dict={"from": alice},
-            pricing=premium_exchange_args,
-            metadata=premium_metadata
-        )
-        
-        print("   ✅ Premium volunteer verification published!")
-        print(f"      📊 Data NFT: {premium_data_nft.symbol()} at {premium_data_nft.address}")
-        print(f"      🎫 Datatoken: {premium_datatoken.symbol()} at {premium_datatoken.address}")
-        print(f"      🌐 DID: {premium_ddo.did}")
-        print(f"      💰 Price: 1 OCEAN token per access")
-        
-        published_assets.append({
-            "type": "premium_verification", 
-            "data_nft": premium_data_nft.address,
-            "datatoken": premium_datatoken.address,
-            "did": premium_ddo.did,
+    }
+    
+    # Premium pricing (cost in OCEAN tokens)
+    premium_exchange_args = ExchangeArguments(
+        rate=to_wei("1"),  # 1 OCEAN token per access
+        base_token_addr=ocean.OCEAN_token.address,
+        owner_addr=alice.address,
+        publish_market_order_fee_address=alice.address,
+        publish_market_order_fee_token=ocean.OCEAN_token.address,
+        publish_market_order_fee_amount=0,
+        publish_market_swap_fee=to_wei("0.01")  # 1% swap fee
+    )
+    
+    asset_specs = [
+        {
+            "type": "free_directory",
+            "url": volunteer_data_url,
+            "metadata": free_metadata,
+            "pricing": None,  # Free access
+            "price": "Free"
+        },
+        {
+            "type": "premium_verification",
+            "url": volunteer_data_url,
             "metadata": premium_metadata,
+            "pricing": premium_exchange_args,
             "price": "1 OCEAN"
-        })
-        
-    except Exception as e:
-        print(f"   ❌ Premium asset publishing failed: {e}")
+        }
+    ]
+    
+    # Publish both assets concurrently with locally managed nonces
+    print("   📂 Publishing free directory and 💎 premium verification data...")
+    with telemetry.span("publish.assets", count=len(asset_specs)):
+        publish_results = publish_assets(ocean, alice, asset_specs)
+    print_publish_results(publish_results)
+    published_assets = [
+        to_published_asset(r) for r in publish_results if r["status"] == "published"
+    ]
     
     # 4. Summary and Soul-Bound Token integration info
     print("\n4. 🎯 Publishing Summary & Integration Guide")
@@ -209,10 +193,10 @@ def publish_volunteer_data():
             "assets": published_assets
         }
         
-        with open("ocean_published_assets.json", "w") as f:
-            json.dump(results, f, indent=2)
+        with telemetry.span("publish.save_results"):
+            record_run("fixed", results)
         
-        print(f"\n   💾 Results saved to ocean_published_assets.json")
+        print(f"\n   💾 Run recorded in {DEFAULT_MANIFEST_PATH} (exported to ocean_published_assets.json)")
         print("\n🎉 Ready for Soul-Bound Token integration!")
         
         return results
@@ -221,42 +205,41 @@ def publish_volunteer_data():
         return None
 
 # Sample volunteer data for demonstration
-SAMPLE_VOLUNTEER_DATA = {
-    "volunteers": [
-        {
-            "id": "NGO-RO-001",
-            "name": "Maria Popescu", 
-            "organization": "Habitat for Humanity Romania",
-            "hours_completed": 120,
-            "certifications": ["First Aid", "Construction Safety"],
-            "verified": True,
-            "verification_date": "2024-01-15"
-        },
-        {
-            "id": "NGO-RO-002", 
-            "name": "Alexandru Ionescu",
-            "organization": "Red Cross Romania",
-            "hours_completed": 85,
-            "certifications": ["Emergency Response", "Community Outreach"],
-            "verified": True,
-            "verification_date": "2024-01-10"
-        },
-        {
-            "id": "NGO-RO-003",
-            "name": "Elena Radu",
-            "organization": "Save the Children Romania", 
-            "hours_completed": 200,
-            "certifications": ["Child Protection", "Educational Support", "Mental Health First Aid"],
-            "verified": True,
-            "verification_date": "2024-01-20"
-        }
-    ],
-    "metadata": {
-        "total_volunteers": 3,
-        "total_hours": 405,
-        "verification_standard": "Romanian NGO Association Standard v2.1",
-        "last_updated": "2024-01-20T10:30:00Z"
+SAMPLE_VOLUNTEERS = [
+    {
+        "id": "NGO-RO-001",
+        "name": "Maria Popescu", 
+        "organization": "Habitat for Humanity Romania",
+        "hours_completed": 120,
+        "certifications": ["First Aid", "Construction Safety"],
+        "verified": True,
+        "verification_date": "2024-01-15"
+    },
+    {
+        "id": "NGO-RO-002", 
+        "name": "Alexandru Ionescu",
+        "organization": "Red Cross Romania",
+        "hours_completed": 85,
+        "certifications": ["Emergency Response", "Community Outreach"],
+        "verified": True,
+        "verification_date": "2024-01-10"
+    },
+    {
+        "id": "NGO-RO-003",
+        "name": "Elena Radu",
+        "organization": "Save the Children Romania", 
+        "hours_completed": 200,
+        "certifications": ["Child Protection", "Educational Support", "Mental Health First Aid"],
+        "verified": True,
+        "verification_date": "2024-01-20"
     }
+]
+
+# Aggregates are derived from the records, never maintained by hand
+SAMPLE_VOLUNTEER_DATA = {
+    "volunteers": SAMPLE_VOLUNTEERS,
+    "metadata": build_volunteer_metadata(SAMPLE_VOLUNTEERS),
+    "attestation": dataset_attestation(map(validate_volunteer, SAMPLE_VOLUNTEERS))
 }
 
 if __name__ == "__main__":
@@ -0,0 +1,304 @@
+"""
+Columnar Volunteer Store
+Array-backed storage for volunteer records with vectorized aggregates
+
+Numeric fields live in NumPy arrays, organization and region are
+dictionary-encoded, free-text fields are packed into one UTF-8 buffer plus
+offsets, and certifications are stored as a packed (offsets, codes) list.
+NumPy is the one dependency here that Ocean.py and web3 do not bring along:
+pip install numpy.
+"""
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError("volunteer_store needs NumPy, which is not installed: pip install numpy") from e
+
+from volunteer_ingest import VERIFICATION_STANDARD, VolunteerStats
+
+MISSING = -1
+
+
+class _StringColumn:
+    """Immutable strings packed into a single UTF-8 buffer plus offsets"""
+
+    def __init__(self, values):
+        encoded = [value.encode("utf-8") for value in values]
+        lengths = np.fromiter((len(b) for b in encoded), dtype=np.int64, count=len(encoded))
+        self.offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.offsets[1:])
+        self.buffer = b"".join(encoded)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        return self.buffer[self.offsets[index]:self.offsets[index + 1]].decode("utf-8")
+
+    @property
+    def nbytes(self):
+        return len(self.buffer) + self.offsets.nbytes
+
+
+class _Categories:
+    """Dictionary encoder mapping category strings to dense integer codes"""
+
+    def __init__(self):
+        self.values = []
+        self._codes = {}
+
+    def encode(self, value):
+        if value is None or value == "":
+            return MISSING
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class VolunteerStore:
+    """Compact columnar store for volunteer records"""
+
+    def __init__(self, ids, names, organizations, organization_codes, hours, verified,
+                 verification_dates, regions, region_codes, certifications,
+                 certification_offsets, certification_codes):
+        self.ids = ids
+        self.names = names
+        self.organizations = organizations
+        self.organization_codes = organization_codes
+        self.hours = hours
+        self.verified = verified
+        self.verification_dates = verification_dates
+        self.regions = regions
+        self.region_codes = region_codes
+        self.certifications = certifications
+        self.certification_offsets = certification_offsets
+        self.certification_codes = certification_codes
+
+    @classmethod
+    def from_records(cls, volunteers):
+        """Build a store from any iterable of volunteer dicts (e.g. a volunteer_ingest stream)
+
+        Rows round-trip through record() with two normalizations: a
+        certification listed twice for one volunteer is kept once, and
+        verification_date is stored as datetime64[D], so any time of day is
+        dropped ("2024-03-01T10:00:00" comes back as "2024-03-01").
+        """
+        organizations, regions, certifications = _Categories(), _Categories(), _Categories()
+        ids, names, organization_codes, region_codes = [], [], [], []
+        hours, verified, dates = [], [], []
+        certification_lengths, certification_codes = [], []
+
+        for volunteer in volunteers:
+            ids.append(volunteer["id"])
+            names.append(volunteer.get("name") or "")
+            organization_codes.append(organizations.encode(volunteer["organization"]))
+            region_codes.append(regions.encode(volunteer.get("region")))
+            hours.append(volunteer["hours_completed"])
+            verified.append(bool(volunteer.get("verified", False)))
+            date = volunteer.get("verification_date")
+            dates.append(str(date)[:10] if date else "NaT")  # day precision only
+            certs = list(dict.fromkeys(c for c in volunteer.get("certifications") or [] if c))
+            certification_lengths.append(len(certs))
+            certification_codes.extend(certifications.encode(c) for c in certs)
+
+        certification_offsets = np.zeros(len(ids) + 1, dtype=np.int64)
+        np.cumsum(np.asarray(certification_lengths, dtype=np.int64), out=certification_offsets[1:])
+
+        return cls(
+            ids=_StringColumn(ids),
+            names=_StringColumn(names),
+            organizations=organizations.values,
+            organization_codes=np.asarray(organization_codes, dtype=np.int32),
+            hours=np.asarray(hours, dtype=np.int64),
+            verified=np.asarray(verified, dtype=np.bool_),
+            verification_dates=np.asarray(dates, dtype="datetime64[D]"),
+            regions=regions.values,
+            region_codes=np.asarray(region_codes, dtype=np.int32),
+            certifications=certifications.values,
+            certification_offsets=certification_offsets,
+            certification_codes=np.asarray(certification_codes, dtype=np.int32)
+        )
+
+    def __len__(self):
+        return len(self.hours)
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the columns"""
+        arrays = (self.organization_codes, self.hours, self.verified, self.verification_dates,
+                  self.region_codes, self.certification_offsets, self.certification_codes)
+        return self.ids.nbytes + self.names.nbytes + sum(a.nbytes for a in arrays)
+
+    def record(self, index):
+        """Rebuild the original dict for one row"""
+        start, end = self.certification_offsets[index], self.certification_offsets[index + 1]
+        date = self.verification_dates[index]
+        volunteer = {
+            "id": self.ids[index],
+            "name": self.names[index],
+            "organization": self.organizations[self.organization_codes[index]],
+            "hours_completed": int(self.hours[index]),
+            "certifications": [self.certifications[c] for c in self.certification_codes[start:end]],
+            "verified": bool(self.verified[index]),
+            "verification_date": None if np.isnat(date) else str(date)
+        }
+        region_code = self.region_codes[index]
+        if region_code != MISSING:
+            volunteer["region"] = self.regions[region_code]
+        return volunteer
+
+    def iter_records(self):
+        """Yield every row in the existing dict format"""
+        for index in range(len(self)):
+            yield self.record(index)
+
+    def to_records(self):
+        return list(self.iter_records())
+
+    # ========== VECTORIZED AGGREGATES ==========
+
+    def _group_sum(self, codes, labels, weights=None):
+        present = codes != MISSING
+        totals = np.bincount(
+            codes[present],
+            weights=None if weights is None else weights[present],
+            minlength=len(labels)
+        )
+        return {label: int(total) for label, total in zip(labels, totals)}
+
+    def hours_by_region(self):
+        return self._group_sum(self.region_codes, self.regions, self.hours)
+
+    def hours_by_organization(self):
+        return self._group_sum(self.organization_codes, self.organizations, self.hours)
+
+    def volunteers_by_region(self):
+        return self._group_sum(self.region_codes, self.regions)
+
+    def volunteers_by_organization(self):
+        return self._group_sum(self.organization_codes, self.organizations)
+
+    def certification_counts(self):
+        """How many volunteers hold each certification"""
+        return self._group_sum(self.certification_codes, self.certifications)
+
+    def certification_counts_by_organization(self):
+        """{organization: {certification: count}} in one 2-D bincount"""
+        rows = np.repeat(self.organization_codes, np.diff(self.certification_offsets))
+        width = max(len(self.certifications), 1)
+        flat = np.bincount(rows.astype(np.int64) * width + self.certification_codes,
+                           minlength=len(self.organizations) * width)
+        table = flat.reshape(len(self.organizations), width)
+        return {
+            organization: {
+                certification: int(count)
+                for certification, count in zip(self.certifications, table[i]) if count
+            }
+            for i, organization in enumerate(self.organizations)
+        }
+
+    def stats(self):
+        """The columns' aggregates as a volunteer_ingest.VolunteerStats"""
+        stats = VolunteerStats()
+        stats.total_volunteers = len(self)
+        stats.total_hours = int(self.hours.sum())
+        stats.verified_volunteers = int(self.verified.sum())
+        stats.regions = {r for r, n in self.volunteers_by_region().items() if n}
+        dates = self.verification_dates[~np.isnat(self.verification_dates)]
+        stats.latest_verification = str(dates.max()) if len(dates) else None
+        return stats
+
+    def metadata(self, verification_standard=VERIFICATION_STANDARD):
+        """The SAMPLE_VOLUNTEER_DATA["metadata"] block, same shape as VolunteerStats.as_metadata"""
+        return self.stats().as_metadata(verification_standard)
+
+
+def _dict_aggregates(volunteers):
+    """Reference dict-based implementation used by the benchmark"""
+    hours_by_region, hours_by_organization, certification_counts = {}, {}, {}
+    for volunteer in volunteers:
+        region = volunteer.get("region")
+        if region:
+            hours_by_region[region] = hours_by_region.get(region, 0) + volunteer["hours_completed"]
+        organization = volunteer["organization"]
+        hours_by_organization[organization] = hours_by_organization.get(organization, 0) + volunteer["hours_completed"]
+        for certification in {c for c in volunteer["certifications"] if c}:
+            certification_counts[certification] = certification_counts.get(certification, 0) + 1
+    return hours_by_region, hours_by_organization, certification_counts
+
+
+def generate_volunteers(count, seed=7):
+    """Synthetic volunteer records in the existing dict format"""
+    rng = np.random.default_rng(seed)
+    organizations = ["Habitat for Humanity Romania", "Red Cross Romania", "Save the Children Romania",
+                     "World Vision Romania", "Caritas Romania", "Salvati Copiii"]
+    regions = ["Bucharest", "Cluj-Napoca", "Timisoara", "Iasi", "Constanta", "Brasov", "Sibiu", "Oradea"]
+    certifications = ["First Aid", "Construction Safety", "Emergency Response", "Community Outreach",
+                      "Child Protection", "Educational Support", "Mental Health First Aid"]
+    org_idx = rng.integers(0, len(organizations), count)
+    region_idx = rng.integers(0, len(regions), count)
+    hours = rng.integers(1, 500, count)
+    cert_masks = rng.integers(0, 1 << len(certifications), count)
+    days = rng.integers(0, 365, count)
+    for i in range(count):
+        mask = int(cert_masks[i])
+        yield {
+            "id": f"NGO-RO-{i:07d}",
+            "name": f"Volunteer {i}",
+            "organization": organizations[org_idx[i]],
+            "hours_completed": int(hours[i]),
+            "certifications": [c for bit, c in enumerate(certifications) if mask >> bit & 1],
+            "verified": True,
+            "verification_date": str(np.datetime64("2024-01-01") + int(days[i])),
+            "region": regions[region_idx[i]]
+        }
+
+
+def benchmark_store(count=1_000_000):
+    """Compare dict-based and columnar aggregates at ``count`` records"""
+    import sys
+    import time
+
+    volunteers = list(generate_volunteers(count))
+    dict_bytes = sum(sys.getsizeof(v) + sum(sys.getsizeof(x) for x in v.values()) for v in volunteers)
+
+    started = time.perf_counter()
+    store = VolunteerStore.from_records(volunteers)
+    build_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    expected = _dict_aggregates(volunteers)
+    dict_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    actual = (store.hours_by_region(), store.hours_by_organization(), store.certification_counts())
+    columnar_seconds = time.perf_counter() - started
+
+    assert actual == expected, "columnar aggregates disagree with dict aggregates"
+    return {
+        "records": count,
+        "build_seconds": build_seconds,
+        "dict_aggregate_seconds": dict_seconds,
+        "columnar_aggregate_seconds": columnar_seconds,
+        "aggregate_speedup": dict_seconds / columnar_seconds if columnar_seconds else float("inf"),
+        "dict_bytes": dict_bytes,
+        "columnar_bytes": store.nbytes
+    }
+
+
+if __name__ == "__main__":
+    import sys
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print("🗃️  Columnar Volunteer Store Benchmark")
+    print("=" * 40)
+    report = benchmark_store(count)
+    print(f"   📊 Records: {report['records']:,}")
+    print(f"   🏗️  Build: {report['build_seconds']:.2f}s")
+    print(f"   🐢 Dict aggregates: {report['dict_aggregate_seconds'] * 1000:.1f} ms")
+    print(f"   🚀 Columnar aggregates: {report['columnar_aggregate_seconds'] * 1000:.1f} ms "
+          f"({report['aggregate_speedup']:.0f}x)")
+    print(f"   🧠 Memory: {report['dict_bytes'] / 2**20:.0f} MiB as dicts vs "
+          f"{report['columnar_bytes'] / 2**20:.0f} MiB columnar")